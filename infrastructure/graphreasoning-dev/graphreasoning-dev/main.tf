@@ -170,6 +170,10 @@ module "lambda_bulk_loader" {
   s3bucket         = module.output_store.bucket.id
   account_id       = data.aws_caller_identity.current.account_id
   ssm_prefix       = var.ssm_prefix
+  # TRIPLE_DEDUP and DELTA_LOAD, see pipeline_control/README.md
+  timeout                = 900
+  memory_size            = 3008
+  ephemeral_storage_size = 10240
 }
 
 module "lambda_periodic_scheduler" {
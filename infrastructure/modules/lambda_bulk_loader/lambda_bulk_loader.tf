@@ -10,8 +10,11 @@ resource "aws_lambda_function" "lambda_bulk_loader" {
   role             = var.iam_role
   handler          = "lambda_entry_points.handle_process_inference"
   runtime          = "python3.7"
-  timeout          = 60
-  memory_size      = 512
+  timeout          = var.timeout
+  memory_size      = var.memory_size
+  ephemeral_storage {
+    size = var.ephemeral_storage_size
+  }
   vpc_config {
     security_group_ids = [var.sg_ids]
     subnet_ids         = var.subnet_ids
@@ -41,3 +41,20 @@ variable "code_s3_file" {
 variable "source_code_hash" {
   type = string
 }
+
+// TRIPLE_DEDUP and DELTA_LOAD run in this function and keep their triple sets
+// and gzip shards in /tmp
+variable "timeout" {
+  type    = number
+  default = 60
+}
+
+variable "memory_size" {
+  type    = number
+  default = 512
+}
+
+variable "ephemeral_storage_size" {
+  type    = number
+  default = 512
+}
@@ -0,0 +1,106 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from neptune_load.bulk_loader.async_bulk_loader import AsyncBulkLoader
+from neptune_load.loader_emulator.loader_emulator import (
+    EmulatorConfiguration,
+    LoaderEmulator,
+    LoaderEmulatorServer,
+)
+from neptune_load.pooled_transport.pooled_transport import PooledTransport
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+import argparse
+import asyncio
+import logging
+import requests
+import time
+
+logger = logging.getLogger("benchmark_loader_emulator")
+logger.setLevel(logging.INFO)
+
+if not logger.hasHandlers():
+    c_handler = logging.StreamHandler()
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    c_handler.setFormatter(formatter)
+    logger.addHandler(c_handler)
+
+IAM_ROLE = "arn:aws:iam::123456789012:role/benchmark"
+
+
+class UnpooledTransport(PooledTransport):
+    # Reproduces the previous behaviour of opening a connection per request
+    def request(self, method: str, url: str, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return requests.request(method, url, **kwargs)
+
+
+def make_async_loader(endpoint: str, transport: PooledTransport, concurrency: int):
+    return AsyncBulkLoader(
+        signer=SigV4Signer(
+            region="ap-southeast-1",
+            access_key_id="AKIDEXAMPLE",
+            access_key_secret="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY",
+            transport=transport,
+            protocol="http",
+        ),
+        neptune_endpoint=endpoint,
+        iam_role_arn=IAM_ROLE,
+        queueRequest="TRUE",
+        wait_between_queries_in_seconds=1,
+        maximum_wait_between_queries_in_seconds=1,
+        max_concurrency=concurrency,
+    )
+
+
+async def submit_and_follow(async_loader: AsyncBulkLoader, loads: int):
+    async with async_loader:
+        sources = [f"s3://benchmark/part-{index:05d}.nt" for index in range(loads)]
+        load_ids = await async_loader.submit_all(sources)
+        return await async_loader.wait_for_all(load_ids.values())
+
+
+def run(args, transport: PooledTransport) -> float:
+    emulator = LoaderEmulator(
+        configuration=EmulatorConfiguration(
+            load_duration_in_seconds=args.load_duration,
+            load_duration_jitter=0.5,
+            concurrent_loads=args.loads,
+            max_queued_loads=args.loads,
+            latency_in_seconds=args.latency,
+            failure_rate=args.failure_rate,
+        )
+    )
+    with LoaderEmulatorServer(emulator=emulator) as server:
+        async_loader = make_async_loader(server.endpoint, transport, args.concurrency)
+        start = time.perf_counter()
+        results = asyncio.run(submit_and_follow(async_loader, args.loads))
+        elapsed = time.perf_counter() - start
+    transport.close()
+
+    requests_served = sum(emulator.request_counts.values())
+    statuses = {}
+    for result in results.values():
+        status = result.status.value if hasattr(result, "status") else "EXCEPTION"
+        statuses[status] = statuses.get(status, 0) + 1
+    logger.info(
+        f"{type(transport).__name__}: {args.loads} loads in {elapsed:.1f}s, {requests_served / elapsed:,.0f} requests/s, {statuses}"
+    )
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Follows simulated loads through the real signer and transport"
+    )
+    parser.add_argument("--loads", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--load_duration", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--failure_rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    unpooled = run(args, UnpooledTransport())
+    pooled = run(args, PooledTransport(pool_maxsize=args.concurrency))
+    logger.info(f"Speed-up: {unpooled / pooled:.2f}x")
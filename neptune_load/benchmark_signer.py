@@ -0,0 +1,70 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+import argparse
+import json
+import logging
+import time
+
+logger = logging.getLogger("benchmark_signer")
+logger.setLevel(logging.INFO)
+
+if not logger.hasHandlers():
+    c_handler = logging.StreamHandler()
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    c_handler.setFormatter(formatter)
+    logger.addHandler(c_handler)
+
+HOST = "neptune.cluster-abcdefghijklmn.ap-southeast-1.neptune.amazonaws.com:8182"
+STATUS_QUERY = json.dumps(
+    {
+        "loadId": "2a0c81f7-66b5-4da3-9f7a-bb356d2ddd8b",
+        "details": "true",
+        "errors": "true",
+        "page": "1",
+    }
+)
+
+
+class UncachedSigV4Signer(SigV4Signer):
+    # Reproduces the previous behaviour of deriving the signing key per request
+    def get_signature_key(self, dateStamp, serviceName):
+        return self.derive_signature_key(dateStamp, serviceName)
+
+
+def make_signer(signer_class):
+    return signer_class(
+        region="ap-southeast-1",
+        access_key_id="AKIDEXAMPLE",
+        access_key_secret="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY",
+        session_token="session-token",
+    )
+
+
+def signatures_per_second(signer: SigV4Signer, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        signer.get_signed_request(
+            host=HOST, method="GET", query_type="loader", query=STATUS_QUERY
+        )
+    return iterations / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SigV4 signing micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    # warm up both code paths before measuring
+    for signer_class in (UncachedSigV4Signer, SigV4Signer):
+        signatures_per_second(make_signer(signer_class), 1000)
+
+    uncached = signatures_per_second(make_signer(UncachedSigV4Signer), args.iterations)
+    cached = signatures_per_second(make_signer(SigV4Signer), args.iterations)
+
+    logger.info(f"Key derived per request: {uncached:,.0f} signatures/s")
+    logger.info(f"Cached signing key:      {cached:,.0f} signatures/s")
+    logger.info(f"Speed-up:                {cached / uncached:.2f}x")
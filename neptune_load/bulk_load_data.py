@@ -4,6 +4,8 @@
 
 from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
 from neptune_load.bulk_loader.bulk_loader import BulkLoader
+from neptune_load.bulk_loader.async_bulk_loader import AsyncBulkLoader
+import asyncio
 import logging
 import os
 import sys
@@ -15,13 +17,11 @@ logger.setLevel(logging.INFO)
 def kill_all_active(loader: BulkLoader):
     loads = loader.get_active_loads()
     logger.info(f"Loading {loads}")
-    for load in loads:
-        loader._load_id = load
-        try:
-            loader.cancel_load()
-        except Exception as e:
-            logger.warn(f"Failed to cancel {load} {e}")
-    loader._load_id = None
+    async_loader = AsyncBulkLoader.from_bulk_loader(loader)
+    try:
+        asyncio.run(async_loader.cancel_all(loads))
+    finally:
+        async_loader.close()
     return
 
 
@@ -0,0 +1,157 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_LENGTH = 20
+DEFAULT_MINIMUM_INTERVAL_IN_SECONDS = 5
+DEFAULT_MAXIMUM_INTERVAL_IN_SECONDS = 5 * 60
+DEFAULT_BACKOFF_FACTOR = 2.0
+DEFAULT_JITTER = 0.1
+# Poll again once this fraction of the estimated remaining time has elapsed
+DEFAULT_ETA_FRACTION = 0.5
+COMPLETED_FEED_STATUS = "LOAD_COMPLETED"
+
+
+@dataclass
+class LoadProgressSample:
+    observed_at: float
+    total_records: int
+    total_time_spent: int
+
+
+class LoadProgress:
+    """Rolling history of the counters a single load reports on each status poll."""
+
+    def __init__(
+        self,
+        expected_total_records: Optional[int] = None,
+        history_length: int = DEFAULT_HISTORY_LENGTH,
+    ):
+        self._expected_total_records = expected_total_records
+        self._samples: Deque[LoadProgressSample] = deque(maxlen=history_length)
+        self._feed_count = {}
+
+    @property
+    def samples(self):
+        return list(self._samples)
+
+    @property
+    def latest(self) -> Optional[LoadProgressSample]:
+        return self._samples[-1] if self._samples else None
+
+    def record(self, status, observed_at: Optional[float] = None):
+        if observed_at is None:
+            observed_at = time.monotonic()
+        self._samples.append(
+            LoadProgressSample(
+                observed_at=observed_at,
+                total_records=status.total_records or 0,
+                total_time_spent=status.total_time_spent or 0,
+            )
+        )
+        self._feed_count = status.feed_count
+
+    @property
+    def records_per_second(self) -> Optional[float]:
+        if len(self._samples) < 2:
+            latest = self.latest
+            if latest and latest.total_time_spent > 0:
+                return latest.total_records / latest.total_time_spent
+            return None
+        first, last = self._samples[0], self._samples[-1]
+        elapsed = last.total_time_spent - first.total_time_spent
+        if elapsed <= 0:
+            elapsed = last.observed_at - first.observed_at
+        if elapsed <= 0:
+            return None
+        return (last.total_records - first.total_records) / elapsed
+
+    @property
+    def is_stalled(self) -> bool:
+        return len(self._samples) >= 2 and not self.records_per_second
+
+    @property
+    def completed_feed_fraction(self) -> Optional[float]:
+        total_feeds = sum(self._feed_count.values())
+        if not total_feeds:
+            return None
+        return self._feed_count.get(COMPLETED_FEED_STATUS, 0) / total_feeds
+
+    def estimate_seconds_remaining(self) -> Optional[float]:
+        latest = self.latest
+        if not latest:
+            return None
+        rate = self.records_per_second
+        if self._expected_total_records and rate:
+            remaining_records = max(
+                self._expected_total_records - latest.total_records, 0
+            )
+            return remaining_records / rate
+        # Without a record target, fall back to how many input files are done
+        fraction = self.completed_feed_fraction
+        if fraction and latest.total_time_spent:
+            return latest.total_time_spent * (1 - fraction) / fraction
+        return None
+
+
+class AdaptivePoller:
+    """Picks the delay before the next status poll of a load.
+
+    With an ETA the next poll lands a fraction of the way into the remaining
+    time; without one the delay backs off exponentially. Either way it is
+    jittered and clamped between the minimum interval and the ceiling.
+    """
+
+    def __init__(
+        self,
+        minimum_interval_in_seconds: float = DEFAULT_MINIMUM_INTERVAL_IN_SECONDS,
+        maximum_interval_in_seconds: float = DEFAULT_MAXIMUM_INTERVAL_IN_SECONDS,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        jitter: float = DEFAULT_JITTER,
+        eta_fraction: float = DEFAULT_ETA_FRACTION,
+        random_generator: Optional[random.Random] = None,
+    ):
+        if maximum_interval_in_seconds < minimum_interval_in_seconds:
+            raise Exception(
+                f"Ceiling {maximum_interval_in_seconds} is below minimum {minimum_interval_in_seconds}"
+            )
+        self._minimum_interval_in_seconds = minimum_interval_in_seconds
+        self._maximum_interval_in_seconds = maximum_interval_in_seconds
+        self._backoff_factor = backoff_factor
+        self._jitter = jitter
+        self._eta_fraction = eta_fraction
+        self._random = random_generator if random_generator else random.Random()
+        self._backoff_interval = minimum_interval_in_seconds
+
+    def reset(self):
+        self._backoff_interval = self._minimum_interval_in_seconds
+
+    def _clamp(self, interval: float) -> float:
+        return min(
+            max(interval, self._minimum_interval_in_seconds),
+            self._maximum_interval_in_seconds,
+        )
+
+    def next_interval(self, progress: LoadProgress) -> float:
+        eta = progress.estimate_seconds_remaining()
+        if eta is not None and not progress.is_stalled:
+            interval = eta * self._eta_fraction
+            self.reset()
+        else:
+            interval = self._backoff_interval
+            self._backoff_interval = self._clamp(
+                self._backoff_interval * self._backoff_factor
+            )
+        if self._jitter:
+            interval = interval * self._random.uniform(
+                1 - self._jitter, 1 + self._jitter
+            )
+        return self._clamp(interval)
@@ -0,0 +1,219 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+from neptune_load.bulk_loader.adaptive_poller import AdaptivePoller, LoadProgress
+from neptune_load.bulk_loader.bulk_loader import BulkLoader, BulkloadStatus
+from neptune_load.pooled_transport.pooled_transport import PooledTransport
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+
+logger = logging.getLogger(__name__)
+
+# BulkLoader insists on an S3 source even when it is only bound to an existing load
+READ_ONLY_SOURCE = "s3://loader/only/data"
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncBulkLoader:
+    """Follows many Neptune loads from a single event loop.
+
+    Every request is issued through a BulkLoader that shares the same signer and
+    pooled transport. The blocking HTTP calls run on a thread pool and a
+    semaphore caps how many of them are in flight at once, so hundreds of load
+    ids can be tracked without opening hundreds of connections.
+    """
+
+    def __init__(
+        self,
+        signer: SigV4Signer,
+        neptune_endpoint: str,
+        iam_role_arn: str,
+        parallelism: str = "MEDIUM",
+        update_single_cardinality_properties: str = "TRUE",
+        queueRequest: str = "FALSE",
+        region: str = "ap-southeast-1",
+        source_format: str = "ntriples",
+        maximum_wait_in_seconds: int = 60 * 10,
+        wait_between_queries_in_seconds: int = 5,
+        maximum_wait_between_queries_in_seconds: int = 60 * 5,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        transport: PooledTransport = None,
+        mode: str = "AUTO",
+        fail_on_error: str = "FALSE",
+        named_graph: str = None,
+    ):
+        self._signer = signer
+        self._neptune_endpoint = neptune_endpoint
+        self._iam_role_arn = iam_role_arn
+        self._parallelism = parallelism
+        self._update_single_cardinality_properties = (
+            update_single_cardinality_properties
+        )
+        self._queue_request = queueRequest
+        self._region = region
+        self._format = source_format
+        self._mode = mode
+        self._fail_on_error = fail_on_error
+        self._named_graph = named_graph
+        self._maximum_wait_in_seconds = maximum_wait_in_seconds
+        self._wait_between_queries_in_seconds = wait_between_queries_in_seconds
+        self._maximum_wait_between_queries_in_seconds = max(
+            wait_between_queries_in_seconds, maximum_wait_between_queries_in_seconds
+        )
+        self._max_concurrency = max_concurrency
+        self._transport = transport
+
+        if transport and transport.pool_maxsize < max_concurrency:
+            logger.warning(
+                f"Concurrency {max_concurrency} exceeds connection pool size {transport.pool_maxsize}"
+            )
+
+        self._progress: Dict[str, LoadProgress] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_bulk_loader(cls, bulk_loader: BulkLoader, **kwargs):
+        return cls(
+            signer=bulk_loader._signer,
+            neptune_endpoint=bulk_loader._neptune_endpoint,
+            iam_role_arn=bulk_loader._iam_role_arn,
+            parallelism=bulk_loader._parallelism,
+            update_single_cardinality_properties=bulk_loader._update_single_cardinality_properties,
+            queueRequest=bulk_loader._queue_request,
+            region=bulk_loader._region,
+            source_format=bulk_loader._format,
+            maximum_wait_in_seconds=bulk_loader._maximum_wait_in_seconds,
+            wait_between_queries_in_seconds=bulk_loader._wait_between_queries_in_seconds,
+            maximum_wait_between_queries_in_seconds=bulk_loader._maximum_wait_between_queries_in_seconds,
+            transport=bulk_loader._transport,
+            mode=bulk_loader._mode,
+            fail_on_error=bulk_loader._fail_on_error,
+            named_graph=bulk_loader._named_graph,
+            **kwargs,
+        )
+
+    def make_bulk_loader(
+        self, source: str = READ_ONLY_SOURCE, load_id: str = None
+    ) -> BulkLoader:
+        return BulkLoader(
+            signer=self._signer,
+            source=source,
+            neptune_endpoint=self._neptune_endpoint,
+            iam_role_arn=self._iam_role_arn,
+            parallelism=self._parallelism,
+            update_single_cardinality_properties=self._update_single_cardinality_properties,
+            queueRequest=self._queue_request,
+            region=self._region,
+            source_format=self._format,
+            maximum_wait_in_seconds=self._maximum_wait_in_seconds,
+            wait_between_queries_in_seconds=self._wait_between_queries_in_seconds,
+            maximum_wait_between_queries_in_seconds=self._maximum_wait_between_queries_in_seconds,
+            load_id=load_id,
+            transport=self._transport,
+            mode=self._mode,
+            fail_on_error=self._fail_on_error,
+            named_graph=self._named_graph,
+        )
+
+    async def _run(self, function, *args):
+        if not self._semaphore:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_concurrency,
+                thread_name_prefix="async-bulk-loader",
+            )
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, function, *args)
+
+    async def submit(self, source: str) -> str:
+        bulk_loader = self.make_bulk_loader(source=source)
+        await self._run(bulk_loader.initiate_bulk_load_from_s3)
+        return bulk_loader.load_id
+
+    async def submit_all(self, sources: Iterable[str]) -> Dict[str, str]:
+        sources = list(sources)
+        load_ids = await asyncio.gather(*[self.submit(source) for source in sources])
+        return dict(zip(sources, load_ids))
+
+    def progress(self, load_id: str) -> LoadProgress:
+        if load_id not in self._progress:
+            self._progress[load_id] = LoadProgress()
+        return self._progress[load_id]
+
+    async def status(self, load_id: str) -> BulkloadStatus:
+        bulk_loader = self.make_bulk_loader(load_id=load_id)
+        await self._run(bulk_loader._refresh_status)
+        self.progress(load_id).record(bulk_loader.status)
+        return bulk_loader.status
+
+    async def cancel(self, load_id: str) -> BulkloadStatus:
+        bulk_loader = self.make_bulk_loader(load_id=load_id)
+        await self._run(bulk_loader.cancel_load)
+        return bulk_loader.status
+
+    async def get_active_loads(self) -> List[str]:
+        return await self._run(self.make_bulk_loader().get_active_loads)
+
+    async def cancel_all(
+        self, load_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, Union[BulkloadStatus, Exception]]:
+        if load_ids is None:
+            load_ids = await self.get_active_loads()
+        load_ids = list(load_ids)
+        logger.info(f"Cancelling {len(load_ids)} loads")
+        results = await asyncio.gather(
+            *[self.cancel(load_id) for load_id in load_ids], return_exceptions=True
+        )
+        for load_id, result in zip(load_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to cancel {load_id} {result}")
+        return dict(zip(load_ids, results))
+
+    async def wait_for_load(self, load_id: str) -> BulkloadStatus:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._maximum_wait_in_seconds
+        poller = AdaptivePoller(
+            minimum_interval_in_seconds=self._wait_between_queries_in_seconds,
+            maximum_interval_in_seconds=self._maximum_wait_between_queries_in_seconds,
+        )
+        status = await self.status(load_id)
+        while status.is_active:
+            time_left = deadline - loop.time()
+            if time_left <= 0:
+                raise Exception(
+                    f"Load {load_id} did not complete within {self._maximum_wait_in_seconds} seconds"
+                )
+            interval = poller.next_interval(self.progress(load_id))
+            await asyncio.sleep(min(interval, time_left))
+            status = await self.status(load_id)
+        logger.info(f"Load {load_id} finished with {status.status}")
+        return status
+
+    async def wait_for_all(
+        self, load_ids: Iterable[str]
+    ) -> Dict[str, Union[BulkloadStatus, Exception]]:
+        load_ids = list(load_ids)
+        results = await asyncio.gather(
+            *[self.wait_for_load(load_id) for load_id in load_ids],
+            return_exceptions=True,
+        )
+        return dict(zip(load_ids, results))
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
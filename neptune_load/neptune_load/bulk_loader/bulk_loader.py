@@ -1,9 +1,12 @@
 # Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
-from typing import Dict, overload
+from typing import Dict, Iterator, List, overload
 from requests.models import Response
 from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+from neptune_load.pooled_transport.pooled_transport import PooledTransport
+from neptune_load.bulk_loader.adaptive_poller import AdaptivePoller, LoadProgress
+from neptune_load.bulk_loader.load_errors import LoadErrorSummary
 import json
 import time
 from types import SimpleNamespace
@@ -14,6 +17,8 @@ import sys
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ERRORS_PER_PAGE = 100
+
 
 class BulkloadStatus:
     class LoadStatus(Enum):
@@ -37,26 +42,35 @@ class BulkloadStatus:
         LOAD_IN_QUEUE = "LOAD_IN_QUEUE"
         LOAD_FAILED_INVALID_REQUEST = "LOAD_FAILED_INVALID_REQUEST"
 
+    ACTIVE_STATUSES = (
+        LoadStatus.LOAD_NOT_STARTED,
+        LoadStatus.LOAD_IN_PROGRESS,
+        LoadStatus.LOAD_IN_QUEUE,
+    )
+
+    __slots__ = (
+        "_status",
+        "_overall_status",
+        "_feed_count",
+        "_response_status",
+        "_raw_text",
+        "_raw",
+    )
+
     def __init__(
         self,
-        status,
-        start_time,
-        total_time_spent,
-        total_records,
-        total_duplicates,
-        parsing_errors,
-        insert_errors,
-        source,
-        raw,
+        overall_status: Dict,
+        feed_count: List[Dict] = None,
+        response_status: str = None,
+        raw_text: str = None,
+        raw: Dict = None,
     ):
-        self._status = status
-        self._start_time = start_time
-        self._total_time_spent = total_time_spent
-        self._total_records = total_records
-        self._total_duplicates = total_duplicates
-        self._parsing_errors = parsing_errors
-        self._insert_errors = insert_errors
-        self._source = source
+        self._status = BulkloadStatus.LoadStatus(overall_status["status"])
+        self._overall_status = overall_status
+        self._feed_count = feed_count if feed_count else []
+        self._response_status = response_status
+        # The body is only decoded in full if someone asks for it
+        self._raw_text = raw_text
         self._raw = raw
 
     @property
@@ -64,36 +78,86 @@ class BulkloadStatus:
         return self._status
 
     @property
-    def raw(self):
+    def raw(self) -> Dict:
+        if self._raw is None:
+            self._raw = json.loads(self._raw_text) if self._raw_text else self.compact
         return self._raw
 
+    @property
+    def is_active(self) -> bool:
+        return self._status in BulkloadStatus.ACTIVE_STATUSES
+
+    @property
+    def start_time(self):
+        return self._overall_status["startTime"]
+
+    @property
+    def total_time_spent(self):
+        return self._overall_status["totalTimeSpent"]
+
+    @property
+    def total_records(self):
+        return self._overall_status["totalRecords"]
+
+    @property
+    def total_duplicates(self):
+        return self._overall_status["totalDuplicates"]
+
+    @property
+    def parsing_errors(self):
+        return self._overall_status["parsingErrors"]
+
+    @property
+    def insert_errors(self):
+        return self._overall_status["insertErrors"]
+
+    @property
+    def datatype_mismatch_errors(self):
+        return self._overall_status.get("datatypeMismatchErrors", 0)
+
+    @property
+    def source(self):
+        return self._overall_status["fullUri"]
+
+    @property
+    def feed_count(self) -> Dict[str, int]:
+        feed_count = {}
+        for entry in self._feed_count:
+            feed_count.update(entry)
+        return feed_count
+
+    @property
+    def has_errors(self) -> bool:
+        if self._status in BulkloadStatus.ACTIVE_STATUSES:
+            return False
+        return bool(
+            self._status != BulkloadStatus.LoadStatus.LOAD_COMPLETED
+            or self.parsing_errors
+            or self.insert_errors
+            or self.datatype_mismatch_errors
+        )
+
+    @property
+    def compact(self) -> Dict:
+        return {
+            "status": self._response_status,
+            "payload": {
+                "feedCount": self._feed_count,
+                "overallStatus": self._overall_status,
+            },
+        }
+
     @classmethod
-    def create_from_api_response_text(self, api_response_text: str):
-        print(api_response_text)
-        return json.loads(api_response_text, cls=BulkLoadStatusDecoder)
-
-
-class BulkLoadStatusDecoder(json.JSONDecoder):
-    def __init__(self, *args, **kwargs):
-
-        json.JSONDecoder.__init__(self, object_hook=self.object_hook, *args, **kwargs)
-
-    def object_hook(self, obj) -> BulkloadStatus:
-        if not "payload" in obj:
-            return obj
-        payload = obj["payload"]
-        overall_status = payload["overallStatus"]
-
-        return BulkloadStatus(
-            status=BulkloadStatus.LoadStatus(overall_status["status"]),
-            start_time=overall_status["startTime"],
-            total_time_spent=overall_status["totalTimeSpent"],
-            total_records=overall_status["totalRecords"],
-            total_duplicates=overall_status["totalDuplicates"],
-            parsing_errors=overall_status["parsingErrors"],
-            insert_errors=overall_status["insertErrors"],
-            source=overall_status["fullUri"],
-            raw=obj,
+    def create_from_api_response_text(cls, api_response_text: str):
+        response = json.loads(api_response_text)
+        payload = response.get("payload")
+        if not payload or "overallStatus" not in payload:
+            raise Exception(f"Not a load status response {api_response_text[:200]}")
+        return cls(
+            overall_status=payload["overallStatus"],
+            feed_count=payload.get("feedCount"),
+            response_status=response.get("status"),
+            raw_text=api_response_text,
         )
 
     """ From https://docs.aws.amazon.com/neptune/latest/userguide/load-api-reference-status-response.html
@@ -158,6 +222,14 @@ class BulkLoader:
         maximum_wait_in_seconds: int = 60 * 10,
         wait_between_queries_in_seconds: int = 5,
         load_id: str = None,
+        transport: PooledTransport = None,
+        maximum_wait_between_queries_in_seconds: int = 60 * 5,
+        expected_total_records: int = None,
+        poller: AdaptivePoller = None,
+        mode: str = "AUTO",
+        fail_on_error: str = "FALSE",
+        named_graph: str = None,
+        dependencies: List[str] = None,
     ):
         if not "s3://" in source:
             raise Exception(f"Not a valid S3 URL {source}")
@@ -173,11 +245,29 @@ class BulkLoader:
         self._region = region
         self._format = source_format
         self._source = source
+        self._mode = mode
+        self._fail_on_error = fail_on_error
+        self._named_graph = named_graph
+        self._dependencies = dependencies
         self._maximum_wait_in_seconds = maximum_wait_in_seconds
         self._wait_between_queries_in_seconds = wait_between_queries_in_seconds
 
         self._status: BulkloadStatus = None
         self._load_id = load_id if load_id else None
+        # None means reuse the pooled transport the signer attached to the request
+        self._transport = transport
+        self._maximum_wait_between_queries_in_seconds = max(
+            wait_between_queries_in_seconds, maximum_wait_between_queries_in_seconds
+        )
+        self._poller = (
+            poller
+            if poller
+            else AdaptivePoller(
+                minimum_interval_in_seconds=wait_between_queries_in_seconds,
+                maximum_interval_in_seconds=self._maximum_wait_between_queries_in_seconds,
+            )
+        )
+        self._progress = LoadProgress(expected_total_records=expected_total_records)
 
     @property
     def status(self) -> BulkloadStatus:
@@ -185,6 +275,14 @@ class BulkLoader:
             raise Exception("Not loading yet")
         return self._status
 
+    @property
+    def progress(self) -> LoadProgress:
+        return self._progress
+
+    @property
+    def eta_in_seconds(self):
+        return self._progress.estimate_seconds_remaining()
+
     @property
     def load_id(self) -> str:
         if not self._load_id:
@@ -207,20 +305,38 @@ class BulkLoader:
             raise Exception("Already bound to loadid:{self._load_id} ")
 
     def _wait_for_load_complete(self):
-        load_complete = False
         start_time = datetime.now()
-        while not load_complete:
-            time.sleep(self._wait_between_queries_in_seconds)
-            logger.info(self.status.raw)
-            if self.status.status == BulkloadStatus.LoadStatus.LOAD_COMPLETED:
-                load_complete = True
-            time_waiting = datetime.now() - start_time
-            if time_waiting.seconds >= self._maximum_wait_in_seconds:
+        while self.status.status != BulkloadStatus.LoadStatus.LOAD_COMPLETED:
+            if not self.status.is_active:
+                raise Exception(
+                    f"Load {self.load_id} finished with {self.status.status.value}"
+                )
+            time_waiting = (datetime.now() - start_time).total_seconds()
+            time_left = self._maximum_wait_in_seconds - time_waiting
+            if time_left <= 0:
                 raise Exception(
                     f"Load did not complete within {self._maximum_wait_in_seconds} seconds"
                 )
+            interval = min(self._poller.next_interval(self._progress), time_left)
+            self._log_progress(interval)
+            time.sleep(interval)
             self._refresh_status()
 
+    def _log_progress(self, next_poll_in_seconds):
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        rate = self._progress.records_per_second
+        eta = self.eta_in_seconds
+        logger.info(
+            "Load %s %s records=%s rate=%s records/s eta=%s s next poll in %.1f s",
+            self.load_id,
+            self.status.status.value,
+            self.status.total_records,
+            f"{rate:.0f}" if rate is not None else "unknown",
+            f"{eta:.0f}" if eta is not None else "unknown",
+            next_poll_in_seconds,
+        )
+
     def _refresh_status(self):
         self.load_id
         query_string = json.dumps(self._construct_status_query())
@@ -237,15 +353,142 @@ class BulkLoader:
         )
 
         self._status = BulkloadStatus.create_from_api_response_text(response_text)
+        self._progress.record(self._status)
         return
 
-    def _construct_status_query(self):
-        return {
+    def _query_status_page(
+        self,
+        details: bool,
+        errors: bool,
+        page: int = 1,
+        errors_per_page: int = DEFAULT_ERRORS_PER_PAGE,
+    ) -> Dict:
+        query_string = json.dumps(
+            self._construct_status_query(
+                details=details,
+                errors=errors,
+                page=page,
+                errors_per_page=errors_per_page,
+            )
+        )
+        signed_request = self._signer.get_signed_request(
+            host=self._neptune_endpoint,
+            method="GET",
+            query_type="loader",
+            query=query_string,
+        )
+        response_text = self._execute_and_handle_signed_request(
+            signed_request=signed_request
+        )
+        return json.loads(response_text)["payload"]
+
+    def iter_error_logs(
+        self, errors_per_page: int = DEFAULT_ERRORS_PER_PAGE, max_pages: int = None
+    ) -> Iterator[Dict]:
+        page = 1
+        while max_pages is None or page <= max_pages:
+            payload = self._query_status_page(
+                details=False, errors=True, page=page, errors_per_page=errors_per_page
+            )
+            error_logs = payload.get("errors", {}).get("errorLogs", [])
+            yield from error_logs
+            if len(error_logs) < errors_per_page:
+                return
+            page = page + 1
+
+    def iter_failed_feeds(self) -> Iterator[Dict]:
+        payload = self._query_status_page(details=True, errors=False)
+        yield from payload.get("failedFeeds", [])
+
+    def failed_sources(self) -> List[str]:
+        return [failed_feed["fullUri"] for failed_feed in self.iter_failed_feeds()]
+
+    def for_source(
+        self, source: str, queueRequest: str = None, dependencies: List[str] = None
+    ):
+        return BulkLoader(
+            signer=self._signer,
+            source=source,
+            neptune_endpoint=self._neptune_endpoint,
+            iam_role_arn=self._iam_role_arn,
+            parallelism=self._parallelism,
+            update_single_cardinality_properties=self._update_single_cardinality_properties,
+            queueRequest=queueRequest if queueRequest else self._queue_request,
+            region=self._region,
+            source_format=self._format,
+            maximum_wait_in_seconds=self._maximum_wait_in_seconds,
+            wait_between_queries_in_seconds=self._wait_between_queries_in_seconds,
+            transport=self._transport,
+            maximum_wait_between_queries_in_seconds=self._maximum_wait_between_queries_in_seconds,
+            mode=self._mode,
+            fail_on_error=self._fail_on_error,
+            named_graph=self._named_graph,
+            dependencies=dependencies,
+        )
+
+    def chain_load(self, sources: List[str]) -> Dict[str, str]:
+        # Each load is queued behind the previous one, so the last load id only
+        # completes once every source has and fails if any of them did
+        load_ids = {}
+        previous_load_id = None
+        for source in sources:
+            loader = self.for_source(
+                source,
+                queueRequest="TRUE",
+                dependencies=[previous_load_id] if previous_load_id else None,
+            )
+            loader.initiate_bulk_load_from_s3()
+            load_ids[source] = previous_load_id = loader.load_id
+        return load_ids
+
+    def queue_loads(self, sources: List[str]) -> Dict[str, str]:
+        # Every load is queued on its own, one failing does not fail the others
+        load_ids = {}
+        for source in sources:
+            loader = self.for_source(source, queueRequest="TRUE")
+            loader.initiate_bulk_load_from_s3()
+            load_ids[source] = loader.load_id
+        return load_ids
+
+    def retry_failed_feeds(self, failed_sources: List[str] = None) -> Dict[str, str]:
+        if failed_sources is None:
+            failed_sources = self.failed_sources()
+        # A feed that failed before is likely to fail again, chaining the
+        # retries would fail every one queued after it
+        retry_load_ids = self.queue_loads(failed_sources)
+        logger.info(f"Retrying {len(retry_load_ids)} failed feeds of {self.load_id}")
+        return retry_load_ids
+
+    def summarize_errors(
+        self, errors_per_page: int = DEFAULT_ERRORS_PER_PAGE, max_errors: int = None
+    ) -> LoadErrorSummary:
+        summary = LoadErrorSummary.from_entries(
+            error_logs=self.iter_error_logs(errors_per_page=errors_per_page),
+            failed_feeds=self.iter_failed_feeds(),
+            max_errors=max_errors,
+        )
+        logger.info(
+            f"Load {self.load_id} has {summary.total_errors} errors and {len(summary.failed_feeds)} failed feeds"
+        )
+        return summary
+
+    # Status polls leave the error logs out; they are paged in by iter_error_logs
+    def _construct_status_query(
+        self,
+        details: bool = True,
+        errors: bool = False,
+        page: int = 1,
+        errors_per_page: int = DEFAULT_ERRORS_PER_PAGE,
+    ):
+        status_query = {
             "loadId": self.load_id,
-            "details": "true",
-            "errors": "true",
-            "page": "1",
+            "details": "true" if details else "false",
+            "errors": "true" if errors else "false",
         }
+        if errors:
+            status_query["page"] = str(page)
+            status_query["errorsPerPage"] = str(errors_per_page)
+        return status_query
 
     def initiate_bulk_load_from_s3(
         self,
@@ -269,7 +512,7 @@ class BulkLoader:
 
     def _execute_and_handle_signed_request(self, signed_request) -> SimpleNamespace:
 
-        response: Response = signed_request.execute()
+        response: Response = signed_request.execute(transport=self._transport)
         if not (response.status_code == 200):
             raise Exception(f"Request returned {response.status_code} {response.text}")
 
@@ -357,11 +600,16 @@ class BulkLoader:
             "format": self._format,
             "iamRoleArn": self._iam_role_arn,
             "region": self._region,
-            "failOnError": "FALSE",
+            "mode": self._mode,
+            "failOnError": self._fail_on_error,
             "parallelism": self._parallelism,
             "updateSingleCardinalityProperties": self._update_single_cardinality_properties,
             "queueRequest": self._queue_request,
         }
+        if self._named_graph:
+            load_query["parserConfiguration"] = {"namedGraphUri": self._named_graph}
+        if self._dependencies:
+            load_query["dependencies"] = self._dependencies
 
         return load_query
 
@@ -0,0 +1,82 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+DEFAULT_SAMPLE_SIZE = 5
+UNKNOWN = "UNKNOWN"
+
+
+@dataclass
+class LoadErrorSummary:
+    """Counts of the errors and failed feeds of a load, small enough to store.
+
+    Entries are folded in one at a time so a summary can be built straight from
+    the paged error generators without holding every error log in memory.
+    """
+
+    total_errors: int = 0
+    errors_by_code: Dict[str, int] = field(default_factory=dict)
+    errors_by_file: Dict[str, int] = field(default_factory=dict)
+    failed_feeds: Dict[str, str] = field(default_factory=dict)
+    sample_errors: List[Dict] = field(default_factory=list)
+    truncated: bool = False
+
+    def add_error_log(self, error_log: Dict, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.total_errors = self.total_errors + 1
+        error_code = error_log.get("errorCode", UNKNOWN)
+        file_name = error_log.get("fileName", UNKNOWN)
+        self.errors_by_code[error_code] = self.errors_by_code.get(error_code, 0) + 1
+        self.errors_by_file[file_name] = self.errors_by_file.get(file_name, 0) + 1
+        if len(self.sample_errors) < sample_size:
+            self.sample_errors.append(error_log)
+
+    def add_failed_feed(self, failed_feed: Dict):
+        self.failed_feeds[failed_feed["fullUri"]] = failed_feed.get("status", UNKNOWN)
+
+    @property
+    def has_errors(self) -> bool:
+        return bool(self.total_errors or self.failed_feeds)
+
+    @property
+    def json(self) -> Dict:
+        return {
+            "totalErrors": self.total_errors,
+            "errorsByCode": self.errors_by_code,
+            "errorsByFile": self.errors_by_file,
+            "failedFeeds": self.failed_feeds,
+            "sampleErrors": self.sample_errors,
+            "truncated": self.truncated,
+        }
+
+    @classmethod
+    def from_json(cls, the_json: Dict):
+        if not the_json:
+            return cls()
+        return cls(
+            total_errors=the_json.get("totalErrors", 0),
+            errors_by_code=the_json.get("errorsByCode", {}),
+            errors_by_file=the_json.get("errorsByFile", {}),
+            failed_feeds=the_json.get("failedFeeds", {}),
+            sample_errors=the_json.get("sampleErrors", []),
+            truncated=the_json.get("truncated", False),
+        )
+
+    @classmethod
+    def from_entries(
+        cls,
+        error_logs: Iterable[Dict],
+        failed_feeds: Iterable[Dict] = (),
+        max_errors: int = None,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ):
+        summary = cls()
+        for failed_feed in failed_feeds:
+            summary.add_failed_feed(failed_feed)
+        for error_log in error_logs:
+            if max_errors is not None and summary.total_errors >= max_errors:
+                summary.truncated = True
+                break
+            summary.add_error_log(error_log, sample_size=sample_size)
+        return summary
@@ -0,0 +1,80 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import heapq
+import os
+from enum import Enum
+from typing import Dict, List
+
+# Neptune accepts at most this many queued load requests
+MAXIMUM_QUEUED_LOADS = 64
+
+
+class ShardStrategy(Enum):
+    SIZE = "SIZE"
+    LISTING = "LISTING"
+
+
+def plan_shards(
+    object_sizes: Dict[str, int],
+    shard_count: int,
+    strategy: ShardStrategy = ShardStrategy.SIZE,
+) -> List[List[str]]:
+    """Splits the objects of a load source into at most shard_count groups.
+
+    SIZE balances the bytes per shard (largest object first onto the lightest
+    shard), LISTING cuts the sorted listing into contiguous runs so shards are
+    more likely to collapse into a single prefix.
+    """
+    if shard_count < 1:
+        raise Exception(f"Need at least one shard, got {shard_count}")
+    uris = sorted(object_sizes)
+    shard_count = min(shard_count, len(uris))
+    if not shard_count:
+        return []
+    if strategy == ShardStrategy.LISTING:
+        shard_size, remainder = divmod(len(uris), shard_count)
+        shards, start = [], 0
+        for index in range(shard_count):
+            end = start + shard_size + (1 if index < remainder else 0)
+            shards.append(uris[start:end])
+            start = end
+        return shards
+
+    heap = [(0, index) for index in range(shard_count)]
+    shards = [[] for _ in range(shard_count)]
+    for uri in sorted(uris, key=lambda uri: object_sizes[uri], reverse=True):
+        shard_bytes, index = heapq.heappop(heap)
+        shards[index].append(uri)
+        heapq.heappush(heap, (shard_bytes + object_sizes[uri], index))
+    return [sorted(shard) for shard in shards if shard]
+
+
+def shard_sources(shard: List[str], all_uris: List[str]) -> List[str]:
+    """Load sources for one shard: a common prefix if it selects exactly the
+    shard's objects, otherwise one source per object."""
+    if len(shard) == 1:
+        return list(shard)
+    prefix = os.path.commonprefix(shard)
+    covered = [uri for uri in all_uris if uri.startswith(prefix)]
+    if prefix and sorted(covered) == sorted(shard):
+        return [prefix]
+    return list(shard)
+
+
+def plan_load_sources(
+    object_sizes: Dict[str, int],
+    shard_count: int,
+    strategy: ShardStrategy = ShardStrategy.SIZE,
+) -> List[List[str]]:
+    all_uris = list(object_sizes)
+    planned = [
+        shard_sources(shard, all_uris)
+        for shard in plan_shards(object_sizes, shard_count, strategy)
+    ]
+    load_count = sum(len(sources) for sources in planned)
+    if load_count > MAXIMUM_QUEUED_LOADS:
+        raise Exception(
+            f"{load_count} loads exceed the Neptune queue of {MAXIMUM_QUEUED_LOADS}, use the LISTING strategy or fewer objects"
+        )
+    return planned
@@ -0,0 +1,144 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from neptune_load.query_client.query_client import NeptuneQueryClient
+from neptune_load.sparql_update.sparql_update import SparqlUpdateClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRIPLES_PER_BATCH = 50000
+MINIMUM_TRIPLES_PER_BATCH = 1000
+DEFAULT_PAUSE_IN_SECONDS = 1.0
+DEFAULT_MAX_FAILURES = 5
+
+
+def graph_count_query(graph: str) -> str:
+    return f"SELECT (COUNT(*) AS ?count) WHERE {{ GRAPH <{graph}> {{ ?s ?p ?o }} }}"
+
+
+def graph_not_empty_query(graph: str) -> str:
+    return f"ASK WHERE {{ GRAPH <{graph}> {{ ?s ?p ?o }} }}"
+
+
+def delete_batch_update(graph: str, triples_per_batch: int) -> str:
+    return (
+        f"DELETE {{ GRAPH <{graph}> {{ ?s ?p ?o }} }}\n"
+        f"WHERE {{ SELECT ?s ?p ?o WHERE {{ GRAPH <{graph}> {{ ?s ?p ?o }} }} "
+        f"LIMIT {triples_per_batch} }}"
+    )
+
+
+@dataclass
+class PurgeProgress:
+    graph: str = ""
+    triples_at_start: int = 0
+    # estimated from the batch sizes, settled to triples_at_start once empty
+    triples_deleted: int = 0
+    batches: int = 0
+    failures: int = 0
+    triples_per_batch: int = DEFAULT_TRIPLES_PER_BATCH
+    elapsed_in_seconds: float = 0.0
+    done: bool = False
+
+    @property
+    def fraction_done(self) -> float:
+        if self.done or not self.triples_at_start:
+            return 1.0 if self.done else 0.0
+        return self.triples_deleted / self.triples_at_start
+
+    @property
+    def json(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(**the_dict) if the_dict else cls()
+
+
+class GraphPurger:
+    """Empties one named graph in bounded DELETE batches.
+
+    A single DROP GRAPH of a large graph is one long transaction that holds
+    the writer for its whole duration. Deleting LIMIT-sized batches with a
+    pause in between keeps each transaction short and leaves room for other
+    writes. A failed batch is retried at half the size after a growing pause.
+    Progress is reported after every batch and can be passed back in to resume.
+    """
+
+    def __init__(
+        self,
+        update_client: SparqlUpdateClient,
+        query_client: NeptuneQueryClient,
+        triples_per_batch: int = DEFAULT_TRIPLES_PER_BATCH,
+        pause_in_seconds: float = DEFAULT_PAUSE_IN_SECONDS,
+        max_failures: int = DEFAULT_MAX_FAILURES,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._update_client = update_client
+        self._query_client = query_client
+        self._triples_per_batch = triples_per_batch
+        self._pause_in_seconds = pause_in_seconds
+        self._max_failures = max_failures
+        self._sleep = sleep
+        self._clock = clock
+
+    def purge(
+        self,
+        graph: str,
+        on_progress: Callable[[PurgeProgress], None] = None,
+        progress: PurgeProgress = None,
+    ) -> PurgeProgress:
+        if not progress:
+            triples_at_start = self._query_client.count(graph_count_query(graph))
+            progress = PurgeProgress(
+                graph=graph,
+                triples_at_start=triples_at_start or 0,
+                triples_per_batch=self._triples_per_batch,
+            )
+        logger.info(f"Purging {progress.triples_at_start} triples from <{graph}>")
+        started = self._clock() - progress.elapsed_in_seconds
+        consecutive_failures = 0
+        while self._query_client.ask(graph_not_empty_query(graph)):
+            try:
+                self._update_client.execute(
+                    delete_batch_update(graph, progress.triples_per_batch)
+                )
+            except Exception as e:
+                progress.failures = progress.failures + 1
+                consecutive_failures = consecutive_failures + 1
+                if consecutive_failures > self._max_failures:
+                    raise
+                progress.triples_per_batch = max(
+                    MINIMUM_TRIPLES_PER_BATCH, progress.triples_per_batch // 2
+                )
+                logger.warning(
+                    f"Purge batch of <{graph}> failed, retrying with {progress.triples_per_batch} {e}"
+                )
+                self._sleep(self._pause_in_seconds * 2 ** consecutive_failures)
+                continue
+            consecutive_failures = 0
+            progress.batches = progress.batches + 1
+            progress.triples_deleted = min(
+                progress.triples_at_start,
+                progress.triples_deleted + progress.triples_per_batch,
+            )
+            progress.elapsed_in_seconds = round(self._clock() - started, 3)
+            if on_progress:
+                on_progress(progress)
+            self._sleep(self._pause_in_seconds)
+
+        progress.triples_deleted = progress.triples_at_start
+        progress.elapsed_in_seconds = round(self._clock() - started, 3)
+        progress.done = True
+        logger.info(
+            f"Purged <{graph}> in {progress.batches} batches and {progress.elapsed_in_seconds}s"
+        )
+        if on_progress:
+            on_progress(progress)
+        return progress
@@ -0,0 +1,431 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import heapq
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from neptune_load.bulk_loader.shard_planner import MAXIMUM_QUEUED_LOADS
+
+logger = logging.getLogger(__name__)
+
+LOAD_IN_QUEUE = "LOAD_IN_QUEUE"
+LOAD_IN_PROGRESS = "LOAD_IN_PROGRESS"
+LOAD_COMPLETED = "LOAD_COMPLETED"
+LOAD_FAILED = "LOAD_FAILED"
+LOAD_CANCELLED_BY_USER = "LOAD_CANCELLED_BY_USER"
+LOAD_FAILED_BECAUSE_DEPENDENCY_NOT_SATISFIED = (
+    "LOAD_FAILED_BECAUSE_DEPENDENCY_NOT_SATISFIED"
+)
+ACTIVE_STATUSES = (LOAD_IN_QUEUE, LOAD_IN_PROGRESS)
+
+# Neptune lists the 5 most recent loads unless asked for more, and at most 100
+DEFAULT_LIST_LIMIT = 5
+MAXIMUM_LIST_LIMIT = 100
+DEFAULT_ERRORS_PER_PAGE = 10
+AUTHORIZATION_PREFIX = "AWS4-HMAC-SHA256 Credential="
+
+Response = Tuple[int, Dict]
+
+
+@dataclass
+class EmulatorConfiguration:
+    load_duration_in_seconds: float = 1.0
+    # each load takes load_duration_in_seconds +/- this fraction of it
+    load_duration_jitter: float = 0.0
+    records_per_second: int = 100000
+    # Neptune runs one load at a time, raise this to simulate many at once
+    concurrent_loads: int = 1
+    max_queued_loads: int = MAXIMUM_QUEUED_LOADS
+    latency_in_seconds: float = 0.0
+    failure_rate: float = 0.0
+    # loads whose source contains any of these fragments always fail
+    failing_sources: List[str] = field(default_factory=list)
+    errors_per_failed_load: int = 3
+    # fraction of requests answered with a 500 before they reach the loader
+    request_failure_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class EmulatedLoad:
+    load_id: str
+    source: str
+    submitted_at: float
+    duration_in_seconds: float
+    will_fail: bool
+    dependencies: List[str] = field(default_factory=list)
+    status: str = LOAD_IN_QUEUE
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class LoaderEmulator:
+    """Simulates the /loader and /system endpoints of a Neptune cluster.
+
+    Loads are not driven by a background thread. Every request first advances
+    the simulation to the current clock, finishing the loads that ran out of
+    time and starting queued ones in their place, so thousands of loads cost
+    nothing between polls and tests can drive the clock by hand.
+    """
+
+    def __init__(
+        self,
+        configuration: EmulatorConfiguration = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._configuration = (
+            configuration if configuration else EmulatorConfiguration()
+        )
+        self._clock = clock
+        self._random = random.Random(self._configuration.seed)
+        self._lock = threading.Lock()
+        self.request_counts: Dict[str, int] = {}
+        self._clear()
+
+    @property
+    def configuration(self) -> EmulatorConfiguration:
+        return self._configuration
+
+    def _clear(self):
+        self._loads: Dict[str, EmulatedLoad] = {}
+        self._queue = deque()
+        # (finishes_at, load_id) of the running loads, cancelled ones are skipped
+        self._running: List[Tuple[float, str]] = []
+        self._running_ids = set()
+        self._reset_tokens = set()
+
+    def load(self, load_id: str) -> EmulatedLoad:
+        with self._lock:
+            self._advance(self._clock())
+            return self._loads[load_id]
+
+    def handle(
+        self, method: str, resource: str, parameters: Dict, headers: Dict = None
+    ) -> Response:
+        configuration = self._configuration
+        if configuration.latency_in_seconds:
+            time.sleep(configuration.latency_in_seconds)
+        with self._lock:
+            key = f"{method} /{resource}"
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+            if headers is not None and not self._is_signed(headers):
+                return _error(403, "AccessDeniedException", "Missing SigV4 signature")
+            if self._random.random() < configuration.request_failure_rate:
+                return _error(500, "InternalFailureException", "Injected failure")
+            self._advance(self._clock())
+            if resource == "loader":
+                if method == "POST":
+                    return self._submit(parameters)
+                if method == "DELETE":
+                    return self._cancel(parameters)
+                if parameters.get("loadId"):
+                    return self._status(parameters)
+                return self._list(parameters)
+            if resource == "system" and method == "POST":
+                return self._system(parameters)
+        return _error(400, "BadRequestException", f"Unsupported {method} /{resource}")
+
+    def _is_signed(self, headers) -> bool:
+        authorization = headers.get("Authorization", "")
+        return authorization.startswith(AUTHORIZATION_PREFIX) and bool(
+            headers.get("x-amz-date")
+        )
+
+    def _new_load_id(self) -> str:
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _submit(self, parameters: Dict) -> Response:
+        configuration = self._configuration
+        source = parameters.get("source", "")
+        if not source.startswith("s3://"):
+            return _error(400, "BadRequestException", f"Invalid source {source}")
+        dependencies = parameters.get("dependencies") or []
+        unknown = [load_id for load_id in dependencies if load_id not in self._loads]
+        if unknown:
+            return _error(400, "BadRequestException", f"Unknown dependencies {unknown}")
+        active = len(self._queue) + len(self._running_ids)
+        if active and not _flag(parameters.get("queueRequest")):
+            return _error(
+                400,
+                "BadRequestException",
+                f"Failed to start new load for the source {source}. Max concurrent load limit breached. Limit is 1",
+            )
+        if len(self._queue) >= configuration.max_queued_loads:
+            return _error(
+                400,
+                "BadRequestException",
+                f"Failed to start load because of too many queued load requests, limit is {configuration.max_queued_loads}",
+            )
+
+        jitter = configuration.load_duration_jitter * self._random.uniform(-1, 1)
+        will_fail = self._random.random() < configuration.failure_rate or any(
+            fragment in source for fragment in configuration.failing_sources
+        )
+        load = EmulatedLoad(
+            load_id=self._new_load_id(),
+            source=source,
+            submitted_at=self._clock(),
+            duration_in_seconds=configuration.load_duration_in_seconds * (1 + jitter),
+            will_fail=will_fail,
+            dependencies=list(dependencies),
+        )
+        self._loads[load.load_id] = load
+        self._queue.append(load.load_id)
+        self._start_queued(load.submitted_at)
+        return 200, {"status": "200 OK", "payload": {"loadId": load.load_id}}
+
+    def _advance(self, now: float):
+        while self._running and self._running[0][0] <= now:
+            finished_at, load_id = heapq.heappop(self._running)
+            if load_id not in self._running_ids:
+                continue
+            self._running_ids.discard(load_id)
+            load = self._loads[load_id]
+            load.status = LOAD_FAILED if load.will_fail else LOAD_COMPLETED
+            load.finished_at = finished_at
+            self._start_queued(finished_at)
+
+    def _start_queued(self, at: float):
+        waiting = deque()
+        while self._queue:
+            load = self._loads[self._queue.popleft()]
+            dependency_statuses = [
+                self._loads[load_id].status for load_id in load.dependencies
+            ]
+            if any(
+                status not in ACTIVE_STATUSES and status != LOAD_COMPLETED
+                for status in dependency_statuses
+            ):
+                load.status = LOAD_FAILED_BECAUSE_DEPENDENCY_NOT_SATISFIED
+                load.finished_at = at
+            elif (
+                all(status == LOAD_COMPLETED for status in dependency_statuses)
+                and len(self._running_ids) < self._configuration.concurrent_loads
+            ):
+                load.status = LOAD_IN_PROGRESS
+                load.started_at = max(at, load.submitted_at)
+                self._running_ids.add(load.load_id)
+                heapq.heappush(
+                    self._running,
+                    (load.started_at + load.duration_in_seconds, load.load_id),
+                )
+            else:
+                waiting.append(load.load_id)
+        self._queue = waiting
+
+    def _cancel(self, parameters: Dict) -> Response:
+        load = self._loads.get(parameters.get("loadId"))
+        if not load:
+            return _error(404, "LoadNotFoundException", "No such load")
+        if load.status not in ACTIVE_STATUSES:
+            return _error(
+                400, "BadRequestException", f"Load {load.load_id} is {load.status}"
+            )
+        now = self._clock()
+        if load.status == LOAD_IN_QUEUE:
+            self._queue.remove(load.load_id)
+        self._running_ids.discard(load.load_id)
+        load.status = LOAD_CANCELLED_BY_USER
+        load.finished_at = now
+        self._start_queued(now)
+        return 200, {"status": "200 OK"}
+
+    def _records(self, load: EmulatedLoad, now: float) -> Tuple[int, float]:
+        if load.started_at is None:
+            return 0, 0.0
+        until = now if load.finished_at is None else load.finished_at
+        spent = max(0.0, until - load.started_at)
+        return int(spent * self._configuration.records_per_second), spent
+
+    def _error_logs(self, load: EmulatedLoad) -> List[Dict]:
+        if not (load.will_fail and load.status == LOAD_FAILED):
+            return []
+        return [
+            {
+                "errorCode": "PARSING_ERROR",
+                "errorMessage": "Emulated parsing error",
+                "fileName": load.source,
+                "recordNum": index,
+            }
+            for index in range(1, self._configuration.errors_per_failed_load + 1)
+        ]
+
+    def _status(self, parameters: Dict) -> Response:
+        load = self._loads.get(parameters["loadId"])
+        if not load:
+            return _error(404, "LoadNotFoundException", "No such load")
+        total_records, spent = self._records(load, self._clock())
+        error_logs = self._error_logs(load)
+        overall_status = {
+            "fullUri": load.source,
+            "runNumber": 1,
+            "retryNumber": 0,
+            "status": load.status,
+            "totalTimeSpent": int(spent),
+            "startTime": int(load.submitted_at),
+            "totalRecords": total_records,
+            "totalDuplicates": 0,
+            "parsingErrors": len(error_logs),
+            "datatypeMismatchErrors": 0,
+            "insertErrors": 0,
+        }
+        payload = {"feedCount": [{load.status: 1}], "overallStatus": overall_status}
+        if _flag(parameters.get("details")) and load.status == LOAD_FAILED:
+            payload["failedFeeds"] = [dict(overall_status)]
+        if _flag(parameters.get("errors")):
+            page = int(parameters.get("page", 1))
+            errors_per_page = int(
+                parameters.get("errorsPerPage", DEFAULT_ERRORS_PER_PAGE)
+            )
+            start = (page - 1) * errors_per_page
+            page_logs = error_logs[start : start + errors_per_page]
+            payload["errors"] = {
+                "startIndex": start + 1 if page_logs else 0,
+                "endIndex": start + len(page_logs),
+                "loadId": load.load_id,
+                "errorLogs": page_logs,
+            }
+        return 200, {"status": "200 OK", "payload": payload}
+
+    def _list(self, parameters: Dict) -> Response:
+        limit = min(
+            int(parameters.get("limit", DEFAULT_LIST_LIMIT)), MAXIMUM_LIST_LIMIT
+        )
+        include_queued = _flag(parameters.get("includeQueuedLoads", "TRUE"))
+        load_ids = [
+            load.load_id
+            for load in reversed(list(self._loads.values()))
+            if include_queued or load.status != LOAD_IN_QUEUE
+        ]
+        return 200, {"status": "200 OK", "payload": {"loadIds": load_ids[:limit]}}
+
+    def _system(self, parameters: Dict) -> Response:
+        action = parameters.get("action")
+        if action == "initiateDatabaseReset":
+            token = self._new_load_id()
+            self._reset_tokens.add(token)
+            return 200, {"status": "200 OK", "payload": {"token": token}}
+        if action == "performDatabaseReset":
+            if parameters.get("token") not in self._reset_tokens:
+                return _error(400, "InvalidParameterException", "Invalid reset token")
+            self._clear()
+            return 200, {"status": "200 OK"}
+        return _error(400, "BadRequestException", f"Unsupported action {action}")
+
+
+def _flag(value) -> bool:
+    return str(value).upper() == "TRUE"
+
+
+def _error(status_code: int, code: str, message: str) -> Response:
+    return status_code, {
+        "code": code,
+        "requestId": str(uuid.uuid4()),
+        "detailedMessage": message,
+    }
+
+
+def _decode_parameters(query: str) -> Dict:
+    # The signer sends lists and maps as their Python repr with double quotes
+    parameters = {}
+    for key, values in parse_qs(query, keep_blank_values=True).items():
+        value = values[-1]
+        if value[:1] in ("[", "{"):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        parameters[key] = value
+    return parameters
+
+
+class LoaderEmulatorRequestHandler(BaseHTTPRequestHandler):
+    # keep-alive, so the pooled transport reuses its connections
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str):
+        url = urlsplit(self.path)
+        parameters = _decode_parameters(url.query)
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            parameters.update(
+                _decode_parameters(self.rfile.read(length).decode("utf-8"))
+            )
+        resource, _, load_id = url.path.strip("/").partition("/")
+        if load_id:
+            parameters.setdefault("loadId", load_id)
+        status_code, body = self.server.emulator.handle(
+            method, resource, parameters, self.headers
+        )
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class LoaderEmulatorServer(ThreadingHTTPServer):
+    """Serves a LoaderEmulator over plain http on a background thread.
+
+    Point a SigV4Signer(protocol="http") and BulkLoader at endpoint to exercise
+    the real signing, transport and status parsing code without AWS.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(
+        self, emulator: LoaderEmulator = None, host: str = "127.0.0.1", port: int = 0
+    ):
+        super().__init__((host, port), LoaderEmulatorRequestHandler)
+        self.emulator = emulator if emulator else LoaderEmulator()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "LoaderEmulatorServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="loader-emulator", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Loader emulator listening on {self.endpoint}")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,121 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+import threading
+from typing import Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 50
+DEFAULT_CONNECT_TIMEOUT_IN_SECONDS = 5
+DEFAULT_READ_TIMEOUT_IN_SECONDS = 60
+DEFAULT_TOTAL_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+# Submitting a load is not idempotent, only status polls and cancellations are retried
+DEFAULT_RETRY_METHODS = ("GET", "DELETE")
+
+
+class PooledTransport:
+    """Keep-alive HTTP transport shared by every signed Neptune request.
+
+    A single requests.Session is created lazily and reused, so status polls,
+    load submissions and cancellations against the same endpoint do not pay for
+    a new TCP and TLS handshake each time.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        connect_timeout_in_seconds: float = DEFAULT_CONNECT_TIMEOUT_IN_SECONDS,
+        read_timeout_in_seconds: float = DEFAULT_READ_TIMEOUT_IN_SECONDS,
+        total_retries: int = DEFAULT_TOTAL_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        status_forcelist: Iterable[int] = DEFAULT_STATUS_FORCELIST,
+        retry_methods: Iterable[str] = DEFAULT_RETRY_METHODS,
+    ):
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._connect_timeout_in_seconds = connect_timeout_in_seconds
+        self._read_timeout_in_seconds = read_timeout_in_seconds
+        self._total_retries = total_retries
+        self._backoff_factor = backoff_factor
+        self._status_forcelist = tuple(status_forcelist)
+        self._retry_methods = frozenset(method.upper() for method in retry_methods)
+
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "PooledTransport":
+        if not cls._shared:
+            with cls._shared_lock:
+                if not cls._shared:
+                    cls._shared = cls()
+        return cls._shared
+
+    @property
+    def pool_maxsize(self) -> int:
+        return self._pool_maxsize
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self._connect_timeout_in_seconds, self._read_timeout_in_seconds)
+
+    @property
+    def session(self) -> requests.Session:
+        if not self._session:
+            with self._session_lock:
+                if not self._session:
+                    self._session = self._make_session()
+        return self._session
+
+    def _make_retry(self) -> Retry:
+        return Retry(
+            total=self._total_retries,
+            connect=self._total_retries,
+            read=self._total_retries,
+            status=self._total_retries,
+            backoff_factor=self._backoff_factor,
+            status_forcelist=self._status_forcelist,
+            allowed_methods=self._retry_methods,
+            raise_on_status=False,
+        )
+
+    def _make_adapter(self) -> HTTPAdapter:
+        return HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            max_retries=self._make_retry(),
+        )
+
+    def _make_session(self) -> requests.Session:
+        logger.debug(
+            f"Creating pooled session pool_connections={self._pool_connections} pool_maxsize={self._pool_maxsize}"
+        )
+        session = requests.Session()
+        adapter = self._make_adapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def close(self):
+        with self._session_lock:
+            if self._session:
+                self._session.close()
+                self._session = None
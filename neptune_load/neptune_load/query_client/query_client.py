@@ -0,0 +1,194 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import codecs
+import csv
+import json
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from requests.models import Response
+
+from neptune_load.pooled_transport.pooled_transport import PooledTransport
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+DEFAULT_PAGE_SIZE = 10000
+
+
+class ResultFormat(Enum):
+    JSON = "application/sparql-results+json"
+    CSV = "text/csv"
+
+
+def iter_text(chunks: Iterable[bytes]) -> Iterator[str]:
+    # A multi-byte character can straddle two chunks
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_json_bindings(chunks: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Yields the rows of a SPARQL JSON result without parsing it as a whole.
+
+    Only the head and the binding being read are buffered, so memory stays
+    bounded by the largest row rather than by the size of the response.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer = ""
+    for chunk in chunks:
+        buffer = buffer + chunk
+        start = buffer.find('"bindings"')
+        if start >= 0 and "[" in buffer[start:]:
+            buffer = buffer[buffer.index("[", start) + 1 :]
+            break
+    else:
+        # ASK results and empty bodies have no bindings
+        return
+
+    position = 0
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position = position + 1
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            binding, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield {name: term["value"] for name, term in binding.items()}
+        position = end
+
+
+def iter_csv_rows(chunks: Iterable[str]) -> Iterator[Dict[str, str]]:
+    def lines():
+        # Quoted values may span lines, so line ends are kept for csv to see
+        # splitlines would also break on characters such as U+2028 inside values
+        carry = ""
+        for chunk in chunks:
+            pieces = (carry + chunk).split("\n")
+            carry = pieces.pop()
+            for piece in pieces:
+                yield piece + "\n"
+        if carry:
+            yield carry
+
+    # Unbound variables come back as empty strings
+    yield from csv.DictReader(lines())
+
+
+@dataclass
+class QueryPage:
+    offset: int
+    rows: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def next_offset(self) -> int:
+        return self.offset + len(self.rows)
+
+
+class NeptuneQueryClient:
+    """Runs signed SPARQL queries against /sparql and streams the rows back.
+
+    Rows are dictionaries of variable name to value and are parsed from the
+    response as it arrives, so multi-GB results can be walked row by row.
+    query_pages adds LIMIT and OFFSET to a query and the offset of the last
+    page can be passed back in to resume from there. The query needs an
+    ORDER BY for pages to be stable.
+    """
+
+    def __init__(
+        self,
+        signer: SigV4Signer,
+        neptune_endpoint: str,
+        transport: PooledTransport = None,
+        result_format: ResultFormat = ResultFormat.JSON,
+        read_chunk_size: int = READ_CHUNK_SIZE,
+    ):
+        self._signer = signer
+        self._neptune_endpoint = neptune_endpoint
+        self._transport = transport
+        self._result_format = result_format
+        self._read_chunk_size = read_chunk_size
+
+    def query(self, query: str) -> Iterator[Dict[str, str]]:
+        signed_request = self._signer.get_signed_request(
+            host=self._neptune_endpoint,
+            method="POST",
+            query_type="sparql",
+            query=query,
+        )
+        response: Response = signed_request.execute(
+            transport=self._transport,
+            stream=True,
+            headers={"Accept": self._result_format.value},
+        )
+        try:
+            if not (response.status_code == 200):
+                raise Exception(
+                    f"Request returned {response.status_code} {response.text}"
+                )
+            chunks = iter_text(response.iter_content(chunk_size=self._read_chunk_size))
+            if self._result_format == ResultFormat.CSV:
+                yield from iter_csv_rows(chunks)
+            else:
+                yield from iter_json_bindings(chunks)
+        finally:
+            response.close()
+
+    def query_pages(
+        self, query: str, page_size: int = DEFAULT_PAGE_SIZE, offset: int = 0
+    ) -> Iterator[QueryPage]:
+        while True:
+            page = QueryPage(
+                offset=offset,
+                rows=list(self.query(f"{query}\nLIMIT {page_size} OFFSET {offset}")),
+            )
+            if page.rows:
+                yield page
+            if len(page.rows) < page_size:
+                return
+            offset = page.next_offset
+
+    def query_paged(
+        self, query: str, page_size: int = DEFAULT_PAGE_SIZE, offset: int = 0
+    ) -> Iterator[Dict[str, str]]:
+        for page in self.query_pages(query, page_size=page_size, offset=offset):
+            yield from page.rows
+
+    def ask(self, query: str) -> bool:
+        signed_request = self._signer.get_signed_request(
+            host=self._neptune_endpoint,
+            method="POST",
+            query_type="sparql",
+            query=query,
+        )
+        response: Response = signed_request.execute(
+            transport=self._transport,
+            headers={"Accept": ResultFormat.JSON.value},
+        )
+        if not (response.status_code == 200):
+            raise Exception(f"Request returned {response.status_code} {response.text}")
+        return bool(response.json()["boolean"])
+
+    def count(self, query: str) -> Optional[int]:
+        """The first value of the first row as an integer, for COUNT queries."""
+        for row in self.query(query):
+            for value in row.values():
+                return int(value)
+        return None
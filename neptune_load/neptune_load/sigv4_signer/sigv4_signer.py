@@ -15,6 +15,7 @@ import requests
 from requests.models import Response
 import boto3
 import sys
+from neptune_load.pooled_transport.pooled_transport import PooledTransport
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,15 @@ logger = logging.getLogger(__name__)
 # Configuration. http is required.
 protocol = "https"
 
+SERVICE = "neptune-db"
+# Match the algorithm to the hashing algorithm you use, either SHA-1 or
+# SHA-256 (recommended)
+ALGORITHM = "AWS4-HMAC-SHA256"
+# "host" and "x-amz-date" are always required and are the only signed headers
+SIGNED_HEADERS = "host;x-amz-date"
+EMPTY_PAYLOAD_HASH = hashlib.sha256(b"").hexdigest()
+SIGNING_KEY_CACHE_SIZE = 4
+
 # The following lines enable debugging at httplib level (requests->urllib3->http.client)
 # You will see the REQUEST, including HEADERS and DATA, and RESPONSE with HEADERS but without DATA.
 #
@@ -46,6 +56,8 @@ class SigV4Signer:
         access_key_id: str = None,
         access_key_secret: str = None,
         session_token: str = None,
+        transport: PooledTransport = None,
+        protocol: str = protocol,
     ):
 
         if not (access_key_id and access_key_secret):
@@ -63,6 +75,21 @@ class SigV4Signer:
         self._access_key_secret = access_key_secret
         self._session_token = session_token
         self._region = region
+        self._transport = transport if transport else PooledTransport.shared()
+        # http is only meant for local stand-ins such as the loader emulator
+        self._protocol = protocol
+        self._signing_key_cache = {}
+        self._host_pieces = {}
+        self._credential_scope_suffix = (
+            "/" + self._region + "/" + SERVICE + "/" + "aws4_request"
+        )
+        self._authorization_prefix = (
+            ALGORITHM + " " + "Credential=" + self._access_key_id + "/"
+        )
+
+    @property
+    def transport(self) -> PooledTransport:
+        return self._transport
 
     def normalize_query_string(self, query):
         kv = (
@@ -80,6 +107,17 @@ class SigV4Signer:
         return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
 
     def get_signature_key(self, dateStamp, serviceName):
+        cache_key = (dateStamp, self._region, serviceName)
+        signing_key = self._signing_key_cache.get(cache_key)
+        if not signing_key:
+            # Keys for previous days are never needed again
+            if len(self._signing_key_cache) >= SIGNING_KEY_CACHE_SIZE:
+                self._signing_key_cache.clear()
+            signing_key = self.derive_signature_key(dateStamp, serviceName)
+            self._signing_key_cache[cache_key] = signing_key
+        return signing_key
+
+    def derive_signature_key(self, dateStamp, serviceName):
         kDate = self.sign(("AWS4" + self._access_key_secret).encode("utf-8"), dateStamp)
         kRegion = self.sign(kDate, self._region)
         kService = self.sign(kRegion, serviceName)
@@ -145,22 +183,30 @@ class SigV4Signer:
         ## return output as tuple
         return canonical_uri, payload
 
-    def get_signed_request(self, host, method, query_type, query):
-        service = "neptune-db"
-        endpoint = protocol + "://" + host
+    def _get_host_pieces(self, host):
+        # The endpoint and the host line of the canonical headers never change
+        # for a given host, so they are built once and reused
+        host_pieces = self._host_pieces.get(host)
+        if not host_pieces:
+            host_pieces = (self._protocol + "://" + host, "host:" + host + "\n")
+            self._host_pieces[host] = host_pieces
+        return host_pieces
 
-        logger.info("+++++ USER INPUT +++++")
-        logger.info("host = " + host)
-        logger.info("method = " + method)
-        logger.info("query_type = " + query_type)
-        logger.info("query = " + query)
+    def get_signed_request(self, host, method, query_type, query):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Signing request host=%s method=%s query_type=%s query=%s",
+                host,
+                method,
+                query_type,
+                query,
+            )
 
         # validate input
         self.validate_input(method, query_type)
 
         # get canonical_uri and payload
         canonical_uri, payload = self.get_canonical_uri_and_payload(query_type, query)
-        logger.info(payload)
 
         # ************* REQUEST VALUES *************
 
@@ -169,17 +215,14 @@ class SigV4Signer:
             payload, quote_via=urllib.parse.quote
         )
         request_parameters = request_parameters.replace("%27", "%22")
-        logger.info(request_parameters)
-
-        # ************* TASK 1: CREATE A CANONICAL REQUEST *************
-        # https://docs.aws.amazon.com/general/latest/gr/sigv4-create-canonical-request.html
-
-        # Step 1 is to define the verb (GET, POST, etc.)--already done.
+        logger.debug("request_parameters = %s", request_parameters)
 
         # Create a date for headers and the credential string.
         t = datetime.datetime.utcnow()
         amzdate = t.strftime("%Y%m%dT%H%M%SZ")
-        datestamp = t.strftime("%Y%m%d")  # Date w/o time, used in credential scope
+        datestamp = amzdate[:8]  # Date w/o time, used in credential scope
+
+        endpoint, canonical_host_header = self._get_host_pieces(host)
 
         # ************* TASK 1: CREATE A CANONICAL REQUEST *************
         # https://docs.aws.amazon.com/general/latest/gr/sigv4-create-canonical-request.html
@@ -187,124 +230,81 @@ class SigV4Signer:
         # Step 1 is to define the verb (GET, POST, etc.)--already done.
         # Step 2: is to define the canonical_uri--already done.
 
-        # Step 3: Create the canonical query string. In this example (a GET request),
-        # request parameters are in the query string. Query string values must
-        # be URL-encoded (space=%20). The parameters must be sorted by name.
-        # For this example, the query string is pre-formatted in the request_parameters variable.
+        # Step 3: Create the canonical query string. Query string values must
+        # be URL-encoded (space=%20) and sorted by name. POST requests carry
+        # their parameters in the body instead.
+        # Step 6: Create payload hash (hash of the request body content). For GET
+        # and DELETE requests, the payload is an empty string ("").
         if method == "GET" or method == "DELETE":
             canonical_querystring = self.normalize_query_string(request_parameters)
+            payload_hash = EMPTY_PAYLOAD_HASH
         elif method == "POST":
             canonical_querystring = ""
+            payload_hash = hashlib.sha256(
+                request_parameters.encode("utf-8")
+            ).hexdigest()
         else:
             logger.info(
                 'Request method is neither "GET" nor "POST", something is wrong here.'
             )
             raise Exception("This shouldn't happen")
 
-        # Step 4: Create the canonical headers and signed headers. Header names
-        # must be trimmed and lowercase, and sorted in code point order from
-        # low to high. Note that there is a trailing \n.
-        canonical_headers = "host:" + host + "\n" + "x-amz-date:" + amzdate + "\n"
-
-        # Step 5: Create the list of signed headers. This lists the headers
-        # in the canonical_headers list, delimited with ";" and in alpha order.
-        # Note: The request can include any headers; canonical_headers and
-        # signed_headers lists those that you want to be included in the
-        # hash of the request. "Host" and "x-amz-date" are always required.
-        signed_headers = "host;x-amz-date"
-
-        # Step 6: Create payload hash (hash of the request body content). For GET
-        # requests, the payload is an empty string ("").
-        if method == "GET" or method == "DELETE":
-            post_payload = ""
-        elif method == "POST":
-            post_payload = request_parameters
-        else:
-            logger.info(
-                'Request method is neither "GET" nor "POST", something is wrong here.'
-            )
-            raise Exception("This shouldn't happen")
-
-        payload_hash = hashlib.sha256(post_payload.encode("utf-8")).hexdigest()
-
+        # Step 4: Create the canonical headers. Header names must be trimmed and
+        # lowercase, and sorted in code point order. Note the trailing \n.
+        # Step 5: The signed headers ("host" and "x-amz-date") are constant.
         # Step 7: Combine elements to create canonical request.
-        canonical_request = (
-            method
-            + "\n"
-            + canonical_uri
-            + "\n"
-            + canonical_querystring
-            + "\n"
-            + canonical_headers
-            + "\n"
-            + signed_headers
-            + "\n"
-            + payload_hash
+        canonical_request = "\n".join(
+            (
+                method,
+                canonical_uri,
+                canonical_querystring,
+                canonical_host_header + "x-amz-date:" + amzdate + "\n",
+                SIGNED_HEADERS,
+                payload_hash,
+            )
         )
 
         # ************* TASK 2: CREATE THE STRING TO SIGN*************
-        # Match the algorithm to the hashing algorithm you use, either SHA-1 or
-        # SHA-256 (recommended)
-        algorithm = "AWS4-HMAC-SHA256"
-        credential_scope = (
-            datestamp + "/" + self._region + "/" + service + "/" + "aws4_request"
-        )
-        string_to_sign = (
-            algorithm
-            + "\n"
-            + amzdate
-            + "\n"
-            + credential_scope
-            + "\n"
-            + hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+        credential_scope = datestamp + self._credential_scope_suffix
+        string_to_sign = "\n".join(
+            (
+                ALGORITHM,
+                amzdate,
+                credential_scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+            )
         )
 
         # ************* TASK 3: CALCULATE THE SIGNATURE *************
-        # Create the signing key using the function defined above.
-        signing_key = self.get_signature_key(datestamp, service)
+        # The signing key only changes with the date, so it comes from the cache.
+        signing_key = self.get_signature_key(datestamp, SERVICE)
 
         # Sign the string_to_sign using the signing_key
         signature = hmac.new(
-            signing_key, (string_to_sign).encode("utf-8"), hashlib.sha256
+            signing_key, string_to_sign.encode("utf-8"), hashlib.sha256
         ).hexdigest()
 
         # ************* TASK 4: ADD SIGNING INFORMATION TO THE REQUEST *************
-        # The signing information can be either in a query string value or in
-        # a header named Authorization. This code shows how to use a header.
-        # Create authorization header and add to request headers
         authorization_header = (
-            algorithm
-            + " "
-            + "Credential="
-            + self._access_key_id
-            + "/"
+            self._authorization_prefix
             + credential_scope
-            + ", "
-            + "SignedHeaders="
-            + signed_headers
-            + ", "
-            + "Signature="
+            + ", SignedHeaders="
+            + SIGNED_HEADERS
+            + ", Signature="
             + signature
         )
 
         # The request can include any headers, but MUST include "host", "x-amz-date",
-        # and (for this scenario) "Authorization". "host" and "x-amz-date" must
-        # be included in the canonical_headers and signed_headers, as noted
-        # earlier. Order here is not significant.
+        # and (for this scenario) "Authorization". Order here is not significant.
         # Python note: The 'host' header is added automatically by the Python 'requests' library.
-        if method == "GET" or method == "DELETE":
-            headers = {"x-amz-date": amzdate, "Authorization": authorization_header}
-        elif method == "POST":
+        if method == "POST":
             headers = {
                 "content-type": "application/x-www-form-urlencoded",
                 "x-amz-date": amzdate,
                 "Authorization": authorization_header,
             }
         else:
-            logger.info(
-                'Request method is neither "GET" nor "POST", something is wrong here.'
-            )
-            raise Exception("This shouldn't happen")
+            headers = {"x-amz-date": amzdate, "Authorization": authorization_header}
 
         # https://docs.aws.amazon.com/general/latest/gr/sigv4-create-canonical-request.html
         # The process for temporary security credentials is the same as using long-term credentials and
@@ -313,53 +313,36 @@ class SigV4Signer:
             headers["x-amz-security-token"] = self._session_token
 
         request_url = endpoint + canonical_uri
-        request_config = None
-
-        if method == "GET":
-            request_config = (
-                "GET",
-                request_url,
-                {
-                    "headers": headers,
-                    "verify": False,
-                    "params": request_parameters,
-                },
-            )
-        elif method == "DELETE":
-            request_config = (
-                "DELETE",
-                request_url,
-                {
-                    "headers": headers,
-                    "verify": False,
-                    "params": request_parameters,
-                },
-            )
-        elif method == "POST":
-            request_config = (
-                "POST",
-                request_url,
-                {"headers": headers, "verify": False, "data": request_parameters},
-            )
-            # r = requests.request(
-            #    **post_request_config
-            # )
 
+        if method == "POST":
+            params = {"headers": headers, "verify": False, "data": request_parameters}
         else:
-            raise Exception(
-                'Request method is neither "GET" nor "POST", something is wrong here.'
-            )
+            params = {
+                "headers": headers,
+                "verify": False,
+                "params": request_parameters,
+            }
 
         return SignedRequest(
-            method=request_config[0], url=request_config[1], params=request_config[2]
+            method=method,
+            url=request_url,
+            params=params,
+            transport=self._transport,
         )
 
 
 class SignedRequest:
-    def __init__(self, method: str, url: str, params: dict):
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        params: dict,
+        transport: PooledTransport = None,
+    ):
         self._method = method
         self._url = url
         self._params = params
+        self._transport = transport
 
     @property
     def method(self):
@@ -376,5 +359,22 @@ class SignedRequest:
     def validate(self):
         raise Exception("Not yet implemented")
 
-    def execute(self) -> Response:
-        return requests.request(self._method, self._url, **self._params)
+    @property
+    def transport(self):
+        return self._transport
+
+    def execute(
+        self,
+        transport: PooledTransport = None,
+        stream: bool = False,
+        headers: dict = None,
+    ) -> Response:
+        # Unsigned headers such as Accept can be added without re-signing
+        params = self._params
+        if stream or headers:
+            params = dict(params, stream=stream)
+            params["headers"] = dict(params["headers"], **(headers or {}))
+        transport = transport if transport else self._transport
+        if not transport:
+            return requests.request(self._method, self._url, **params)
+        return transport.request(self._method, self._url, **params)
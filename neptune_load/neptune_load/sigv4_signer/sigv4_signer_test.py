@@ -21,7 +21,7 @@ class TestSignedRequest(SignedRequest):
         self._response = response
         self._delay_in_seconds = delay_in_seconds
 
-    def execute(self):
+    def execute(self, transport=None):
         if self._delay_in_seconds:
             time.sleep(self._delay_in_seconds)
         return self._response
@@ -0,0 +1,111 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List
+
+from requests.models import Response
+
+from neptune_load.pooled_transport.pooled_transport import PooledTransport
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+
+logger = logging.getLogger(__name__)
+
+INSERT_DATA = "INSERT DATA"
+DELETE_DATA = "DELETE DATA"
+DEFAULT_TRIPLES_PER_UPDATE = 1000
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
+def render_update(operation: str, triples: List[str], named_graph: str = None) -> str:
+    # N-Triples lines are valid as they are inside a SPARQL data block
+    body = "\n".join(triples)
+    if named_graph:
+        body = f"GRAPH <{named_graph}> {{\n{body}\n}}"
+    return f"{operation} {{\n{body}\n}}"
+
+
+def update_batches(
+    operation: str,
+    triples: Iterable[str],
+    triples_per_update: int = DEFAULT_TRIPLES_PER_UPDATE,
+    named_graph: str = None,
+) -> Iterator[str]:
+    batch = []
+    for triple in triples:
+        batch.append(triple)
+        if len(batch) >= triples_per_update:
+            yield render_update(operation, batch, named_graph)
+            batch = []
+    if batch:
+        yield render_update(operation, batch, named_graph)
+
+
+class SparqlUpdateClient:
+    """Sends signed SPARQL UPDATE requests to the /sparql endpoint.
+
+    Updates are not retried by the pooled transport (it only retries GET and
+    DELETE), so a failed batch raises and is left to the caller. With
+    max_in_flight above one, execute_all keeps that many requests open on the
+    pooled connections and only pulls the next update once one has finished,
+    so the order between batches is not kept.
+    """
+
+    def __init__(
+        self,
+        signer: SigV4Signer,
+        neptune_endpoint: str,
+        transport: PooledTransport = None,
+    ):
+        self._signer = signer
+        self._neptune_endpoint = neptune_endpoint
+        # None means reuse the pooled transport the signer attached to the request
+        self._transport = transport
+
+    def execute(self, update: str) -> str:
+        signed_request = self._signer.get_signed_request(
+            host=self._neptune_endpoint,
+            method="POST",
+            query_type="sparqlupdate",
+            query=update,
+        )
+        response: Response = signed_request.execute(transport=self._transport)
+        if not (response.status_code == 200):
+            raise Exception(f"Request returned {response.status_code} {response.text}")
+        return response.text
+
+    def execute_all(self, updates: Iterable[str], max_in_flight: int = 1) -> int:
+        if max_in_flight > 1:
+            executed = self._execute_concurrently(updates, max_in_flight)
+        else:
+            executed = 0
+            for update in updates:
+                self.execute(update)
+                executed = executed + 1
+        logger.info(f"Executed {executed} SPARQL updates")
+        return executed
+
+    def _execute_concurrently(self, updates: Iterable[str], max_in_flight: int) -> int:
+        executed = 0
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            try:
+                for update in updates:
+                    if len(in_flight) >= max_in_flight:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        executed = executed + self._collect(done)
+                    in_flight.add(executor.submit(self.execute, update))
+                done, in_flight = wait(in_flight)
+                executed = executed + self._collect(done)
+            except Exception:
+                for future in in_flight:
+                    future.cancel()
+                raise
+        return executed
+
+    @staticmethod
+    def _collect(done) -> int:
+        for future in done:
+            future.result()
+        return len(done)
@@ -0,0 +1,46 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+from neptune_load.query_client.query_client import NeptuneQueryClient
+import argparse
+import csv
+import logging
+import os
+import sys
+
+logger = logging.getLogger("query_neptune")
+logger.setLevel(logging.INFO)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Stream the rows of a SPARQL query file to CSV on stdout"
+    )
+    parser.add_argument("query_file", help="e.g. ../blog/query-suspicious-chains.rq")
+    parser.add_argument("--page_size", type=int, default=0)
+    parser.add_argument("--offset", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    host = f'{os.getenv("NEPTUNE_ENDPOINT")}:8182'
+    with open(arguments.query_file) as query_file:
+        query = query_file.read()
+
+    client = NeptuneQueryClient(signer=SigV4Signer(), neptune_endpoint=host)
+    if arguments.page_size:
+        rows = client.query_paged(
+            query, page_size=arguments.page_size, offset=arguments.offset
+        )
+    else:
+        rows = client.query(query)
+
+    writer = None
+    for row in rows:
+        if not writer:
+            writer = csv.DictWriter(sys.stdout, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow(row)
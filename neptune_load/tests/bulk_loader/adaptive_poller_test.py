@@ -0,0 +1,99 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from neptune_load.bulk_loader.adaptive_poller import AdaptivePoller, LoadProgress
+from neptune_load.bulk_loader.bulk_loader import BulkloadStatus
+import copy
+import json
+from pyexpect import expect
+import pytest
+
+
+def make_status(response, total_records, total_time_spent, feed_count=None):
+    response = copy.deepcopy(response)
+    overall_status = response["payload"]["overallStatus"]
+    overall_status["totalRecords"] = total_records
+    overall_status["totalTimeSpent"] = total_time_spent
+    if feed_count:
+        response["payload"]["feedCount"] = [{k: v} for k, v in feed_count.items()]
+    return BulkloadStatus.create_from_api_response_text(json.dumps(response))
+
+
+@pytest.fixture
+def poller_without_jitter():
+    return AdaptivePoller(
+        minimum_interval_in_seconds=5,
+        maximum_interval_in_seconds=300,
+        jitter=0,
+    )
+
+
+class Test_1_LoadProgress:
+    def test_1_rate_and_eta_from_expected_records(
+        self, query_status_load_in_progress_response
+    ):
+        progress = LoadProgress(expected_total_records=10000)
+        progress.record(
+            make_status(query_status_load_in_progress_response, 1000, 10), 0
+        )
+        progress.record(
+            make_status(query_status_load_in_progress_response, 3000, 30), 20
+        )
+        expect(progress.records_per_second).to.equal(100)
+        expect(progress.estimate_seconds_remaining()).to.equal(70)
+
+    def test_2_eta_from_feed_count(self, query_status_load_in_progress_response):
+        progress = LoadProgress()
+        progress.record(
+            make_status(
+                query_status_load_in_progress_response,
+                1000,
+                100,
+                {"LOAD_COMPLETED": 1, "LOAD_IN_PROGRESS": 1, "LOAD_NOT_STARTED": 2},
+            ),
+            0,
+        )
+        expect(progress.completed_feed_fraction).to.equal(0.25)
+        expect(progress.estimate_seconds_remaining()).to.equal(300)
+
+    def test_3_stall_is_detected(self, query_status_load_in_progress_response):
+        progress = LoadProgress()
+        progress.record(make_status(query_status_load_in_progress_response, 10, 5), 0)
+        progress.record(make_status(query_status_load_in_progress_response, 10, 10), 5)
+        expect(progress.is_stalled).to.be.true()
+
+
+class Test_2_AdaptivePoller:
+    def test_1_backoff_without_eta(
+        self, poller_without_jitter, query_status_load_in_progress_response
+    ):
+        progress = LoadProgress()
+        progress.record(make_status(query_status_load_in_progress_response, 0, 0), 0)
+        intervals = [poller_without_jitter.next_interval(progress) for _ in range(8)]
+        expect(intervals[:4]).to.equal([5, 10, 20, 40])
+        expect(intervals[-1]).to.equal(300)
+
+    def test_2_interval_follows_eta(
+        self, poller_without_jitter, query_status_load_in_progress_response
+    ):
+        progress = LoadProgress(expected_total_records=100000)
+        progress.record(make_status(query_status_load_in_progress_response, 0, 0), 0)
+        progress.record(
+            make_status(query_status_load_in_progress_response, 10000, 100), 100
+        )
+        # 900 seconds left, poll half way there but never above the ceiling
+        expect(poller_without_jitter.next_interval(progress)).to.equal(300)
+        progress.record(
+            make_status(query_status_load_in_progress_response, 95000, 950), 950
+        )
+        expect(poller_without_jitter.next_interval(progress)).to.equal(25)
+
+    def test_3_jitter_stays_within_bounds(self, query_status_load_in_progress_response):
+        poller = AdaptivePoller(
+            minimum_interval_in_seconds=5, maximum_interval_in_seconds=60, jitter=0.5
+        )
+        progress = LoadProgress()
+        progress.record(make_status(query_status_load_in_progress_response, 0, 0), 0)
+        for _ in range(20):
+            interval = poller.next_interval(progress)
+            expect(interval).to.be.between(5, 60)
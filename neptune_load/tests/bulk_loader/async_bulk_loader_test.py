@@ -0,0 +1,133 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from neptune_load.bulk_loader.async_bulk_loader import AsyncBulkLoader
+from neptune_load.bulk_loader.bulk_loader import BulkloadStatus
+import asyncio
+import threading
+import time
+from pyexpect import expect
+import pytest
+from unittest import mock
+
+TEST_REGION = "ap-southeast-1"
+TEST_DB_ENDPOINT = f"neptune.cluster-lollollollol.{TEST_REGION}.amazonaws.com"
+TEST_IAM_ROLE = "arn:aws:iam::123456789012:role/Elchfisch"
+TEST_MAX_CONCURRENCY = 3
+
+
+class FakeLoaderApi:
+    def __init__(self, in_progress, complete, polls_until_complete=2):
+        self._in_progress = in_progress
+        self._complete = complete
+        self._polls_until_complete = polls_until_complete
+        self._polls = {}
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = []
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight = self.in_flight + 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+
+    def _leave(self):
+        with self._lock:
+            self.in_flight = self.in_flight - 1
+
+    def initiate(self, bulk_loader):
+        self._enter()
+        bulk_loader.load_id = f"load-{bulk_loader._source.split('/')[-1]}"
+        self._leave()
+
+    def refresh(self, bulk_loader):
+        self._enter()
+        load_id = bulk_loader.load_id
+        with self._lock:
+            self._polls[load_id] = self._polls.get(load_id, 0) + 1
+            polls = self._polls[load_id]
+        bulk_loader._status = (
+            self._complete if polls > self._polls_until_complete else self._in_progress
+        )
+        self._leave()
+
+    def cancel(self, bulk_loader):
+        if bulk_loader.load_id == "broken":
+            raise Exception("Request returned 400")
+        self.cancelled.append(bulk_loader.load_id)
+        bulk_loader._status = self._complete
+
+
+@pytest.fixture
+def fake_loader_api(
+    query_status_load_in_progress_object, query_status_load_complete_object
+):
+    api = FakeLoaderApi(
+        in_progress=query_status_load_in_progress_object,
+        complete=query_status_load_complete_object,
+    )
+    with mock.patch(
+        "neptune_load.bulk_loader.bulk_loader.BulkLoader.initiate_bulk_load_from_s3",
+        autospec=True,
+        side_effect=api.initiate,
+    ), mock.patch(
+        "neptune_load.bulk_loader.bulk_loader.BulkLoader._refresh_status",
+        autospec=True,
+        side_effect=api.refresh,
+    ), mock.patch(
+        "neptune_load.bulk_loader.bulk_loader.BulkLoader.cancel_load",
+        autospec=True,
+        side_effect=api.cancel,
+    ):
+        yield api
+
+
+@pytest.fixture
+def async_bulk_loader_under_test(valid_test_sigv4_signer):
+    loader = AsyncBulkLoader(
+        signer=valid_test_sigv4_signer,
+        neptune_endpoint=TEST_DB_ENDPOINT,
+        iam_role_arn=TEST_IAM_ROLE,
+        wait_between_queries_in_seconds=0.01,
+        maximum_wait_in_seconds=5,
+        max_concurrency=TEST_MAX_CONCURRENCY,
+    )
+    yield loader
+    loader.close()
+
+
+class Test_1_AsyncBulkLoader:
+    def test_1_submit_all(self, async_bulk_loader_under_test, fake_loader_api):
+        sources = [f"s3://lalala/shard{i}" for i in range(10)]
+        load_ids = asyncio.run(async_bulk_loader_under_test.submit_all(sources))
+        expect(load_ids["s3://lalala/shard3"]).to.equal("load-shard3")
+        expect(fake_loader_api.max_in_flight).to.be.less_or_equal(TEST_MAX_CONCURRENCY)
+
+    def test_2_wait_for_all_with_bounded_concurrency(
+        self, async_bulk_loader_under_test, fake_loader_api
+    ):
+        load_ids = [f"load-{i}" for i in range(50)]
+        results = asyncio.run(async_bulk_loader_under_test.wait_for_all(load_ids))
+        expect(len(results)).to.equal(50)
+        for status in results.values():
+            expect(status.status).to.equal(BulkloadStatus.LoadStatus.LOAD_COMPLETED)
+        expect(fake_loader_api.max_in_flight).to.be.less_or_equal(TEST_MAX_CONCURRENCY)
+
+    def test_3_wait_for_all_reports_timeouts(
+        self, async_bulk_loader_under_test, fake_loader_api
+    ):
+        fake_loader_api._polls_until_complete = 1000
+        async_bulk_loader_under_test._maximum_wait_in_seconds = 0.05
+        results = asyncio.run(async_bulk_loader_under_test.wait_for_all(["slow"]))
+        expect(isinstance(results["slow"], Exception)).to.be.true()
+
+    def test_4_cancel_all_keeps_going_on_failure(
+        self, async_bulk_loader_under_test, fake_loader_api
+    ):
+        results = asyncio.run(
+            async_bulk_loader_under_test.cancel_all(["one", "broken", "two"])
+        )
+        expect(isinstance(results["broken"], Exception)).to.be.true()
+        expect(sorted(fake_loader_api.cancelled)).to.equal(["one", "two"])
@@ -109,3 +109,41 @@ def valid_bulk_loader_under_test(valid_test_sigv4_signer):
         wait_between_queries_in_seconds=wait_between_queries_in_seconds,
         maximum_wait_in_seconds=wait_between_queries_in_seconds * 10,
     )
+
+
+@pytest.fixture
+def error_log_pages(query_status_load_completed_response):
+    def error_page(error_logs):
+        response = copy.deepcopy(query_status_load_completed_response)
+        response["payload"]["errors"]["errorLogs"] = error_logs
+        return json.dumps(response)
+
+    def error_log(code, file_name, record_num):
+        return {
+            "errorCode": code,
+            "errorMessage": f"{code} in record {record_num}",
+            "fileName": file_name,
+            "recordNum": record_num,
+        }
+
+    first_file = "s3://lalala/shard1.nt"
+    second_file = "s3://lalala/shard2.nt"
+    return [
+        error_page(
+            [
+                error_log("PARSING_ERROR", first_file, 1),
+                error_log("PARSING_ERROR", first_file, 2),
+            ]
+        ),
+        error_page([error_log("INSERT_ERROR", second_file, 7)]),
+    ]
+
+
+@pytest.fixture
+def failed_feeds_response(query_status_load_completed_response):
+    response = copy.deepcopy(query_status_load_completed_response)
+    failed_feed = copy.deepcopy(response["payload"]["overallStatus"])
+    failed_feed["fullUri"] = "s3://lalala/shard2.nt"
+    failed_feed["status"] = "LOAD_FAILED"
+    response["payload"]["failedFeeds"] = [failed_feed]
+    return json.dumps(response)
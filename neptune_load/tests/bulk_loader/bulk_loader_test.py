@@ -3,7 +3,7 @@
 
 from datetime import datetime
 from types import SimpleNamespace
-from neptune_load.bulk_loader.bulk_loader import BulkloadStatus
+from neptune_load.bulk_loader.bulk_loader import BulkLoader, BulkloadStatus
 import json
 from pyexpect import expect
 import pytest
@@ -59,6 +59,18 @@ class Test_1_Bulkloadstatus:
         )
         expect(type(bulk_load_status)).to.equals(BulkloadStatus)
 
+    def test_status_is_compact_and_quiet(
+        self, query_status_load_in_progress_response, capsys
+    ):
+        bulk_load_status = BulkloadStatus.create_from_api_response_text(
+            json.dumps(query_status_load_in_progress_response)
+        )
+        expect(capsys.readouterr().out).to.equal("")
+        expect(hasattr(bulk_load_status, "__dict__")).to.be.false()
+        expect(bulk_load_status._raw).to.be(None)
+        expect(bulk_load_status.total_records).to.equal(10895596)
+        expect(bulk_load_status.raw).to.equal(query_status_load_in_progress_response)
+
 
 class Test_2_BulkLoader:
     def test_1_initiate_bulk_load_from_s3(
@@ -122,3 +134,24 @@ class Test_2_BulkLoader:
             expect(valid_bulk_loader_under_test.status.status).equals(
                 BulkloadStatus.LoadStatus.LOAD_CANCELLED_BY_USER
             )
+
+    def test_4_load_query_honours_mode_and_fail_on_error(self, valid_test_sigv4_signer):
+        resuming_loader = BulkLoader(
+            iam_role_arn=TEST_IAM_ROLE,
+            signer=valid_test_sigv4_signer,
+            source=TEST_OBJECT,
+            neptune_endpoint=TEST_DB_ENDPOINT,
+            mode="RESUME",
+            fail_on_error="TRUE",
+            named_graph="http://example.org/graph/job",
+        )
+        load_query = resuming_loader._construct_load_query()
+        expect(load_query["mode"]).to.equal("RESUME")
+        expect(load_query["failOnError"]).to.equal("TRUE")
+        expect(load_query["parserConfiguration"]).to.equal(
+            {"namedGraphUri": "http://example.org/graph/job"}
+        )
+        retry_loader = resuming_loader.for_source("s3://lalala/shard2.nt")
+        retry_query = retry_loader._construct_load_query()
+        expect(retry_query["mode"]).to.equal("RESUME")
+        expect(retry_query["source"]).to.equal("s3://lalala/shard2.nt")
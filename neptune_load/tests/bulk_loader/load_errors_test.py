@@ -0,0 +1,115 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from neptune_load.bulk_loader.load_errors import LoadErrorSummary
+import json
+from pyexpect import expect
+from unittest import mock
+
+TEST_LOAD_ID = "2a0c81f7-66b5-4da3-9f7a-bb356d2ddd8b"
+
+
+class Test_1_LoadErrors:
+    def test_1_iter_error_logs_pages_until_short_page(
+        self, valid_bulk_loader_under_test, error_log_pages
+    ):
+        valid_bulk_loader_under_test.load_id = TEST_LOAD_ID
+        with mock.patch(
+            "neptune_load.bulk_loader.bulk_loader.BulkLoader._execute_and_handle_signed_request"
+        ) as eahsr:
+            eahsr.side_effect = error_log_pages
+            error_logs = list(
+                valid_bulk_loader_under_test.iter_error_logs(errors_per_page=2)
+            )
+            expect(len(error_logs)).to.equal(3)
+            expect(eahsr.call_count).to.equal(2)
+
+    def test_2_status_query_pages_errors(self, valid_bulk_loader_under_test):
+        valid_bulk_loader_under_test.load_id = TEST_LOAD_ID
+        query = valid_bulk_loader_under_test._construct_status_query(
+            details=False, errors=True, page=3, errors_per_page=50
+        )
+        expect(query["page"]).to.equal("3")
+        expect(query["errorsPerPage"]).to.equal("50")
+        poll_query = valid_bulk_loader_under_test._construct_status_query()
+        expect(poll_query["errors"]).to.equal("false")
+
+    def test_3_summarize_errors(
+        self, valid_bulk_loader_under_test, error_log_pages, failed_feeds_response
+    ):
+        valid_bulk_loader_under_test.load_id = TEST_LOAD_ID
+        with mock.patch(
+            "neptune_load.bulk_loader.bulk_loader.BulkLoader._execute_and_handle_signed_request"
+        ) as eahsr:
+            eahsr.side_effect = [failed_feeds_response] + error_log_pages
+            summary = valid_bulk_loader_under_test.summarize_errors(errors_per_page=2)
+        expect(summary.total_errors).to.equal(3)
+        expect(summary.errors_by_code).to.equal({"PARSING_ERROR": 2, "INSERT_ERROR": 1})
+        expect(summary.errors_by_file["s3://lalala/shard1.nt"]).to.equal(2)
+        expect(summary.failed_feeds).to.equal({"s3://lalala/shard2.nt": "LOAD_FAILED"})
+        expect(
+            LoadErrorSummary.from_json(json.loads(json.dumps(summary.json)))
+        ).to.equal(summary)
+
+    def test_4_summary_truncates(self):
+        error_logs = ({"errorCode": "PARSING_ERROR"} for _ in range(1000))
+        summary = LoadErrorSummary.from_entries(error_logs, max_errors=10)
+        expect(summary.total_errors).to.equal(10)
+        expect(summary.truncated).to.be.true()
+        expect(len(summary.sample_errors)).to.be.less_or_equal(5)
+
+    def test_5_compact_status_drops_error_logs(self, query_status_load_complete_object):
+        compact = query_status_load_complete_object.compact
+        expect("errors" in compact["payload"]).to.be.false()
+        expect(compact["payload"]["overallStatus"]["status"]).to.equal("LOAD_COMPLETED")
+        expect(query_status_load_complete_object.has_errors).to.be.false()
+
+    def test_6_retry_only_failed_feeds(
+        self,
+        valid_bulk_loader_under_test,
+        failed_feeds_response,
+        load_initiated_success_response,
+        query_status_load_in_progress_response,
+    ):
+        valid_bulk_loader_under_test.load_id = "failed-load"
+        with mock.patch(
+            "neptune_load.bulk_loader.bulk_loader.BulkLoader._execute_and_handle_signed_request"
+        ) as eahsr:
+            eahsr.side_effect = [
+                failed_feeds_response,
+                load_initiated_success_response.text,
+                json.dumps(query_status_load_in_progress_response),
+            ]
+            retry_load_ids = valid_bulk_loader_under_test.retry_failed_feeds()
+        expect(retry_load_ids).to.equal({"s3://lalala/shard2.nt": TEST_LOAD_ID})
+
+    def test_7_retries_are_queued_independently(
+        self,
+        valid_bulk_loader_under_test,
+        load_initiated_success_response,
+        query_status_load_in_progress_response,
+    ):
+        valid_bulk_loader_under_test.load_id = "failed-load"
+        with mock.patch(
+            "neptune_load.bulk_loader.bulk_loader.BulkLoader._execute_and_handle_signed_request"
+        ) as eahsr, mock.patch(
+            "neptune_load.bulk_loader.bulk_loader.BulkLoader._construct_load_query",
+            autospec=True,
+            side_effect=lambda loader: {
+                "queueRequest": loader._queue_request,
+                "dependencies": loader._dependencies,
+            },
+        ) as load_query:
+            eahsr.side_effect = [
+                load_initiated_success_response.text,
+                json.dumps(query_status_load_in_progress_response),
+            ] * 2
+            retry_load_ids = valid_bulk_loader_under_test.retry_failed_feeds(
+                ["s3://lalala/shard1.nt", "s3://lalala/shard2.nt"]
+            )
+        expect(list(retry_load_ids)).to.equal(
+            ["s3://lalala/shard1.nt", "s3://lalala/shard2.nt"]
+        )
+        second_loader = load_query.call_args_list[1][0][0]
+        expect(second_loader._queue_request).to.equal("TRUE")
+        expect(second_loader._dependencies).to.equal(None)
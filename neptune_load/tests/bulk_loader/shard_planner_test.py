@@ -0,0 +1,68 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from neptune_load.bulk_loader.shard_planner import (
+    ShardStrategy,
+    plan_load_sources,
+    plan_shards,
+)
+import json
+from pyexpect import expect
+import pytest
+from unittest import mock
+
+TEST_LOAD_ID = "2a0c81f7-66b5-4da3-9f7a-bb356d2ddd8b"
+
+
+@pytest.fixture
+def object_sizes():
+    return {
+        "s3://lalala/data/a-0.nt": 100,
+        "s3://lalala/data/a-1.nt": 10,
+        "s3://lalala/data/b-0.nt": 60,
+        "s3://lalala/data/b-1.nt": 50,
+    }
+
+
+class Test_1_ShardPlanner:
+    def test_1_size_strategy_balances_bytes(self, object_sizes):
+        shards = plan_shards(object_sizes, 2, ShardStrategy.SIZE)
+        shard_bytes = [sum(object_sizes[uri] for uri in shard) for shard in shards]
+        expect(shard_bytes).to.equal([110, 110])
+
+    def test_2_listing_strategy_collapses_to_prefixes(self, object_sizes):
+        load_sources = plan_load_sources(object_sizes, 2, ShardStrategy.LISTING)
+        expect(load_sources).to.equal(
+            [["s3://lalala/data/a-"], ["s3://lalala/data/b-"]]
+        )
+
+    def test_3_more_shards_than_objects(self, object_sizes):
+        expect(len(plan_shards(object_sizes, 10))).to.equal(4)
+
+    def test_4_chain_load_sets_dependencies(
+        self,
+        valid_bulk_loader_under_test,
+        load_initiated_success_response,
+        query_status_load_in_progress_response,
+    ):
+        with mock.patch(
+            "neptune_load.bulk_loader.bulk_loader.BulkLoader._execute_and_handle_signed_request"
+        ) as eahsr, mock.patch(
+            "neptune_load.bulk_loader.bulk_loader.BulkLoader._construct_load_query",
+            autospec=True,
+            side_effect=lambda loader: {
+                "queueRequest": loader._queue_request,
+                "dependencies": loader._dependencies,
+            },
+        ) as load_query:
+            eahsr.side_effect = [
+                load_initiated_success_response.text,
+                json.dumps(query_status_load_in_progress_response),
+            ] * 2
+            load_ids = valid_bulk_loader_under_test.chain_load(
+                ["s3://lalala/data/a-", "s3://lalala/data/b-"]
+            )
+        expect(len(load_ids)).to.equal(2)
+        second_loader = load_query.call_args_list[1][0][0]
+        expect(second_loader._queue_request).to.equal("TRUE")
+        expect(second_loader._dependencies).to.equal([TEST_LOAD_ID])
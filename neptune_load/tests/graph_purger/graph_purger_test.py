@@ -0,0 +1,90 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import re
+
+import pytest
+from pyexpect import expect
+
+from neptune_load.graph_purger.graph_purger import GraphPurger, PurgeProgress
+
+GRAPH = "urn:graph:job-1"
+
+
+class FakeGraphStore:
+    """Answers the purger's queries from an in-memory count of triples."""
+
+    def __init__(self, triples, failing_batches=0, max_batch=None):
+        self.triples = triples
+        self.failing_batches = failing_batches
+        self.max_batch = max_batch
+        self.updates = []
+
+    def count(self, query):
+        return self.triples
+
+    def ask(self, query):
+        return self.triples > 0
+
+    def execute(self, update):
+        limit = int(re.search(r"LIMIT (\d+)", update).group(1))
+        self.updates.append(limit)
+        if self.failing_batches or (self.max_batch and limit > self.max_batch):
+            self.failing_batches = max(0, self.failing_batches - 1)
+            raise Exception("Request returned 500 TimeLimitExceededException")
+        self.triples = max(0, self.triples - limit)
+
+
+def make_purger(store, **kwargs):
+    pauses = []
+    purger = GraphPurger(
+        update_client=store,
+        query_client=store,
+        triples_per_batch=4000,
+        pause_in_seconds=0.5,
+        sleep=pauses.append,
+        clock=lambda: 0.0,
+        **kwargs,
+    )
+    return purger, pauses
+
+
+class TestGraphPurger:
+    def test_deletes_in_batches_and_reports_progress(self):
+        store = FakeGraphStore(triples=10000)
+        purger, pauses = make_purger(store)
+        reported = []
+        progress = purger.purge(
+            GRAPH, on_progress=lambda p: reported.append(p.fraction_done)
+        )
+        expect(store.updates).equals([4000, 4000, 4000])
+        expect(progress.done).to.be.true()
+        expect(progress.triples_deleted).equals(10000)
+        expect(reported).equals([0.4, 0.8, 1.0, 1.0])
+        expect(pauses).equals([0.5, 0.5, 0.5])
+
+    def test_failed_batches_shrink_and_back_off(self):
+        store = FakeGraphStore(triples=3000, max_batch=1000)
+        purger, pauses = make_purger(store)
+        progress = purger.purge(GRAPH)
+        expect(store.updates).equals([4000, 2000, 1000, 1000, 1000])
+        expect(progress.failures).equals(2)
+        expect(pauses[:2]).equals([1.0, 2.0])
+        expect(store.triples).equals(0)
+
+    def test_gives_up_after_repeated_failures(self):
+        store = FakeGraphStore(triples=3000, failing_batches=10)
+        purger, _ = make_purger(store, max_failures=2)
+        with pytest.raises(Exception):
+            purger.purge(GRAPH)
+        expect(len(store.updates)).equals(3)
+
+    def test_resumes_from_saved_progress(self):
+        store = FakeGraphStore(triples=2000)
+        purger, _ = make_purger(store)
+        saved = PurgeProgress.from_dict(
+            PurgeProgress(graph=GRAPH, triples_at_start=6000, triples_deleted=4000).json
+        )
+        progress = purger.purge(GRAPH, progress=saved)
+        expect(progress.batches).equals(1)
+        expect(progress.triples_deleted).equals(6000)
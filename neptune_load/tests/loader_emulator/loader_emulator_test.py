@@ -0,0 +1,194 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from neptune_load.bulk_loader.async_bulk_loader import AsyncBulkLoader
+from neptune_load.bulk_loader.bulk_loader import BulkLoader, BulkloadStatus
+from neptune_load.loader_emulator.loader_emulator import (
+    EmulatorConfiguration,
+    LoaderEmulator,
+    LoaderEmulatorServer,
+)
+from neptune_load.pooled_transport.pooled_transport import PooledTransport
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+from pyexpect import expect
+import asyncio
+import pytest
+import requests
+
+TEST_REGION = "ap-southeast-1"
+TEST_IAM_ROLE = "arn:aws:iam::123456789012:role/Elchfisch"
+
+
+class FakeClock:
+    def __init__(self, now=1625111590.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def emulator_server(clock):
+    emulator = LoaderEmulator(
+        configuration=EmulatorConfiguration(
+            load_duration_in_seconds=10,
+            records_per_second=1000,
+            failing_sources=["broken"],
+            errors_per_failed_load=7,
+            seed=42,
+        ),
+        clock=clock,
+    )
+    with LoaderEmulatorServer(emulator=emulator) as server:
+        yield server
+
+
+@pytest.fixture
+def signer():
+    return SigV4Signer(
+        region=TEST_REGION,
+        access_key_id="AKIDEXAMPLE",
+        access_key_secret="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY",
+        transport=PooledTransport(total_retries=0),
+        protocol="http",
+    )
+
+
+def make_loader(signer, server, source="s3://bucket/data.nt", **kwargs):
+    return BulkLoader(
+        signer=signer,
+        source=source,
+        neptune_endpoint=server.endpoint,
+        iam_role_arn=TEST_IAM_ROLE,
+        **kwargs,
+    )
+
+
+class TestLoaderEmulator:
+    def test_1_load_runs_through_the_signed_http_path(
+        self, emulator_server, signer, clock
+    ):
+        loader = make_loader(signer, emulator_server)
+        loader.initiate_bulk_load_from_s3()
+        expect(loader.status.status).to.equal(
+            BulkloadStatus.LoadStatus.LOAD_IN_PROGRESS
+        )
+
+        clock.now = clock.now + 4
+        loader._refresh_status()
+        expect(loader.status.total_records).to.equal(4000)
+
+        clock.now = clock.now + 10
+        loader._refresh_status()
+        expect(loader.status.status).to.equal(BulkloadStatus.LoadStatus.LOAD_COMPLETED)
+        expect(loader.status.total_records).to.equal(10000)
+        expect(loader.status.total_time_spent).to.equal(10)
+        expect(loader.get_active_loads()).to.equal([loader.load_id])
+
+    def test_2_second_load_needs_queue_request(self, emulator_server, signer, clock):
+        make_loader(signer, emulator_server).initiate_bulk_load_from_s3()
+        with pytest.raises(Exception, match="400"):
+            make_loader(signer, emulator_server).initiate_bulk_load_from_s3()
+
+        queued = make_loader(signer, emulator_server, queueRequest="TRUE")
+        queued.initiate_bulk_load_from_s3()
+        expect(queued.status.status).to.equal(BulkloadStatus.LoadStatus.LOAD_IN_QUEUE)
+
+        clock.now = clock.now + 15
+        queued._refresh_status()
+        expect(queued.status.status).to.equal(
+            BulkloadStatus.LoadStatus.LOAD_IN_PROGRESS
+        )
+        expect(queued.status.total_records).to.equal(5000)
+
+    def test_3_injected_failures_are_paged_and_break_dependencies(
+        self, emulator_server, signer, clock
+    ):
+        loader = make_loader(signer, emulator_server)
+        load_ids = loader.chain_load(["s3://bucket/broken.nt", "s3://bucket/fine.nt"])
+
+        clock.now = clock.now + 10
+        failed = make_loader(
+            signer, emulator_server, load_id=load_ids["s3://bucket/broken.nt"]
+        )
+        failed._refresh_status()
+        expect(failed.status.status).to.equal(BulkloadStatus.LoadStatus.LOAD_FAILED)
+        summary = failed.summarize_errors(errors_per_page=3)
+        expect(summary.total_errors).to.equal(7)
+        expect(summary.failed_feeds).to.equal({"s3://bucket/broken.nt": "LOAD_FAILED"})
+
+        dependent = make_loader(
+            signer, emulator_server, load_id=load_ids["s3://bucket/fine.nt"]
+        )
+        dependent._refresh_status()
+        expect(dependent.status.status).to.equal(
+            BulkloadStatus.LoadStatus.LOAD_FAILED_BECAUSE_DEPENDENCY_NOT_SATISFIED
+        )
+
+    def test_4_cancel_reset_and_unsigned_requests(self, emulator_server, signer):
+        loader = make_loader(signer, emulator_server)
+        loader.initiate_bulk_load_from_s3()
+        loader.cancel_load()
+        expect(loader.status.status).to.equal(
+            BulkloadStatus.LoadStatus.LOAD_CANCELLED_BY_USER
+        )
+
+        loader.reset_database()
+        expect(loader.get_active_loads()).to.equal([])
+
+        response = requests.get(f"http://{emulator_server.endpoint}/loader")
+        expect(response.status_code).to.equal(403)
+
+    def test_5_async_loader_follows_many_loads(self):
+        emulator = LoaderEmulator(
+            configuration=EmulatorConfiguration(
+                load_duration_in_seconds=0.2,
+                concurrent_loads=100,
+                max_queued_loads=100,
+                request_failure_rate=0.05,
+                seed=7,
+            )
+        )
+        transport = PooledTransport(backoff_factor=0)
+        with LoaderEmulatorServer(emulator=emulator) as server:
+            async_loader = AsyncBulkLoader(
+                signer=SigV4Signer(
+                    region=TEST_REGION,
+                    access_key_id="AKIDEXAMPLE",
+                    access_key_secret="secret",
+                    transport=transport,
+                    protocol="http",
+                ),
+                neptune_endpoint=server.endpoint,
+                iam_role_arn=TEST_IAM_ROLE,
+                queueRequest="TRUE",
+                wait_between_queries_in_seconds=0.1,
+                maximum_wait_between_queries_in_seconds=0.1,
+            )
+
+            async def run():
+                async with async_loader:
+                    sources = [f"s3://bucket/part-{index}.nt" for index in range(20)]
+                    load_ids = []
+                    for source in sources:
+                        # submissions are not retried, so resubmit injected failures
+                        while True:
+                            try:
+                                load_ids.append(await async_loader.submit(source))
+                                break
+                            except Exception:
+                                pass
+                    return await async_loader.wait_for_all(load_ids)
+
+            results = asyncio.run(run())
+
+        expect(len(results)).to.equal(20)
+        for status in results.values():
+            expect(status.status).to.equal(BulkloadStatus.LoadStatus.LOAD_COMPLETED)
+        expect(emulator.request_counts["GET /loader"] >= 40).to.be.true()
+        transport.close()
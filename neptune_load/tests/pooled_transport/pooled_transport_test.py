@@ -0,0 +1,65 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from neptune_load.pooled_transport.pooled_transport import PooledTransport
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+from pyexpect import expect
+from unittest import mock
+import json
+
+TEST_ACCESS_KEY_ID = "ASIA************"
+TEST_ACCESS_KEY_SECRET = "gr****************************"
+TEST_REGION = "ap-southeast-1"
+TEST_DB_ENDPOINT = f"neptune.cluster-lollollollol.{TEST_REGION}.amazonaws.com"
+
+
+class TestPooledTransport:
+    def test_1_session_is_created_once(self):
+        transport = PooledTransport(pool_maxsize=7)
+        expect(transport.session).to.be(transport.session)
+        adapter = transport.session.get_adapter(f"https://{TEST_DB_ENDPOINT}")
+        expect(adapter._pool_maxsize).to.equal(7)
+        expect(adapter.max_retries.allowed_methods).to.equal(
+            frozenset(["GET", "DELETE"])
+        )
+
+    def test_2_shared_transport_is_a_singleton(self):
+        expect(PooledTransport.shared()).to.be(PooledTransport.shared())
+
+    def test_3_request_applies_default_timeout(self):
+        transport = PooledTransport(
+            connect_timeout_in_seconds=1, read_timeout_in_seconds=2
+        )
+        with mock.patch("requests.Session.request", autospec=True) as mock_request:
+            transport.request("GET", "https://somewhere")
+            _, kwargs = mock_request.call_args
+            expect(kwargs["timeout"]).to.equal((1, 2))
+
+    def test_4_signer_hands_out_its_transport(self):
+        transport = PooledTransport()
+        signer = SigV4Signer(
+            region=TEST_REGION,
+            access_key_id=TEST_ACCESS_KEY_ID,
+            access_key_secret=TEST_ACCESS_KEY_SECRET,
+            transport=transport,
+        )
+        first = signer.get_signed_request(
+            host=TEST_DB_ENDPOINT,
+            method="GET",
+            query_type="loader",
+            query=json.dumps({"loadId": "1"}),
+        )
+        second = signer.get_signed_request(
+            host=TEST_DB_ENDPOINT,
+            method="DELETE",
+            query_type="loader",
+            query=json.dumps({"loadId": "1"}),
+        )
+        expect(first.transport).to.be(transport)
+        expect(second.transport).to.be(transport)
+        with mock.patch("requests.Session.request", autospec=True) as mock_request:
+            first.execute()
+            second.execute()
+            expect(mock_request.call_count).to.equal(2)
+            sessions = {call[0][0] for call in mock_request.call_args_list}
+            expect(len(sessions)).to.equal(1)
@@ -0,0 +1,108 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import json
+import re
+from unittest import mock
+
+from pyexpect import expect
+
+from neptune_load.query_client.query_client import (
+    NeptuneQueryClient,
+    iter_csv_rows,
+    iter_json_bindings,
+    iter_text,
+)
+
+ROWS = [
+    {"S": f"urn:chain:{n}", "P": "urn:amount", "O": f"{n}.5 ünits\u2028"}
+    for n in range(50)
+]
+
+
+def json_body(rows):
+    return json.dumps(
+        {
+            "head": {"vars": ["S", "P", "O"]},
+            "results": {
+                "bindings": [
+                    {name: {"type": "literal", "value": v} for name, v in row.items()}
+                    for row in rows
+                ]
+            },
+        },
+        indent=1,
+    ).encode("utf-8")
+
+
+def csv_body(rows):
+    lines = ["S,P,O"] + [f'{r["S"]},{r["P"]},"{r["O"]}\nline two"' for r in rows]
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def in_chunks(body, size=7):
+    return [body[start : start + size] for start in range(0, len(body), size)]
+
+
+def fake_signer(pages):
+    """Answers each query with the rows its LIMIT and OFFSET select."""
+    signer = mock.Mock()
+    signed_requests = []
+
+    def get_signed_request(host, method, query_type, query):
+        match = re.search(r"LIMIT (\d+) OFFSET (\d+)", query)
+        rows = pages
+        if match:
+            limit, offset = int(match.group(1)), int(match.group(2))
+            rows = pages[offset : offset + limit]
+        signed_request = mock.Mock()
+        response = mock.Mock(status_code=200)
+        response.iter_content.return_value = in_chunks(json_body(rows), 11)
+        signed_request.execute.return_value = response
+        signed_requests.append((query, signed_request))
+        return signed_request
+
+    signer.get_signed_request.side_effect = get_signed_request
+    return signer, signed_requests
+
+
+class TestQueryClient:
+    def test_json_rows_are_parsed_across_chunk_boundaries(self):
+        rows = list(iter_json_bindings(iter_text(in_chunks(json_body(ROWS)))))
+        expect(rows).equals(ROWS)
+        expect(list(iter_json_bindings(['{"head": {}, "boolean": true}']))).equals([])
+
+    def test_csv_rows_keep_quoted_newlines(self):
+        rows = list(iter_csv_rows(iter_text(in_chunks(csv_body(ROWS[:3]), 5))))
+        expect(len(rows)).equals(3)
+        expect(rows[2]["O"]).equals("2.5 ünits\u2028\nline two")
+        expect(rows[2]["S"]).equals("urn:chain:2")
+
+    def test_query_streams_with_accept_header(self):
+        signer, signed_requests = fake_signer(ROWS)
+        client = NeptuneQueryClient(signer=signer, neptune_endpoint="neptune")
+        expect(list(client.query("SELECT ?S ?P ?O WHERE { ?S ?P ?O }"))).equals(ROWS)
+        expect(signer.get_signed_request.call_args.kwargs["query_type"]).equals(
+            "sparql"
+        )
+        _, signed_request = signed_requests[0]
+        signed_request.execute.assert_called_once_with(
+            transport=None,
+            stream=True,
+            headers={"Accept": "application/sparql-results+json"},
+        )
+        signed_request.execute.return_value.close.assert_called_once()
+
+    def test_pages_resume_from_an_offset(self):
+        signer, _ = fake_signer(ROWS)
+        client = NeptuneQueryClient(signer=signer, neptune_endpoint="neptune")
+        pages = list(client.query_pages("SELECT * {} ORDER BY ?S", page_size=20))
+        expect([page.offset for page in pages]).equals([0, 20, 40])
+        expect([len(page.rows) for page in pages]).equals([20, 20, 10])
+        resumed = list(client.query_paged("SELECT * {}", page_size=20, offset=40))
+        expect(resumed).equals(ROWS[40:])
+
+    def test_count_reads_the_first_value(self):
+        signer, _ = fake_signer([{"count": "41220091"}])
+        client = NeptuneQueryClient(signer=signer, neptune_endpoint="neptune")
+        expect(client.count("SELECT (COUNT(*) AS ?count) {}")).equals(41220091)
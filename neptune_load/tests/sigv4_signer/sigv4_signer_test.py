@@ -15,7 +15,7 @@ TEST_DB_ENDPOINT = f"neptune.cluster-lollollollol.{TEST_REGION}.amazonaws.com"
 
 
 class TestSigV4Signer:
-    @mock.patch("requests.request", autospec=True)
+    @mock.patch("requests.Session.request", autospec=True)
     def test_signature_loader(self, mock_requests):
 
         # mock_requests = mock.Mock(spec=requests.request)
@@ -79,3 +79,32 @@ class TestSigV4Signer:
 
         expect(signed_request.method).to.equal("GET")
         expect(len(signed_request.params["headers"])).to.equal(3)
+
+    def test_signing_key_is_cached(self):
+        neptune_signer_under_test = SigV4Signer(
+            region=TEST_REGION,
+            access_key_id=TEST_ACCESS_KEY_ID,
+            access_key_secret=TEST_ACCESS_KEY_SECRET,
+            session_token=TEST_SESSION_TOKEN,
+        )
+        query_string = json.dumps({"loadId": 666})
+
+        with mock.patch.object(
+            neptune_signer_under_test,
+            "derive_signature_key",
+            wraps=neptune_signer_under_test.derive_signature_key,
+        ) as derive:
+            for method in ["GET", "DELETE", "GET"]:
+                neptune_signer_under_test.get_signed_request(
+                    host=TEST_DB_ENDPOINT,
+                    method=method,
+                    query_type="loader",
+                    query=query_string,
+                )
+            expect(derive.call_count).to.equal(1)
+
+        expect(
+            neptune_signer_under_test.get_signature_key("20210701", "neptune-db")
+        ).to.equal(
+            neptune_signer_under_test.derive_signature_key("20210701", "neptune-db")
+        )
@@ -0,0 +1,71 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+from pyexpect import expect
+
+from neptune_load.sparql_update.sparql_update import (
+    DELETE_DATA,
+    INSERT_DATA,
+    SparqlUpdateClient,
+    update_batches,
+)
+
+TRIPLES = [f"<urn:s:{n}> <urn:p> <urn:o> ." for n in range(5)]
+
+
+class TestSparqlUpdate:
+    def test_batches_wrap_triples_in_data_blocks(self):
+        updates = list(update_batches(INSERT_DATA, TRIPLES, triples_per_update=2))
+        expect(len(updates)).equals(3)
+        expect(updates[0]).equals(f"INSERT DATA {{\n{TRIPLES[0]}\n{TRIPLES[1]}\n}}")
+        expect(updates[2]).equals(f"INSERT DATA {{\n{TRIPLES[4]}\n}}")
+
+    def test_named_graph_batches(self):
+        (update,) = update_batches(
+            DELETE_DATA, TRIPLES[:1], named_graph="urn:graph:job"
+        )
+        expect(update).equals(
+            f"DELETE DATA {{\nGRAPH <urn:graph:job> {{\n{TRIPLES[0]}\n}}\n}}"
+        )
+
+    def test_client_posts_signed_updates_and_raises_on_error(self):
+        signer = mock.Mock()
+        signed_request = signer.get_signed_request.return_value
+        signed_request.execute.return_value = mock.Mock(status_code=200, text="{}")
+        client = SparqlUpdateClient(signer=signer, neptune_endpoint="neptune")
+
+        expect(client.execute_all(["INSERT DATA {}", "DELETE DATA {}"])).equals(2)
+        signer.get_signed_request.assert_called_with(
+            host="neptune",
+            method="POST",
+            query_type="sparqlupdate",
+            query="DELETE DATA {}",
+        )
+
+        signed_request.execute.return_value = mock.Mock(status_code=400, text="bad")
+        with pytest.raises(Exception):
+            client.execute("INSERT DATA {}")
+
+    def test_concurrent_updates_are_bounded(self):
+        lock, in_flight, peak = threading.Lock(), [0], [0]
+
+        def execute(transport=None):
+            with lock:
+                in_flight[0] = in_flight[0] + 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] = in_flight[0] - 1
+            return mock.Mock(status_code=200, text="{}")
+
+        signer = mock.Mock()
+        signer.get_signed_request.return_value.execute.side_effect = execute
+        client = SparqlUpdateClient(signer=signer, neptune_endpoint="neptune")
+        updates = update_batches(INSERT_DATA, TRIPLES * 20, triples_per_update=5)
+        expect(client.execute_all(updates, max_in_flight=3)).equals(20)
+        expect(peak[0]).equals(3)
@@ -34,6 +34,7 @@ class AppConfig:
     job_table_name = environ.var(default="Jobs_Test")
     jobspec_name = environ.var(default="rdfoxjob.json")
     rdfoxlog_name = environ.var(default="rdfox.log")
+    rdfoxlog_tail_bytes = environ.var(default=64 * 1024, converter=int)
     neptune_cluster_endpoint = environ.var(
         default="neptune.cluster-abcdefghijklmn.ap-southeast-1.neptune.amazonaws.com:8182"
     )
@@ -45,10 +46,29 @@ class AppConfig:
     )
     neptune_source_format = "turtle"
     neptune_update_single_cardinality_properties = True
-    neptune_parallelism = NeptuneParallelism.OVERSUBSCRIBE
+    neptune_parallelism = NeptuneParallelism.AUTO
     neptune_queue_request = True
     neptune_mode = NeptuneMode.AUTO
     neptune_fail_on_error = False
+    neptune_load_max_errors = environ.var(default=10000, converter=int)
+    triple_dedup = environ.bool_var(default=False)
+    triple_dedup_set = environ.var(default="DISK")
+    triple_dedup_shards = environ.var(default=4, converter=int)
+    delta_load = environ.bool_var(default=False)
+    sparql_update_max_bytes = environ.var(default=0, converter=int)
+    sparql_update_concurrency = environ.var(default=4, converter=int)
+    verify_chain_counts = environ.bool_var(default=False)
+    job_graph_prefix = environ.var(default="")
+    purge_triples_per_batch = environ.var(default=50000, converter=int)
+    purge_pause_in_seconds = environ.var(default=1.0, converter=float)
+    load_budget_seconds = environ.var(default=0, converter=int)
+    load_estimate_history = environ.var(default=50, converter=int)
+    convert_answers_format = environ.var(default="")
+    convert_answers_shard_bytes = environ.var(default=1024 ** 3, converter=int)
+    follow_inference = environ.bool_var(default=False)
+    resource_sizing = environ.var(default="")
+    resource_sizing_history = environ.var(default=100, converter=int)
+    resource_sizing_headroom = environ.var(default=1.25, converter=float)
     log_level = environ.var(default="info", converter=str_to_log_level)
 
 
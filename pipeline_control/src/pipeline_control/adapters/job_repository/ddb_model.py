@@ -57,3 +57,19 @@ class DDBJob(Model):
     key = UnicodeAttribute(default="")
     job_status_index = JobStatusIndex()
     neptune_writer_instance = UnicodeAttribute(default="")
+    neptune_load_errors = JSONAttribute(default={})
+    neptune_succeeded_feeds = JSONAttribute(default=[])
+    neptune_retry_load_ids = JSONAttribute(default={})
+    neptune_shard_loads = JSONAttribute(default=[])
+    neptune_shard_progress = JSONAttribute(default={})
+    neptune_parallelism_decision = JSONAttribute(default={})
+    triple_dedup_statistics = JSONAttribute(default={})
+    delta_statistics = JSONAttribute(default={})
+    chain_verification = JSONAttribute(default={})
+    graph_purge = JSONAttribute(default={})
+    neptune_throughput = JSONAttribute(default={})
+    neptune_load_estimate = JSONAttribute(default={})
+    answer_conversion = JSONAttribute(default={})
+    rdfox_telemetry = JSONAttribute(default={})
+    inference_progress = JSONAttribute(default={})
+    resource_estimate = JSONAttribute(default={})
@@ -7,17 +7,35 @@ from datetime import datetime
 from typing import List, Tuple
 
 import pynamodb
+from neptune_load.bulk_loader.load_errors import LoadErrorSummary
+from neptune_load.graph_purger.graph_purger import PurgeProgress
 
 import app_config
 from pipeline_control.adapters.job_repository.ddb_model import DDBJob
 from pipeline_control.adapters.kubernetes_objects.rdfox_job import RDFoxJobConfiguration
+from pipeline_control.domain.answer_converter.answer_converter import ConversionStats
+from pipeline_control.domain.chain_verifier.chain_verifier import ChainVerification
+from pipeline_control.domain.delta_index.delta_index import DeltaStats
+from pipeline_control.domain.inference_progress.inference_progress import (
+    InferenceProgress,
+)
 from pipeline_control.domain.inference_stat_processor.inference_stat_processor import (
     InferenceStats,
 )
+from pipeline_control.domain.load_estimator.load_estimator import LoadEstimate
+from pipeline_control.domain.load_throughput.load_throughput import LoadTimeSeries
 from pipeline_control.domain.model import Job, JobStatus
 from pipeline_control.domain.neptune_stat_processor.neptune_stat_processor import (
     NeptuneStats,
 )
+from pipeline_control.domain.parallelism_policy.parallelism_policy import (
+    ParallelismDecision,
+)
+from pipeline_control.domain.rdfox_telemetry.rdfox_telemetry import RDFoxTelemetry
+from pipeline_control.domain.resource_predictor.resource_predictor import (
+    ResourceEstimate,
+)
+from pipeline_control.domain.triple_deduplicator.triple_deduplicator import DedupStats
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +145,88 @@ MAPPERS = {
         "to_domain_model": default_mapper,
         "to_ddb_model": default_mapper,
     },
+    "neptune_load_errors": {
+        "to_domain_model": lambda obj, key, value: {
+            key: LoadErrorSummary.from_json(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "neptune_succeeded_feeds": {
+        "to_domain_model": default_mapper,
+        "to_ddb_model": default_mapper,
+    },
+    "neptune_retry_load_ids": {
+        "to_domain_model": default_mapper,
+        "to_ddb_model": default_mapper,
+    },
+    "neptune_shard_loads": {
+        "to_domain_model": default_mapper,
+        "to_ddb_model": default_mapper,
+    },
+    "neptune_shard_progress": {
+        "to_domain_model": default_mapper,
+        "to_ddb_model": default_mapper,
+    },
+    "neptune_parallelism_decision": {
+        "to_domain_model": lambda obj, key, value: {
+            key: ParallelismDecision.from_dict(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "triple_dedup_statistics": {
+        "to_domain_model": lambda obj, key, value: {key: DedupStats.from_dict(value)},
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "delta_statistics": {
+        "to_domain_model": lambda obj, key, value: {key: DeltaStats.from_dict(value)},
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "chain_verification": {
+        "to_domain_model": lambda obj, key, value: {
+            key: ChainVerification.from_dict(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "graph_purge": {
+        "to_domain_model": lambda obj, key, value: {
+            key: PurgeProgress.from_dict(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "neptune_throughput": {
+        "to_domain_model": lambda obj, key, value: {
+            key: LoadTimeSeries.from_dict(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "neptune_load_estimate": {
+        "to_domain_model": lambda obj, key, value: {key: LoadEstimate.from_dict(value)},
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "answer_conversion": {
+        "to_domain_model": lambda obj, key, value: {
+            key: ConversionStats.from_dict(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "rdfox_telemetry": {
+        "to_domain_model": lambda obj, key, value: {
+            key: RDFoxTelemetry.from_dict(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "inference_progress": {
+        "to_domain_model": lambda obj, key, value: {
+            key: InferenceProgress.from_dict(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
+    "resource_estimate": {
+        "to_domain_model": lambda obj, key, value: {
+            key: ResourceEstimate.from_dict(value)
+        },
+        "to_ddb_model": lambda obj, key, value: {key: value.json},
+    },
 }
 
 
@@ -144,6 +244,12 @@ class JobRepository:
         jobs_as_objects = [self.map_ddb_model_to_domain(job) for job in jobs]
         return jobs_as_objects
 
+    def get_all_by_key(self, key: str) -> List[Job]:
+        # Newest run first, the range key is the date followed by the run
+        jobs = list(DDBJob.query(hash_key=key, scan_index_forward=False))
+        jobs_as_objects = [self.map_ddb_model_to_domain(job) for job in jobs]
+        return jobs_as_objects
+
     def _lookup_job_by_id(self, job_id):
         key, date, run = job_id.split(JOB_ID_DELIMITER)
         try:
@@ -35,6 +35,8 @@ from .kubernetes_object import KubernetesObject
 
 logger = logging.getLogger(__name__)
 
+RDFOX_CONTAINER_NAME = "rdfox-container"
+
 
 @dataclass
 class RDFoxJobConfiguration:
@@ -208,7 +210,7 @@ class RDFoxJob(KubernetesObject):
     ) -> Container:
 
         container = Container(
-            name="rdfox-container",
+            name=RDFOX_CONTAINER_NAME,
             imagePullPolicy="Always",
             image=self.job_configuration.rdfox_container_image,
             resources=self._make_main_container_resource_requirements(),
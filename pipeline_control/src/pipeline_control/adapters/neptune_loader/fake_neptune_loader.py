@@ -4,9 +4,11 @@
 import json
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 import neptune_load
+from neptune_load.bulk_loader.load_errors import LoadErrorSummary
+from neptune_load.graph_purger.graph_purger import PurgeProgress
 
 from .neptune_loader import NeptuneLoader
 
@@ -18,6 +20,15 @@ class FakeNeptuneLoader(NeptuneLoader):
     success_stats: Optional[dict] = field(default_factory=dict)
     load_stats: Optional[dict] = field(default_factory=dict)
     failure_stats: Optional[dict] = field(default_factory=dict)
+    error_summary: Optional[dict] = field(default_factory=dict)
+    # the cap the last error summary was asked for
+    max_errors: Optional[int] = None
+    failed_feeds: Optional[List[str]] = field(default_factory=list)
+    sparql_updates: List[str] = field(default_factory=list)
+    # answers a count query with the value of the first key found in it
+    query_counts: Dict[str, int] = field(default_factory=dict)
+    queries: List[str] = field(default_factory=list)
+    purged_graphs: List[str] = field(default_factory=list)
     cluster_endpoint: str = ""
     iam_role_arn: str = ""
     source_format: str = ""
@@ -49,6 +60,64 @@ class FakeNeptuneLoader(NeptuneLoader):
         else:
             return self.wrapped_failure_stats
 
+    def get_error_summary(self, max_errors=None):
+        self.max_errors = max_errors
+        return LoadErrorSummary.from_json(self.error_summary)
+
+    def failed_sources(self):
+        return list(self.failed_feeds)
+
+    def execute_sparql_updates(self, updates, max_in_flight=1):
+        updates = list(updates)
+        self.sparql_updates.extend(updates)
+        return len(updates)
+
+    def count_query(self, query):
+        self.queries.append(query)
+        for fragment, count in self.query_counts.items():
+            if fragment in query:
+                return count
+        return 0
+
+    def purge_graph(
+        self,
+        graph,
+        triples_per_batch,
+        pause_in_seconds,
+        on_progress=None,
+        progress=None,
+    ):
+        self.purged_graphs.append(graph)
+        if not progress:
+            progress = PurgeProgress(
+                graph=graph,
+                triples_at_start=self.count_query(graph),
+                triples_per_batch=triples_per_batch,
+            )
+        while progress.triples_deleted < progress.triples_at_start:
+            progress.batches = progress.batches + 1
+            progress.triples_deleted = min(
+                progress.triples_at_start,
+                progress.triples_deleted + progress.triples_per_batch,
+            )
+            if on_progress:
+                on_progress(progress)
+        progress.done = True
+        if on_progress:
+            on_progress(progress)
+        return progress
+
+    def retry_failed_feeds(self, failed_sources=None):
+        if failed_sources is None:
+            failed_sources = self.failed_sources()
+        return self.chain_load(failed_sources)
+
+    def chain_load(self, sources):
+        return {
+            source: f"{self.fake_load_id}-{index}"
+            for index, source in enumerate(sources)
+        }
+
     @property
     def wrapped_success_stats(self):
         return self.wrap(self.success_stats)
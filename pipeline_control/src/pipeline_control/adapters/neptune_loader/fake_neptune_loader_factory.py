@@ -23,6 +23,12 @@ class FakeNeptuneLoaderFactory(NeptuneLoaderFactory):
     success_stats: Optional[dict] = field(default_factory=dict)
     load_stats: Optional[dict] = field(default_factory=dict)
     failure_stats: Optional[dict] = field(default_factory=dict)
+    error_summary: Optional[dict] = field(default_factory=dict)
+    failed_feeds: Optional[list] = field(default_factory=list)
+    active_loads: Optional[list] = field(default_factory=list)
+    query_counts: Optional[dict] = field(default_factory=dict)
+    # read only loaders of their own, by load id, for loads that differ
+    read_only_loaders: Optional[dict] = field(default_factory=dict)
     iam_role_arn: str = ""
     source_format: str = ""
     source: str = ""
@@ -44,6 +50,9 @@ class FakeNeptuneLoaderFactory(NeptuneLoaderFactory):
                 complete_after_iterations=self.complete_after_iterations,
                 load_stats=self.load_stats,
                 success_stats=self.success_stats,
+                error_summary=self.error_summary,
+                failed_feeds=self.failed_feeds,
+                query_counts=self.query_counts,
                 neptune_load_configuration=neptune_configuration,
             )
             self.fake_loader.initiate_bulk_load()
@@ -56,6 +65,8 @@ class FakeNeptuneLoaderFactory(NeptuneLoaderFactory):
             NeptuneBulkloaderConfiguration
         ] = None,
     ):
+        if neptune_load_id in self.read_only_loaders:
+            return self.read_only_loaders[neptune_load_id]
         neptune_configuration = self.resolve_neptune_configuration(
             override_neptune_load_configuration
         )
@@ -65,11 +76,17 @@ class FakeNeptuneLoaderFactory(NeptuneLoaderFactory):
                 complete_after_iterations=self.complete_after_iterations,
                 load_stats=self.load_stats,
                 success_stats=self.success_stats,
+                error_summary=self.error_summary,
+                failed_feeds=self.failed_feeds,
+                query_counts=self.query_counts,
                 neptune_load_configuration=neptune_configuration,
             )
             self.fake_loader.initiate_bulk_load()
         return self.fake_loader
 
+    def get_active_loads(self, override_neptune_load_configuration=None):
+        return list(self.active_loads)
+
     # this is not safe and I'm not proud of it but we only exist for testing so TODO:
     def set_loading(self):
         if self.fake_loader:
@@ -3,9 +3,14 @@
 
 import logging
 from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
 
 import neptune_load.bulk_loader.bulk_loader
+from neptune_load.bulk_loader.load_errors import LoadErrorSummary
+from neptune_load.graph_purger.graph_purger import GraphPurger, PurgeProgress
+from neptune_load.query_client.query_client import NeptuneQueryClient
 from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+from neptune_load.sparql_update.sparql_update import SparqlUpdateClient
 
 from pipeline_control.adapters.neptune_loader.neptune_loader_configuration import (
     NeptuneBulkloaderConfiguration,
@@ -14,6 +19,12 @@ from pipeline_control.adapters.neptune_loader.neptune_loader_configuration impor
 logger = logging.getLogger(__name__)
 
 
+def as_loader_flag(value) -> str:
+    if isinstance(value, str):
+        value = value.strip().upper() in ("TRUE", "1", "YES")
+    return "TRUE" if value else "FALSE"
+
+
 @dataclass
 class NeptuneLoader:
     neptune_load_configuration: NeptuneBulkloaderConfiguration
@@ -35,6 +46,9 @@ class NeptuneLoader:
                 queueRequest=configuration.queue_request,
                 region=configuration.region,
                 parallelism=configuration.parallelism.value,
+                mode=configuration.mode.value,
+                fail_on_error=as_loader_flag(configuration.fail_on_error),
+                named_graph=configuration.named_graph,
             )
         return self._bulk_loader
 
@@ -56,3 +70,55 @@ class NeptuneLoader:
     def get_status(self):
         self.bulk_loader._refresh_status()
         return self.bulk_loader.status
+
+    def get_error_summary(self, max_errors: int = None) -> LoadErrorSummary:
+        return self.bulk_loader.summarize_errors(max_errors=max_errors)
+
+    def failed_sources(self) -> List[str]:
+        return self.bulk_loader.failed_sources()
+
+    def retry_failed_feeds(self, failed_sources: List[str] = None) -> Dict[str, str]:
+        return self.bulk_loader.retry_failed_feeds(failed_sources=failed_sources)
+
+    def get_active_loads(self) -> List[str]:
+        return self.bulk_loader.get_active_loads()
+
+    def chain_load(self, sources: List[str]) -> Dict[str, str]:
+        return self.bulk_loader.chain_load(sources)
+
+    def execute_sparql_updates(
+        self, updates: Iterable[str], max_in_flight: int = 1
+    ) -> int:
+        client = SparqlUpdateClient(
+            signer=self.signer,
+            neptune_endpoint=self.neptune_load_configuration.cluster_endpoint,
+        )
+        return client.execute_all(updates, max_in_flight=max_in_flight)
+
+    def count_query(self, query: str) -> Optional[int]:
+        client = NeptuneQueryClient(
+            signer=self.signer,
+            neptune_endpoint=self.neptune_load_configuration.cluster_endpoint,
+        )
+        return client.count(query)
+
+    def purge_graph(
+        self,
+        graph: str,
+        triples_per_batch: int,
+        pause_in_seconds: float,
+        on_progress: Callable[[PurgeProgress], None] = None,
+        progress: PurgeProgress = None,
+    ) -> PurgeProgress:
+        endpoint = self.neptune_load_configuration.cluster_endpoint
+        purger = GraphPurger(
+            update_client=SparqlUpdateClient(
+                signer=self.signer, neptune_endpoint=endpoint
+            ),
+            query_client=NeptuneQueryClient(
+                signer=self.signer, neptune_endpoint=endpoint
+            ),
+            triples_per_batch=triples_per_batch,
+            pause_in_seconds=pause_in_seconds,
+        )
+        return purger.purge(graph, on_progress=on_progress, progress=progress)
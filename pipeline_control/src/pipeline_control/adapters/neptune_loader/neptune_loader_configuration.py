@@ -8,7 +8,15 @@ from typing import Optional
 
 class NeptuneMode(Enum):
     AUTO = "AUTO"
-    RESUME = "RESUE"
+    NEW = "NEW"
+    RESUME = "RESUME"
+
+    @classmethod
+    def _missing_(cls, value):
+        # Configurations stored before the spelling was fixed
+        if value == "RESUE":
+            return cls.RESUME
+        return None
 
 
 class NeptuneParallelism(Enum):
@@ -16,6 +24,8 @@ class NeptuneParallelism(Enum):
     MEDIUM = "MEDIUM"
     HIGH = "HIGH"
     OVERSUBSCRIBE = "OVERSUBSCRIBE"
+    # Resolved by the parallelism policy before the load is submitted
+    AUTO = "AUTO"
 
 
 @dataclass
@@ -31,6 +41,8 @@ class NeptuneBulkloaderConfiguration:
     update_single_cardinality_properties: bool
     queue_request: bool
     named_graph: Optional[str] = None
+    shard_count: Optional[int] = None
+    shard_strategy: Optional[str] = "SIZE"
 
     def __and__(self, other):
         merged_config = self.__dict__
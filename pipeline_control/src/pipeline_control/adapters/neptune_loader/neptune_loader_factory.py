@@ -51,6 +51,21 @@ class NeptuneLoaderFactory:
             neptune_load_configuration=neptune_configuration, signer=self.signer
         )
 
+    def get_active_loads(
+        self,
+        override_neptune_load_configuration: Optional[
+            NeptuneBulkloaderConfiguration
+        ] = None,
+    ):
+        neptune_configuration = self.resolve_neptune_configuration(
+            override_neptune_load_configuration
+        )
+        if not neptune_configuration.source:
+            neptune_configuration.source = "s3://loader/only/data"
+        return NeptuneLoader(
+            neptune_load_configuration=neptune_configuration, signer=self.signer
+        ).get_active_loads()
+
     def resolve_neptune_configuration(self, override) -> NeptuneBulkloaderConfiguration:
         neptune_configuration = util.neptune_config_from_app_config()
         neptune_configuration = neptune_configuration & self.neptune_load_configuration
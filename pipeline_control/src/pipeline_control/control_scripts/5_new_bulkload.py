@@ -12,14 +12,25 @@ from pipeline_control.adapters.job_repository.job_repository import JobRepositor
 from pipeline_control.adapters.kubernetes_objects.rdfox_job import RDFoxJobConfiguration
 from pipeline_control.adapters.neptune_loader.neptune_loader_configuration import (
     NeptuneBulkloaderConfiguration,
+    NeptuneMode,
 )
 from pipeline_control.adapters.neptune_loader.neptune_loader_factory import (
     NeptuneLoaderFactory,
 )
-from pipeline_control.domain.commands import InitiateBulkload
+from pipeline_control.domain.commands import (
+    InitiateBulkload,
+    PurgeJobGraph,
+    RetryFailedFeeds,
+)
 from pipeline_control.service_layer.handlers.initiate_bulk_load_handler import (
     InitiateBulkloadHandler,
 )
+from pipeline_control.service_layer.handlers.purge_job_graph_handler import (
+    PurgeJobGraphHandler,
+)
+from pipeline_control.service_layer.handlers.retry_failed_feeds_handler import (
+    RetryFailedFeedsHandler,
+)
 
 logger = logging.getLogger("bulk_loader")
 logger.setLevel(logging.DEBUG)
@@ -61,6 +72,60 @@ class BulkloadJobCreator:
         )
         cancel_loader.cancel_load()
 
+    def retry_failed_feeds(
+        self,
+        job_id,
+        **kwargs,
+    ):
+        neptune_loader_factory = NeptuneLoaderFactory(
+            neptune_load_configuration=None,
+            signer=SigV4Signer(),
+        )
+        retry_command = RetryFailedFeeds(
+            job_repository=self.job_repository,
+            neptune_loader_factory=neptune_loader_factory,
+            job_id=job_id,
+        )
+        RetryFailedFeedsHandler(cmd=retry_command).handle()
+
+    def resume_job(
+        self,
+        job_id,
+        **kwargs,
+    ):
+        job = self.job_repository.get_job_by_id(job_id)
+        neptune_configuration = job.job_configuration.neptune_configuration
+        neptune_configuration.mode = NeptuneMode.RESUME
+        neptune_loader_factory = NeptuneLoaderFactory(
+            neptune_load_configuration=neptune_configuration,
+            signer=SigV4Signer(),
+        )
+        resume_command = InitiateBulkload(
+            source=neptune_configuration.source,
+            neptune_loader_factory=neptune_loader_factory,
+            job_repository=self.job_repository,
+            job_id=job_id,
+        )
+        InitiateBulkloadHandler(cmd=resume_command).handle()
+
+    def purge_job_graph(
+        self,
+        job_id,
+        force=False,
+        **kwargs,
+    ):
+        neptune_loader_factory = NeptuneLoaderFactory(
+            neptune_load_configuration=None,
+            signer=SigV4Signer(),
+        )
+        purge_command = PurgeJobGraph(
+            job_repository=self.job_repository,
+            neptune_loader_factory=neptune_loader_factory,
+            job_id=job_id,
+            force=force,
+        )
+        PurgeJobGraphHandler(cmd=purge_command).handle()
+
     def submit_job(
         self,
         **kwargs,
@@ -96,6 +161,10 @@ class BulkloadJobCreator:
 
 @click.command()
 @click.option("--cancel_load")
+@click.option("--retry_failed_feeds")
+@click.option("--resume_job")
+@click.option("--purge_job")
+@click.option("--force", is_flag=True, default=False)
 @click.option("--source")
 @click.option("--cluster_endpoint")
 @click.option("--source_format", default="ntriples")
@@ -106,9 +175,15 @@ class BulkloadJobCreator:
 @click.option("--parallelism", default="OVERSUBSCRIBE")
 @click.option("--update_single_cardinality_properties", default=True)
 @click.option("--queue_request", default=True)
-@click.option("--named_graph", default="TEST")
+@click.option("--named_graph", default=None)
+@click.option("--shard_count", type=int, default=None)
+@click.option("--shard_strategy", default="SIZE")
 def go(
     cancel_load,
+    retry_failed_feeds,
+    resume_job,
+    purge_job,
+    force,
     source,
     source_format,
     cluster_endpoint,
@@ -120,6 +195,8 @@ def go(
     update_single_cardinality_properties,
     queue_request,
     named_graph,
+    shard_count,
+    shard_strategy,
 ):
     submitter = BulkloadJobCreator()
 
@@ -134,6 +211,15 @@ def go(
             cluster_endpoint=cluster_endpoint,
             region=region,
         )
+    elif retry_failed_feeds:
+        logger.info(f"Requested retry of failed feeds for job {retry_failed_feeds}")
+        submitter.retry_failed_feeds(job_id=retry_failed_feeds)
+    elif resume_job:
+        logger.info(f"Requested resumption of the load for job {resume_job}")
+        submitter.resume_job(job_id=resume_job)
+    elif purge_job:
+        logger.info(f"Requested purge of the named graph of job {purge_job}")
+        submitter.purge_job_graph(job_id=purge_job, force=force)
     else:
         submitter.submit_job(
             cluster_endpoint=cluster_endpoint,
@@ -147,6 +233,8 @@ def go(
             update_single_cardinality_properties=update_single_cardinality_properties,
             queue_request=queue_request,
             named_graph=named_graph,
+            shard_count=shard_count,
+            shard_strategy=shard_strategy,
         )
 
 
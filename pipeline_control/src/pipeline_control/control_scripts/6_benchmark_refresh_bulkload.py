@@ -0,0 +1,120 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+import time
+
+import click
+from neptune_load.loader_emulator.loader_emulator import (
+    EmulatorConfiguration,
+    LoaderEmulator,
+    LoaderEmulatorServer,
+)
+from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
+
+from pipeline_control.adapters.job_repository.fake_job_repository import (
+    FakeJobRepository,
+)
+from pipeline_control.adapters.neptune_loader.neptune_loader_factory import (
+    NeptuneLoaderFactory,
+)
+from pipeline_control.domain.commands import RefreshBulkload
+from pipeline_control.domain.model import Job, JobStatus
+from pipeline_control.domain.neptune_stat_processor.neptune_stat_processor import (
+    NeptuneStatProcessor,
+)
+from pipeline_control.service_layer.handlers import util
+from pipeline_control.service_layer.handlers.refresh_bulkload_handler import (
+    RefreshBulkloadHandler,
+)
+
+logger = logging.getLogger("benchmark_refresh_bulkload")
+logger.setLevel(logging.INFO)
+c_handler = logging.StreamHandler()
+formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+c_handler.setFormatter(formatter)
+logger.addHandler(c_handler)
+
+LOADING_STATUSES = (
+    JobStatus.NEPTUNE_LOAD_IN_PROGRESS,
+    JobStatus.NEPTUNE_LOAD_IN_QUEUE,
+    JobStatus.NEPTUNE_LOAD_NOT_STARTED,
+)
+
+
+def create_loading_jobs(repository, emulator, jobs):
+    for index in range(jobs):
+        job = Job(key=f"benchmark-{index:05d}")
+        repository.save(job)
+        _, response = emulator.handle(
+            "POST",
+            "loader",
+            {"source": f"s3://benchmark/{job.key}/", "queueRequest": "TRUE"},
+        )
+        job.neptune_load_id = response["payload"]["loadId"]
+        job.job_status = JobStatus.NEPTUNE_LOAD_IN_PROGRESS
+        repository.save(job)
+
+
+def count_loading_jobs(repository):
+    return sum(len(repository.get_all_by_status(status)) for status in LOADING_STATUSES)
+
+
+@click.command()
+@click.option("--jobs", default=200, help="Number of jobs being loaded")
+@click.option("--load_duration", default=5.0, help="Seconds each simulated load runs")
+@click.option("--failure_rate", default=0.0, help="Fraction of loads that fail")
+@click.option("--latency", default=0.0, help="Seconds added to every request")
+def benchmark(jobs, load_duration, failure_rate, latency):
+    emulator = LoaderEmulator(
+        configuration=EmulatorConfiguration(
+            load_duration_in_seconds=load_duration,
+            load_duration_jitter=0.5,
+            concurrent_loads=jobs,
+            max_queued_loads=jobs,
+            latency_in_seconds=latency,
+            failure_rate=failure_rate,
+        )
+    )
+    repository = FakeJobRepository()
+    repository.create_table_if_not_exists()
+    with LoaderEmulatorServer(emulator=emulator) as server:
+        neptune_configuration = util.neptune_config_from_app_config()
+        neptune_configuration.cluster_endpoint = server.endpoint
+        handler = RefreshBulkloadHandler(
+            cmd=RefreshBulkload(
+                job_repository=repository,
+                neptune_loader_factory=NeptuneLoaderFactory(
+                    neptune_load_configuration=neptune_configuration,
+                    signer=SigV4Signer(
+                        region="ap-southeast-1",
+                        access_key_id="AKIDEXAMPLE",
+                        access_key_secret="wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY",
+                        protocol="http",
+                    ),
+                ),
+                neptune_stat_processor=NeptuneStatProcessor(),
+            )
+        )
+        create_loading_jobs(repository, emulator, jobs)
+
+        rounds, refreshed, start = 0, 0, time.perf_counter()
+        loading = count_loading_jobs(repository)
+        while loading:
+            round_start = time.perf_counter()
+            handler.handle()
+            rounds, refreshed = rounds + 1, refreshed + loading
+            logger.info(
+                f"Round {rounds}: refreshed {loading} jobs in {time.perf_counter() - round_start:.2f}s"
+            )
+            loading = count_loading_jobs(repository)
+        elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"{refreshed} job refreshes in {elapsed:.1f}s, {refreshed / elapsed:,.0f} refreshes/s, requests {emulator.request_counts}"
+    )
+    repository.delete_table()
+
+
+if __name__ == "__main__":
+    benchmark()
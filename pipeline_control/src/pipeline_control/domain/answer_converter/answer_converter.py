@@ -0,0 +1,227 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import csv
+import gzip
+import itertools
+import os
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Iterable, Iterator, List, Optional
+
+# Uncompressed bytes per shard, a 1 GB N-Triples file gzips to 100-150 MB
+DEFAULT_SHARD_BYTES = 1024 * 1024 * 1024
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+ABSOLUTE_IRI = re.compile(r"[A-Za-z][A-Za-z0-9+.\-]*:[^\s<>\"{}|\\^`]+")
+INTEGER = re.compile(r"[+-]?\d+")
+DECIMAL = re.compile(r"[+-]?\d*\.\d+")
+DOUBLE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)[eE][+-]?\d+")
+
+
+class AnswerFormat(Enum):
+    NTRIPLES = "application/n-triples"
+    CSV = "text/csv"
+    TSV = "text/tab-separated-values"
+
+
+class OutputFormat(Enum):
+    NTRIPLES = "ntriples"
+    NQUADS = "nquads"
+
+    @property
+    def extension(self) -> str:
+        return ".nq.gz" if self == OutputFormat.NQUADS else ".nt.gz"
+
+
+def detect_answer_format(first_line: bytes) -> AnswerFormat:
+    """Tells query answers apart by their first line.
+
+    N-Triples starts with a subject term, the SPARQL TSV header with ?S and
+    the CSV header with the bare variable name.
+    """
+    line = first_line.lstrip()
+    if line.startswith(b"?"):
+        return AnswerFormat.TSV
+    if line.startswith((b"<", b"_:", b"#")) or not line:
+        return AnswerFormat.NTRIPLES
+    return AnswerFormat.CSV
+
+
+def literal(value: str, datatype: str = None) -> str:
+    escaped = (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+    return f'"{escaped}"^^<{datatype}>' if datatype else f'"{escaped}"'
+
+
+def csv_term(value: str, is_object: bool) -> str:
+    """N-Triples term for a SPARQL CSV value.
+
+    CSV drops the kind of term, so an object that looks like an absolute IRI
+    is taken for one and anything else for a plain literal. Datatypes and
+    language tags are lost, answers in TSV keep them.
+    """
+    if value.startswith("_:"):
+        return value
+    if not is_object or ABSOLUTE_IRI.fullmatch(value):
+        return f"<{value}>"
+    return literal(value)
+
+
+def tsv_term(value: str) -> str:
+    # TSV abbreviates numbers and booleans the way Turtle does
+    if INTEGER.fullmatch(value):
+        return literal(value, XSD + "integer")
+    if DECIMAL.fullmatch(value):
+        return literal(value, XSD + "decimal")
+    if DOUBLE.fullmatch(value):
+        return literal(value, XSD + "double")
+    if value in ("true", "false"):
+        return literal(value, XSD + "boolean")
+    return value
+
+
+@dataclass
+class ConversionStats:
+    output_format: str = "N/A"
+    answer_formats: dict = field(default_factory=dict)
+    input_rows: int = 0
+    statements: int = 0
+    # rows with an unbound variable have no statement to write
+    skipped_rows: int = 0
+    output_bytes: int = 0
+    graph: Optional[str] = None
+    shards: List[str] = field(default_factory=list)
+
+    @property
+    def json(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(**the_dict) if the_dict else cls()
+
+
+class AnswerConverter:
+    """Turns RDFox query answers into N-Triples or N-Quads lines.
+
+    Each answer file is read line by line, as N-Triples, SPARQL CSV or SPARQL
+    TSV depending on its first line. The first three columns of a CSV or TSV
+    answer are the subject, predicate and object. N-Quads put every
+    statement into the given graph.
+    """
+
+    def __init__(self, output_format: OutputFormat, graph: Optional[str] = None):
+        if output_format == OutputFormat.NQUADS and not graph:
+            raise ValueError("N-Quads output needs a graph")
+        suffix = f" <{graph}> .\n" if graph else " .\n"
+        self._suffix = suffix.encode("utf-8")
+        self.stats = ConversionStats(output_format=output_format.value, graph=graph)
+
+    def convert(self, lines: Iterable[bytes]) -> Iterator[bytes]:
+        lines = iter(lines)
+        first_line = next(lines, None)
+        if first_line is None:
+            return
+        answer_format = detect_answer_format(first_line)
+        counts = self.stats.answer_formats
+        counts[answer_format.name] = counts.get(answer_format.name, 0) + 1
+        if answer_format == AnswerFormat.NTRIPLES:
+            rows = self._ntriples_rows(first_line, lines)
+        elif answer_format == AnswerFormat.TSV:
+            rows = self._tsv_rows(lines)
+        else:
+            rows = self._csv_rows(lines)
+        for terms in rows:
+            self.stats.input_rows = self.stats.input_rows + 1
+            if terms is None:
+                self.stats.skipped_rows = self.stats.skipped_rows + 1
+                continue
+            self.stats.statements = self.stats.statements + 1
+            yield " ".join(terms).encode("utf-8") + self._suffix
+
+    @staticmethod
+    def _ntriples_rows(first_line, lines):
+        for line in itertools.chain([first_line], lines):
+            statement = line.strip().decode("utf-8")
+            if not statement or statement.startswith("#"):
+                continue
+            # the terms stay as they are, only the closing dot is replaced
+            yield [statement[:-1].rstrip()] if statement.endswith(".") else None
+
+    @staticmethod
+    def _tsv_rows(lines):
+        for line in lines:
+            values = line.rstrip(b"\r\n").decode("utf-8").split("\t")
+            if len(values) < 3 or not all(values[:3]):
+                yield None
+                continue
+            yield [tsv_term(value) for value in values[:3]]
+
+    @staticmethod
+    def _csv_rows(lines):
+        # Quoted values may span lines, so line ends go back in for csv
+        text_lines = (line.decode("utf-8") + "\n" for line in lines)
+        for values in csv.reader(text_lines):
+            if len(values) < 3 or not all(values[:3]):
+                yield None
+                continue
+            yield [
+                csv_term(values[0], is_object=False),
+                csv_term(values[1], is_object=False),
+                csv_term(values[2], is_object=True),
+            ]
+
+
+class ShardWriter:
+    """Writes lines into gzip shards of about shard_bytes uncompressed each.
+
+    A shard is closed and handed to on_shard once it is full, so only the
+    shard being written sits on local disk.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        on_shard: Callable[[str], None],
+        shard_bytes: int = DEFAULT_SHARD_BYTES,
+        extension: str = ".nt.gz",
+    ):
+        self._directory = directory
+        self._on_shard = on_shard
+        self._shard_bytes = shard_bytes
+        self._extension = extension
+        self._shard = None
+        self._path = None
+        self._written = 0
+        self.shard_count = 0
+        self.output_bytes = 0
+
+    def write(self, line: bytes):
+        if self._shard is None:
+            self._path = os.path.join(
+                self._directory, f"part-{self.shard_count:05d}{self._extension}"
+            )
+            self._shard = gzip.open(self._path, "wb")
+            self.shard_count = self.shard_count + 1
+        self._shard.write(line)
+        self._written = self._written + len(line)
+        self.output_bytes = self.output_bytes + len(line)
+        if self._written >= self._shard_bytes:
+            self._close_shard()
+
+    def close(self):
+        if self._shard is not None:
+            self._close_shard()
+
+    def _close_shard(self):
+        self._shard.close()
+        self._shard = None
+        self._written = 0
+        self._on_shard(self._path)
+        os.remove(self._path)
@@ -0,0 +1,136 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from pipeline_control.domain.inference_stat_processor.inference_stat_processor import (
+    InferenceStats,
+)
+
+CHAIN_CLASSES = "http://oxfordsemantic.tech/transactions/classes#"
+# The classes counted by the running-counts queries in container_scripts/pre_rdfox
+CHAIN_COUNT_CLASSES = {
+    "partial_chains_amount": ("ForwardChain", "BackwardChain"),
+    "full_chains_amount": ("FullChain",),
+}
+DEFAULT_MAX_WORKERS = 4
+# The type pattern an exported query selects its chains by, ?S a type:SuspiciousChain
+EXPORTED_CLASS_REGEX = re.compile(
+    r"\ba\s+(?:type:|<" + re.escape(CHAIN_CLASSES) + r")(?P<chain_class>\w+)"
+)
+
+
+def exported_classes(query_lines: Iterable) -> Set[str]:
+    """The chain classes the exported queries select, so Neptune holds them all."""
+    classes = set()
+    for line in query_lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        classes.update(
+            match["chain_class"] for match in EXPORTED_CLASS_REGEX.finditer(line)
+        )
+    return classes
+
+
+def chain_count_query(chain_class: str, named_graph: str = None) -> str:
+    # A single type pattern is answered from the type index, not a graph scan
+    dataset = f"FROM <{named_graph}>\n" if named_graph else ""
+    return (
+        f"PREFIX type: <{CHAIN_CLASSES}>\n"
+        f"SELECT (COUNT(?chain) AS ?count)\n{dataset}"
+        f"WHERE {{ ?chain a type:{chain_class} }}"
+    )
+
+
+@dataclass
+class ChainVerification:
+    expected: Dict[str, int] = field(default_factory=dict)
+    actual: Dict[str, int] = field(default_factory=dict)
+    # Neptune minus RDFox, only for the counts that differ
+    mismatches: Dict[str, int] = field(default_factory=dict)
+    time_in_seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def verified(self) -> bool:
+        return bool(self.actual) and not self.mismatches and not self.error
+
+    @property
+    def json(self):
+        as_dict = dict(self.__dict__)
+        as_dict["verified"] = self.verified
+        return as_dict
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        if not the_dict:
+            return cls()
+        the_dict = dict(the_dict)
+        the_dict.pop("verified", None)
+        return cls(**the_dict)
+
+
+class ChainVerifier:
+    """Compares the chain counts RDFox reported with the ones in Neptune.
+
+    Every chain class is counted by its own query and the queries run
+    concurrently. RDFox counts over its whole store while Neptune only gets
+    the answers of the exported queries, so a count is only checked when the
+    exported queries select all of its classes. Counts RDFox did not report
+    (-1) are not checked either.
+    """
+
+    def __init__(
+        self,
+        count: Callable[[str], Optional[int]],
+        named_graph: str = None,
+        exported_classes: Set[str] = frozenset(),
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self._count = count
+        self._named_graph = named_graph
+        self._exported_classes = exported_classes
+        self._max_workers = max_workers
+
+    def verify(self, inference_stats: InferenceStats) -> ChainVerification:
+        expected = {
+            name: getattr(inference_stats, name)
+            for name, chain_classes in CHAIN_COUNT_CLASSES.items()
+            if getattr(inference_stats, name) >= 0
+            and self._exported_classes.issuperset(chain_classes)
+        }
+        verification = ChainVerification(expected=expected)
+        if not expected:
+            return verification
+
+        queries = {
+            (name, chain_class): chain_count_query(chain_class, self._named_graph)
+            for name in expected
+            for chain_class in CHAIN_COUNT_CLASSES[name]
+        }
+        started = time.monotonic()
+        workers = min(self._max_workers, len(queries))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(self._count, query)
+                for key, query in queries.items()
+            }
+            counts = {key: future.result() or 0 for key, future in futures.items()}
+        verification.time_in_seconds = round(time.monotonic() - started, 3)
+
+        verification.actual = {
+            name: sum(
+                counts[(name, chain_class)] for chain_class in CHAIN_COUNT_CLASSES[name]
+            )
+            for name in expected
+        }
+        verification.mismatches = {
+            name: verification.actual[name] - expected[name]
+            for name in expected
+            if verification.actual[name] != expected[name]
+        }
+        return verification
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from pipeline_control.adapters.job_repository.job_repository import JobRepository
+from pipeline_control.adapters.kubernetes_objects.rdfox_job import RDFOX_CONTAINER_NAME
 from pipeline_control.adapters.neptune_loader.neptune_loader_factory import (
     NeptuneLoaderFactory,
 )
@@ -15,6 +16,10 @@ from pipeline_control.domain.inference_stat_processor.inference_stat_processor i
 from pipeline_control.domain.neptune_stat_processor.neptune_stat_processor import (
     NeptuneStatProcessor,
 )
+from pipeline_control.domain.parallelism_policy.parallelism_policy import (
+    ParallelismPolicy,
+)
+from pipeline_control.service_layer.eks_control.job_control import JobControl
 from pipeline_control.service_layer.eks_control.util.eks_client_factory import (
     KubernetesClientFactory,
 )
@@ -39,6 +44,41 @@ class InitiateBulkload(Command):
     neptune_loader_factory: NeptuneLoaderFactory
     source: str
     job_id: str
+    parallelism_policy: Optional[ParallelismPolicy] = None
+    # outputs up to this size are written with SPARQL INSERT DATA, 0 disables it
+    sparql_update_max_bytes: Optional[int] = None
+    # loads predicted to take longer are rerouted or rejected, 0 disables it
+    load_budget_seconds: Optional[int] = None
+
+
+@dataclass
+class DeduplicateTriples(Command):
+    job_repository: JobRepository
+    job_id: str
+    source: str
+    target: Optional[str] = None
+    shard_count: int = 4
+    triple_set_kind: str = "DISK"
+
+
+@dataclass
+class ConvertAnswers(Command):
+    job_repository: JobRepository
+    job_id: str
+    source: str
+    target: Optional[str] = None
+    output_format: str = "ntriples"
+    shard_bytes: int = 1024 * 1024 * 1024
+
+
+@dataclass
+class ComputeDelta(Command):
+    job_repository: JobRepository
+    neptune_loader_factory: NeptuneLoaderFactory
+    job_id: str
+    source: str
+    shard_count: int = 4
+    triples_per_update: int = 1000
 
 
 @dataclass
@@ -48,6 +88,8 @@ class CreateNewJob(Command):
     job_repository: JobRepository
     job_configuration_name: str
     api_client_factory: KubernetesClientFactory
+    # None follows RESOURCE_SIZING, VALIDATE or AUTOFILL
+    resource_sizing: Optional[str] = None
 
 
 @dataclass
@@ -55,9 +97,36 @@ class RefreshBulkload(Command):
     job_repository: JobRepository
     neptune_loader_factory: NeptuneLoaderFactory
     neptune_stat_processor: NeptuneStatProcessor
+    # None follows VERIFY_CHAIN_COUNTS
+    verify_chain_counts: Optional[bool] = None
+
+
+@dataclass
+class FollowInference(Command):
+    job_repository: JobRepository
+    job_control: JobControl
+    container: str = RDFOX_CONTAINER_NAME
+
+
+@dataclass
+class RetryFailedFeeds(Command):
+    job_repository: JobRepository
+    neptune_loader_factory: NeptuneLoaderFactory
+    job_id: str
 
 
 @dataclass
 class NotifyUser(Command):
     job_repository: JobRepository
     notifier: SNSNotifier
+
+
+@dataclass
+class PurgeJobGraph(Command):
+    job_repository: JobRepository
+    neptune_loader_factory: NeptuneLoaderFactory
+    job_id: str
+    triples_per_batch: Optional[int] = None
+    pause_in_seconds: Optional[float] = None
+    # purge a graph other jobs load into too
+    force: bool = False
@@ -0,0 +1,95 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from pipeline_control.domain.triple_deduplicator.triple_deduplicator import (
+    DIGEST_SIZE,
+    DiskTripleSet,
+    triple_digest,
+)
+
+READ_DIGESTS = 65536
+
+
+def write_index(triple_set: DiskTripleSet, fileobj: BinaryIO) -> int:
+    """Writes the sorted digests back to back, DIGEST_SIZE bytes each."""
+    written = 0
+    for digest in triple_set.iter_digests():
+        fileobj.write(digest)
+        written = written + 1
+    return written
+
+
+def read_index(fileobj: BinaryIO, directory: str = None) -> DiskTripleSet:
+    triple_set = DiskTripleSet(directory=directory)
+    chunk = fileobj.read(DIGEST_SIZE * READ_DIGESTS)
+    while chunk:
+        for start in range(0, len(chunk), DIGEST_SIZE):
+            triple_set.add_digest(chunk[start : start + DIGEST_SIZE])
+        chunk = fileobj.read(DIGEST_SIZE * READ_DIGESTS)
+    return triple_set
+
+
+class AdditionFilter:
+    """Triple set for TripleDeduplicator that only admits additions.
+
+    Every triple is recorded in the current index. It is passed on only if it
+    is new in this output and missing from the previous job's index.
+    """
+
+    def __init__(self, current: DiskTripleSet, previous: Optional[DiskTripleSet]):
+        self._current = current
+        self._previous = previous
+        self.unchanged = 0
+
+    def add(self, triple: bytes) -> bool:
+        digest = triple_digest(triple)
+        if not self._current.add_digest(digest):
+            return False
+        if self._previous is not None and self._previous.contains_digest(digest):
+            self.unchanged = self.unchanged + 1
+            return False
+        return True
+
+
+def iter_removals(
+    previous_lines: Iterable[bytes], current: DiskTripleSet, directory: str = None
+) -> Iterator[str]:
+    """Triples of the previous output that are not in the current index."""
+    removed = DiskTripleSet(directory=directory)
+    try:
+        for line in previous_lines:
+            triple = line.strip()
+            if not triple or triple.startswith(b"#"):
+                continue
+            digest = triple_digest(triple)
+            if current.contains_digest(digest) or not removed.add_digest(digest):
+                continue
+            yield triple.decode("utf-8")
+    finally:
+        removed.close()
+
+
+@dataclass
+class DeltaStats:
+    previous_job_id: Optional[str] = None
+    # the complete output of this job, the next delta reads its removals from here
+    output_source: str = ""
+    index: str = ""
+    additions_source: str = ""
+    additions: int = 0
+    unchanged: int = 0
+    removals: int = 0
+    removal_updates: int = 0
+    removals_update_file: str = ""
+    removals_done: bool = False
+
+    @property
+    def json(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(**the_dict) if the_dict else cls()
@@ -0,0 +1,113 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from pipeline_control.domain.inference_stat_processor.inference_stat_processor import (
+    InferenceLogParser,
+    InferenceStats,
+)
+
+"""This is what a line of the container log looks like with timestamps on
+2021-07-30T19:45:17.123456789Z Materializing rules.
+"""
+LOG_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+IMPORT_PHASE = "import"
+MATERIALIZATION_PHASE = "materialization"
+QUERY_PHASE = "query"
+DONE_PHASE = "done"
+# The line that starts each phase, in the order RDFox runs them
+PHASE_MARKERS = (
+    ("Adding data in", IMPORT_PHASE),
+    ("Materializing rules.", MATERIALIZATION_PHASE),
+    ("INFERENCETIME-", QUERY_PHASE),
+    ("end-running-counts", DONE_PHASE),
+)
+
+
+def parse_log_timestamp(timestamp: str) -> datetime:
+    # Kubernetes writes up to nanoseconds, datetime only keeps microseconds
+    seconds, _, fraction = timestamp.rstrip("Z").partition(".")
+    parsed = datetime.strptime(seconds, LOG_TIMESTAMP_FORMAT)
+    return parsed.replace(microsecond=int(fraction[:6].ljust(6, "0")))
+
+
+@dataclass
+class InferenceProgress:
+    phase: str = "N/A"
+    facts_processed: int = 0
+    elapsed_seconds: int = 0
+    # how long the current phase has been running, a materialisation that
+    # runs away shows up here while the job is still scheduled
+    phase_seconds: int = 0
+    time_stats: dict = field(default_factory=dict)
+    lines_read: int = 0
+    started: Optional[str] = None
+    phase_started: Optional[str] = None
+    last_timestamp: Optional[str] = None
+
+    @property
+    def stats(self) -> InferenceStats:
+        """The statistics known so far, the phase timings RDFox has printed."""
+        return InferenceStats(**self.time_stats)
+
+    @property
+    def json(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(**the_dict) if the_dict else cls()
+
+
+class InferenceProgressTracker:
+    """Feeds the new lines of a running job's log to the stat parser.
+
+    The progress carries over from one poll to the next on the job, so each
+    poll only hands in the lines logged since the last one. Lines at or
+    before the last timestamp read are skipped.
+    """
+
+    def __init__(self, progress: InferenceProgress):
+        self.progress = progress
+        self.parser = InferenceLogParser()
+        self._last_read = (
+            parse_log_timestamp(progress.last_timestamp)
+            if progress.last_timestamp
+            else None
+        )
+
+    def feed(self, timestamped_line):
+        if isinstance(timestamped_line, bytes):
+            timestamped_line = timestamped_line.decode("utf-8")
+        timestamp, _, line = timestamped_line.partition(" ")
+        if not timestamp:
+            return
+        if self._last_read and parse_log_timestamp(timestamp) <= self._last_read:
+            return
+        progress = self.progress
+        self.parser.feed(line)
+        for marker, phase in PHASE_MARKERS:
+            if line.startswith(marker) and progress.phase != phase:
+                progress.phase = phase
+                progress.phase_started = timestamp
+        progress.started = progress.started or timestamp
+        progress.last_timestamp = timestamp
+        progress.lines_read = progress.lines_read + 1
+
+    def finish(self, now: datetime) -> InferenceProgress:
+        progress = self.progress
+        progress.facts_processed = (
+            progress.facts_processed + self.parser.telemetry.facts_imported
+        )
+        progress.time_stats.update(self.parser.time_stats)
+        if progress.started:
+            started = parse_log_timestamp(progress.started)
+            progress.elapsed_seconds = int((now - started).total_seconds())
+        if progress.phase_started:
+            phase_started = parse_log_timestamp(progress.phase_started)
+            progress.phase_seconds = int((now - phase_started).total_seconds())
+        return progress
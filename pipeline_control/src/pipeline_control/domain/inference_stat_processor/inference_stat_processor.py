@@ -2,8 +2,14 @@
 # SPDX-License-Identifier: MIT-0
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Iterable, Optional
+
+from pipeline_control.domain.rdfox_telemetry.rdfox_telemetry import (
+    RDFoxTelemetry,
+    RDFoxTelemetryParser,
+)
 
 """ This is what it looks like in the log
 .............
@@ -173,69 +179,109 @@ class InferenceStats:
         return InferenceStats(**merged_attributes)
 
 
-@dataclass
-class InferenceStatProcessor:
-    inference_stats: str
+def parse_rdfox_tstamp_to_datetime(rdfox_tstamp: str) -> datetime:
+    return datetime.strptime(rdfox_tstamp, RDFOX_TSTAMP_FORMAT)
+
+
+def process_time_match_to_stat(match):
+    key = STAT_MAP[match[0]]
+    start_date = parse_rdfox_tstamp_to_datetime(match[1])
+    end_date = parse_rdfox_tstamp_to_datetime(match[2])
+    duration = (end_date - start_date).seconds
+    return {key: duration}
+
+
+class InferenceLogParser:
+    """Reads an RDFox log one line at a time and keeps only what the stats need.
+
+    Lines can be fed as they arrive, from an S3 body or a container log, and
+    only the matched values are held on to. The *TIME- lines, the info block
+    and the running counts are also kept in raw, as a compact stand-in for
+    the whole log. The phases of the job are collected in telemetry.
+    """
+
+    def __init__(self):
+        self.time_stats = {}
+        self.bytes_per_entry = []
+        self.aggregates = {}
+        self.chains = {}
+        self.raw_lines = []
+        self.telemetry_parser = RDFoxTelemetryParser()
+        self._previous_line = ""
+        self._in_block = False
+
+    def feed(self, line):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.replace("\r", "").rstrip("\n")
+        if line in ("---info---", "running-counts"):
+            self._in_block = True
+        keep = self._in_block
+        if line in ("---endinfo---", "end-running-counts"):
+            self._in_block = False
+
+        time_match = TIMESTAMP_REGEX.match(line)
+        if time_match:
+            self.time_stats.update(process_time_match_to_stat(time_match.groups()))
+            keep = True
+        self.bytes_per_entry.extend(BYTES_PER_ENTRY_REGEX.findall(line))
+        self.aggregates.update(AGGREGATE_NUMBER_OF_REGEX.findall(line))
+        chain_match = CHAIN_AMOUNT_REGEX.search(f"{self._previous_line}\n{line}")
+        if chain_match:
+            chain_type, amount = chain_match.groups()
+            self.chains[CHAIN_MAP[chain_type]] = int(amount)
+            # the running counts are not read from a query file
+            self.telemetry_parser.name_query(chain_type)
+        self.telemetry_parser.feed(line)
+        if keep:
+            self.raw_lines.append(line)
+        self._previous_line = line
 
-    def process_inference(self):
-        self.inference_stats = self.inference_stats.replace("\r", "")
-        time_stats_only = InferenceStats(**self.process_time_stats())
-        performance_stats_only = InferenceStats(**self.process_performance_stats())
-        final_stats = time_stats_only & performance_stats_only
-        return final_stats
-
-    def process_performance_stats(self):
-        triples_avg_size = self.parse_average_entry_size()
-        triples_input_amount, triples_materialised_amount = self.parse_aggregate_stats()
-        memory_usage = triples_materialised_amount * triples_avg_size
+    @property
+    def telemetry(self) -> RDFoxTelemetry:
+        return self.telemetry_parser.telemetry
+
+    @property
+    def raw(self) -> str:
+        return "\n".join(self.raw_lines)
+
+    def performance_stats(self):
+        if len(self.bytes_per_entry) != 1:
+            raise Exception("Not found BYTES_PER_ENTRY")
+        triples_avg_size = float(self.bytes_per_entry[0])
+        triples_input_amount = int(self.aggregates["EDB"].replace(",", ""))
+        triples_materialised_amount = int(self.aggregates["IDB"].replace(",", ""))
         result = {
             "triples_avg_size": triples_avg_size,
             "triples_input_amount": triples_input_amount,
             "triples_total_amount": triples_materialised_amount,
-            "memory_usage": memory_usage,
+            "memory_usage": triples_materialised_amount * triples_avg_size,
         }
-        partial_chains = self.parse_chains_amount()
-        result.update(partial_chains)
+        result.update(self.chains)
         return result
 
-    def parse_average_entry_size(self):
-        match = BYTES_PER_ENTRY_REGEX.findall(self.inference_stats)
-        if match and (len(match) == 1):
-            return float(match[0])
-        raise Exception("Not found BYTES_PER_ENTRY")
-
-    def parse_aggregate_stats(self):
-        matches = dict(AGGREGATE_NUMBER_OF_REGEX.findall(self.inference_stats))
-        triples_input_amount = int(matches["EDB"].replace(",", ""))
-        triples_materialised_amount = int(matches["IDB"].replace(",", ""))
-
-        return (triples_input_amount, triples_materialised_amount)
-
-    def process_time_stats(self):
-        inference_stats_dict = {}
-        time_matches = TIMESTAMP_REGEX.findall(self.inference_stats)
-        for match in time_matches:
-            element = self.process_time_match_to_stat(match)
-            inference_stats_dict.update(element)
-        return inference_stats_dict
-
-    def process_time_match_to_stat(self, match):
-        key = STAT_MAP[match[0]]
-        start_date = self.parse_rdfox_tstamp_to_datetime(match[1])
-        end_date = self.parse_rdfox_tstamp_to_datetime(match[2])
-        duration = (end_date - start_date).seconds
-        elem = {key: duration}
-        return elem
-
-    def parse_rdfox_tstamp_to_datetime(self, rdfox_tstamp: str) -> datetime.time:
-        return datetime.strptime(rdfox_tstamp, RDFOX_TSTAMP_FORMAT)
-
-    def parse_chains_amount(self):
-        result = {}
-        chain_matches = CHAIN_AMOUNT_REGEX.findall(self.inference_stats)
-        chain_map_keys = CHAIN_MAP.keys()
-        for match in chain_matches:
-            chain_type, amount = match
-            if chain_type in chain_map_keys:
-                result[CHAIN_MAP[chain_type]] = int(amount)
-        return result
+    def stats(self) -> InferenceStats:
+        time_stats_only = InferenceStats(**self.time_stats)
+        performance_stats_only = InferenceStats(**self.performance_stats())
+        return time_stats_only & performance_stats_only
+
+
+@dataclass
+class InferenceStatProcessor:
+    inference_stats: str
+    # log lines to parse instead of inference_stats, which then becomes the raw
+    # marker lines, so a large log never has to be held in memory
+    lines: Optional[Iterable] = None
+    telemetry: RDFoxTelemetry = field(default_factory=RDFoxTelemetry)
+
+    def process_inference(self):
+        parser = InferenceLogParser()
+        if self.lines is None:
+            for line in self.inference_stats.split("\n"):
+                parser.feed(line)
+        else:
+            for line in self.lines:
+                parser.feed(line)
+            self.inference_stats = parser.raw
+        self.telemetry = parser.telemetry
+        return parser.stats()
@@ -0,0 +1,150 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import statistics
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from pipeline_control.domain.parallelism_policy.parallelism_policy import (
+    PARALLELISM_LEVELS,
+)
+
+ACCEPT = "ACCEPT"
+REROUTE = "REROUTE"
+REJECT = "REJECT"
+
+BASIS_HISTORY = "history"
+BASIS_INSTANCE_HISTORY = "instance history"
+BASIS_DEFAULT = "default"
+
+
+@dataclass
+class LoadObservation:
+    """One finished bulk load, as recorded on a past job."""
+
+    instance_type: str
+    parallelism: str
+    records: int
+    seconds: int
+    source_bytes: Optional[int] = None
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds
+
+
+@dataclass
+class LoadEstimate:
+    instance_type: str = "N/A"
+    parallelism: str = "N/A"
+    source_objects: Optional[int] = None
+    source_bytes: Optional[int] = None
+    records_per_second: float = 0.0
+    bytes_per_record: float = 0.0
+    predicted_records: int = 0
+    predicted_seconds: int = 0
+    # where the rate came from: this writer and parallelism, this writer, or a default
+    basis: str = BASIS_DEFAULT
+    observations: int = 0
+    budget_seconds: int = 0
+    action: str = ACCEPT
+    rerouted_parallelism: Optional[str] = None
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def json(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(**the_dict) if the_dict else cls()
+
+
+@dataclass
+class LoadEstimator:
+    """Predicts how long a bulk load of a source will take from past loads.
+
+    The source size is turned into records with the bytes per record seen in
+    past loads, and records into seconds with the median rate of past loads on
+    the same writer class at the same parallelism. Without such loads it falls
+    back to any parallelism on the writer class, then to the defaults.
+    """
+
+    observations: List[LoadObservation] = field(default_factory=list)
+    default_records_per_second: float = 20000.0
+    default_bytes_per_record: float = 120.0
+
+    def rate(self, instance_type: str, parallelism: str):
+        """(records per second, basis, observations used)"""
+        on_instance = [o for o in self.observations if o.instance_type == instance_type]
+        matching = [o for o in on_instance if o.parallelism == parallelism]
+        for candidates, basis in (
+            (matching, BASIS_HISTORY),
+            (on_instance, BASIS_INSTANCE_HISTORY),
+        ):
+            if candidates:
+                rates = [o.records_per_second for o in candidates]
+                return statistics.median(rates), basis, len(candidates)
+        return self.default_records_per_second, BASIS_DEFAULT, 0
+
+    def bytes_per_record(self) -> float:
+        ratios = [
+            o.source_bytes / o.records for o in self.observations if o.source_bytes
+        ]
+        return statistics.median(ratios) if ratios else self.default_bytes_per_record
+
+    def estimate(
+        self,
+        instance_type: str,
+        parallelism: str,
+        source_objects: Optional[int],
+        source_bytes: int,
+    ) -> LoadEstimate:
+        records_per_second, basis, observations = self.rate(instance_type, parallelism)
+        bytes_per_record = self.bytes_per_record()
+        predicted_records = round(source_bytes / bytes_per_record)
+        return LoadEstimate(
+            instance_type=instance_type,
+            parallelism=parallelism,
+            source_objects=source_objects,
+            source_bytes=source_bytes,
+            records_per_second=round(records_per_second, 3),
+            bytes_per_record=round(bytes_per_record, 3),
+            predicted_records=predicted_records,
+            predicted_seconds=round(predicted_records / records_per_second),
+            basis=basis,
+            observations=observations,
+        )
+
+    def within_budget(self, estimate: LoadEstimate, budget_seconds: int):
+        """Accepts the estimate, reroutes it to a higher parallelism or rejects it.
+
+        A higher parallelism is only chosen when past loads at that level on
+        the same writer class predict a load inside the budget, a guess is
+        not enough to move a load off the level it was given.
+        """
+        estimate.budget_seconds = budget_seconds
+        if estimate.predicted_seconds <= budget_seconds:
+            estimate.action = ACCEPT
+            return estimate
+        estimate.reasons.append(
+            f"predicted {estimate.predicted_seconds}s over {budget_seconds}s"
+        )
+        levels = [level.value for level in PARALLELISM_LEVELS]
+        higher = (
+            levels[levels.index(estimate.parallelism) + 1 :]
+            if estimate.parallelism in levels
+            else []
+        )
+        for level in higher:
+            records_per_second, basis, _ = self.rate(estimate.instance_type, level)
+            if basis != BASIS_HISTORY:
+                continue
+            seconds = round(estimate.predicted_records / records_per_second)
+            if seconds <= budget_seconds:
+                estimate.action = REROUTE
+                estimate.rerouted_parallelism = level
+                estimate.reasons.append(f"{level} parallelism predicts {seconds}s")
+                return estimate
+        estimate.action = REJECT
+        return estimate
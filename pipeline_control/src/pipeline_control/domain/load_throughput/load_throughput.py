@@ -0,0 +1,124 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import math
+from dataclasses import dataclass, field
+from typing import List
+
+# Samples are [timestamp, total records, duplicates, errors], stored as lists
+# so a day of polling stays a few kilobytes on the job item
+TIMESTAMP, RECORDS, DUPLICATES, ERRORS = range(4)
+MAX_SAMPLES = 1000
+RECORDS_PER_LATENCY_UNIT = 1000000
+
+
+@dataclass
+class Stall:
+    start: float
+    end: float
+    total_records: int
+
+    @property
+    def duration_in_seconds(self) -> float:
+        return self.end - self.start
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    # nearest rank, so the result is always one of the observed values
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class LoadTimeSeries:
+    """Every status poll of a load as a compact sample.
+
+    When MAX_SAMPLES is reached every other sample between the first and the
+    last is dropped, so long loads keep their overall shape at a coarser step.
+    """
+
+    samples: List[list] = field(default_factory=list)
+
+    def add(self, timestamp: float, total_records: int, duplicates: int, errors: int):
+        self.samples.append([round(timestamp, 3), total_records, duplicates, errors])
+        if len(self.samples) > MAX_SAMPLES:
+            self.samples = (
+                self.samples[:1] + self.samples[1:-1][1::2] + self.samples[-1:]
+            )
+
+    def intervals(self) -> List[tuple]:
+        """(seconds, records) between consecutive samples."""
+        return [
+            (later[TIMESTAMP] - earlier[TIMESTAMP], later[RECORDS] - earlier[RECORDS])
+            for earlier, later in zip(self.samples, self.samples[1:])
+            if later[TIMESTAMP] > earlier[TIMESTAMP]
+        ]
+
+    def rates(self) -> List[float]:
+        return [records / seconds for seconds, records in self.intervals()]
+
+    @property
+    def records_per_second(self) -> float:
+        if len(self.samples) < 2:
+            return 0.0
+        first, last = self.samples[0], self.samples[-1]
+        seconds = last[TIMESTAMP] - first[TIMESTAMP]
+        return (last[RECORDS] - first[RECORDS]) / seconds if seconds > 0 else 0.0
+
+    @property
+    def peak_records_per_second(self) -> float:
+        return max(self.rates(), default=0.0)
+
+    def stalls(self, minimum_seconds: float = 0.0) -> List[Stall]:
+        """Stretches of consecutive polls in which no record was added."""
+        stalls = []
+        start = None
+        for earlier, later in zip(self.samples, self.samples[1:]):
+            if later[RECORDS] == earlier[RECORDS]:
+                start = earlier if start is None else start
+                continue
+            if start is not None:
+                stalls.append(
+                    Stall(start[TIMESTAMP], earlier[TIMESTAMP], earlier[RECORDS])
+                )
+                start = None
+        if start is not None:
+            last = self.samples[-1]
+            stalls.append(Stall(start[TIMESTAMP], last[TIMESTAMP], last[RECORDS]))
+        return [
+            stall for stall in stalls if stall.duration_in_seconds >= minimum_seconds
+        ]
+
+    def latency(self, fraction: float) -> float:
+        """Seconds per million records of the interval at this percentile.
+
+        A high fraction picks out the slowest stretches of the load, stalled
+        intervals count as infinitely slow.
+        """
+        latencies = [
+            seconds * RECORDS_PER_LATENCY_UNIT / records if records > 0 else math.inf
+            for seconds, records in self.intervals()
+        ]
+        return percentile(latencies, fraction) if latencies else 0.0
+
+    def summary(self) -> dict:
+        stalls = self.stalls()
+        return {
+            "samples": len(self.samples),
+            "recordsPerSecond": round(self.records_per_second, 3),
+            "peakRecordsPerSecond": round(self.peak_records_per_second, 3),
+            "stalls": len(stalls),
+            "stalledSeconds": round(sum(s.duration_in_seconds for s in stalls), 3),
+            "p50SecondsPerMillionRecords": self.latency(0.5),
+            "p95SecondsPerMillionRecords": self.latency(0.95),
+            "p99SecondsPerMillionRecords": self.latency(0.99),
+        }
+
+    @property
+    def json(self):
+        return {"samples": self.samples}
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(samples=list(the_dict["samples"])) if the_dict else cls()
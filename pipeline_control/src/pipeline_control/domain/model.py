@@ -4,13 +4,32 @@
 import datetime
 from enum import Enum
 
+from neptune_load.bulk_loader.load_errors import LoadErrorSummary
+from neptune_load.graph_purger.graph_purger import PurgeProgress
+
 from pipeline_control.adapters.kubernetes_objects.rdfox_job import RDFoxJobConfiguration
+from pipeline_control.domain.answer_converter.answer_converter import ConversionStats
+from pipeline_control.domain.chain_verifier.chain_verifier import ChainVerification
+from pipeline_control.domain.delta_index.delta_index import DeltaStats
+from pipeline_control.domain.inference_progress.inference_progress import (
+    InferenceProgress,
+)
 from pipeline_control.domain.inference_stat_processor.inference_stat_processor import (
     InferenceStats,
 )
+from pipeline_control.domain.load_estimator.load_estimator import LoadEstimate
+from pipeline_control.domain.load_throughput.load_throughput import LoadTimeSeries
 from pipeline_control.domain.neptune_stat_processor.neptune_stat_processor import (
     NeptuneStats,
 )
+from pipeline_control.domain.parallelism_policy.parallelism_policy import (
+    ParallelismDecision,
+)
+from pipeline_control.domain.rdfox_telemetry.rdfox_telemetry import RDFoxTelemetry
+from pipeline_control.domain.resource_predictor.resource_predictor import (
+    ResourceEstimate,
+)
+from pipeline_control.domain.triple_deduplicator.triple_deduplicator import DedupStats
 
 
 class JobStatus(Enum):
@@ -23,6 +42,7 @@ class JobStatus(Enum):
     NEPTUNE_LOAD_NOT_STARTED = "NEPTUNE_LOAD_NOT_STARTED"
     NEPTUNE_LOAD_IN_PROGRESS = "NEPTUNE_LOAD_IN_PROGRESS"
     NEPTUNE_LOAD_COMPLETED = "NEPTUNE_LOAD_COMPLETED"
+    NEPTUNE_GRAPH_PURGED = "NEPTUNE_GRAPH_PURGED"
     NEPTUNE_LOAD_CANCELLED_BY_USER = "NEPTUNE_LOAD_CANCELLED_BY_USER"
     NEPTUNE_LOAD_CANCELLED_DUE_TO_ERRORS = "NEPTUNE_LOAD_CANCELLED_DUE_TO_ERRORS"
     NEPTUNE_LOAD_UNEXPECTED_ERROR = "NEPTUNE_LOAD_UNEXPECTED_ERROR"
@@ -41,6 +61,7 @@ class JobStatus(Enum):
     )
     NEPTUNE_LOAD_IN_QUEUE = "NEPTUNE_LOAD_IN_QUEUE"
     NEPTUNE_LOAD_FAILED_INVALID_REQUEST = "NEPTUNE_LOAD_FAILED_INVALID_REQUEST"
+    NEPTUNE_LOAD_REJECTED = "NEPTUNE_LOAD_REJECTED"
     SUCCESS_NOTIFICATION_SENT = "SUCCESS_NOTIFICATION_SENT"
     ERROR_NOTIFICATION_SENT = "ERROR_NOTIFICATION_SENT"
 
@@ -66,6 +87,22 @@ class Job:
         kubernetes_name: str = "N/A",
         kubernetes_worker_type: str = "N/A",
         neptune_writer_instance: str = "N/A",
+        neptune_load_errors: LoadErrorSummary = LoadErrorSummary(),
+        neptune_succeeded_feeds: list = [],
+        neptune_retry_load_ids: dict = {},
+        neptune_shard_loads: list = [],
+        neptune_shard_progress: dict = {},
+        neptune_parallelism_decision: ParallelismDecision = ParallelismDecision(),
+        triple_dedup_statistics: DedupStats = DedupStats(),
+        delta_statistics: DeltaStats = DeltaStats(),
+        chain_verification: ChainVerification = ChainVerification(),
+        graph_purge: PurgeProgress = PurgeProgress(),
+        neptune_throughput: LoadTimeSeries = None,
+        neptune_load_estimate: LoadEstimate = LoadEstimate(),
+        answer_conversion: ConversionStats = ConversionStats(),
+        rdfox_telemetry: RDFoxTelemetry = RDFoxTelemetry(),
+        inference_progress: InferenceProgress = None,
+        resource_estimate: ResourceEstimate = ResourceEstimate(),
     ):
         if not job_status:
             job_status = JobStatus.PRE_CREATE
@@ -85,6 +122,24 @@ class Job:
         self.neptune_statistics = neptune_statistics
         self.neptune_writer_instance = neptune_writer_instance
         self.kubernetes_worker_type = kubernetes_worker_type
+        self.neptune_load_errors = neptune_load_errors
+        self.neptune_succeeded_feeds = neptune_succeeded_feeds
+        self.neptune_retry_load_ids = neptune_retry_load_ids
+        self.neptune_shard_loads = neptune_shard_loads
+        self.neptune_shard_progress = neptune_shard_progress
+        self.neptune_parallelism_decision = neptune_parallelism_decision
+        self.triple_dedup_statistics = triple_dedup_statistics
+        self.delta_statistics = delta_statistics
+        self.chain_verification = chain_verification
+        self.graph_purge = graph_purge
+        # samples are appended in place, so every job gets its own series
+        self.neptune_throughput = neptune_throughput or LoadTimeSeries()
+        self.neptune_load_estimate = neptune_load_estimate
+        self.answer_conversion = answer_conversion
+        self.rdfox_telemetry = rdfox_telemetry
+        # updated in place from poll to poll, like the throughput series
+        self.inference_progress = inference_progress or InferenceProgress()
+        self.resource_estimate = resource_estimate
 
     @property
     def is_dirty(self):
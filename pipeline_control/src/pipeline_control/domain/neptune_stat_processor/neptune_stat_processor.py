@@ -3,6 +3,7 @@
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Dict
 
 
 @dataclass
@@ -59,6 +60,28 @@ class NeptuneStatProcessor:
         )
         return NeptuneStats(**result_dict)
 
+    def aggregate_shards(self, stat_dicts: Dict[str, dict]) -> dict:
+        loads = {}
+        status_counts = {}
+        for load_id, stat_dict in stat_dicts.items():
+            overall_status = stat_dict["payload"]["overallStatus"]
+            loads[load_id] = {
+                "status": overall_status["status"],
+                "totalRecords": overall_status["totalRecords"],
+                "totalTimeSpent": overall_status["totalTimeSpent"],
+            }
+            status = overall_status["status"]
+            status_counts[status] = status_counts.get(status, 0) + 1
+        completed_loads = status_counts.get("LOAD_COMPLETED", 0)
+        return {
+            "loads": loads,
+            "loadCount": len(loads),
+            "completedLoads": completed_loads,
+            "completedFraction": completed_loads / len(loads) if loads else 0,
+            "totalRecords": sum(load["totalRecords"] for load in loads.values()),
+            "statusCounts": status_counts,
+        }
+
     # TODO: Ideally we just don't even scan rdfox.log but right now we do and this causes overall failure
     def adjust_failed_status_for_rdfox_log(
         self,
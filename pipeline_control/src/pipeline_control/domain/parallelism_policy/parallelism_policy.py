@@ -0,0 +1,107 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from pipeline_control.adapters.neptune_loader.neptune_loader_configuration import (
+    NeptuneParallelism,
+)
+
+# LOW uses one thread, MEDIUM half the vCPUs, HIGH all of them, OVERSUBSCRIBE twice
+PARALLELISM_LEVELS = [
+    NeptuneParallelism.LOW,
+    NeptuneParallelism.MEDIUM,
+    NeptuneParallelism.HIGH,
+    NeptuneParallelism.OVERSUBSCRIBE,
+]
+
+SIZE_VCPUS = {"small": 1, "medium": 2, "large": 2, "xlarge": 4}
+
+
+def vcpus_for_instance_class(instance_class: str) -> Optional[int]:
+    size = instance_class.split(".")[-1] if instance_class else ""
+    if size in SIZE_VCPUS:
+        return SIZE_VCPUS[size]
+    multiple = re.fullmatch(r"(\d+)xlarge", size)
+    if multiple:
+        return int(multiple.group(1)) * SIZE_VCPUS["xlarge"]
+    return None
+
+
+@dataclass
+class ParallelismDecision:
+    parallelism: str = "N/A"
+    queue_request: bool = False
+    instance_type: str = "N/A"
+    vcpus: Optional[int] = None
+    active_loads: int = 0
+    source_objects: Optional[int] = None
+    source_bytes: Optional[int] = None
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def json(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(**the_dict) if the_dict else cls()
+
+
+@dataclass
+class ParallelismPolicy:
+    small_writer_vcpus: int = 2
+    medium_writer_vcpus: int = 8
+    small_source_bytes: int = 64 * 1024 * 1024
+
+    def decide(
+        self,
+        instance_type: str,
+        active_loads: int,
+        source_objects: Optional[int],
+        source_bytes: Optional[int],
+        queue_request: bool = False,
+    ) -> ParallelismDecision:
+        vcpus = vcpus_for_instance_class(instance_type)
+        reasons = []
+        if vcpus is None:
+            level = NeptuneParallelism.MEDIUM
+            reasons.append(f"unknown writer class {instance_type}")
+        elif vcpus <= self.small_writer_vcpus:
+            # Leave the few cores of a small writer to query traffic
+            level = NeptuneParallelism.LOW
+            reasons.append(f"small writer with {vcpus} vCPUs")
+        elif vcpus <= self.medium_writer_vcpus:
+            level = NeptuneParallelism.MEDIUM
+            reasons.append(f"medium writer with {vcpus} vCPUs")
+        else:
+            level = NeptuneParallelism.OVERSUBSCRIBE
+            reasons.append(f"large writer with {vcpus} vCPUs")
+
+        if source_bytes is not None and source_bytes < self.small_source_bytes:
+            capped = min(
+                PARALLELISM_LEVELS.index(level),
+                PARALLELISM_LEVELS.index(NeptuneParallelism.MEDIUM),
+            )
+            level = PARALLELISM_LEVELS[capped]
+            reasons.append(f"small source of {source_bytes} bytes")
+        if source_objects == 0:
+            reasons.append("no objects found under the source")
+
+        if active_loads:
+            # Neptune runs one load at a time, a second request is rejected unless queued
+            queue_request = True
+            reasons.append(f"{active_loads} active loads, queueing")
+
+        return ParallelismDecision(
+            parallelism=level.value,
+            queue_request=bool(queue_request),
+            instance_type=instance_type,
+            vcpus=vcpus,
+            active_loads=active_loads,
+            source_objects=source_objects,
+            source_bytes=source_bytes,
+            reasons=reasons,
+        )
@@ -0,0 +1,254 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+"""This is what it looks like in the log
+Adding data in file '/data/exited-chains.dlog'.
+Import operation took 0.008 s.
+Processed 4 rules, of which 4 were updated.
+Adding data in 305 files.
+Import operation took 250 s.
+Processed 655822120 facts, of which 510506725 were updated.
+LOADTIME-30-Jul-2021 19:41:03|30-Jul-2021 19:45:17
+Materializing rules.
+Rules will be processed by strata.
+Materialization time:      1617.16 s.
+-------------------------------------------------------------------------------
+Table                                            |  Entries  |  EDB  |  IDB
+-------------------------------------------------------------------------------
+http://oxfordsemantic.tech/RDFox#DefaultTriples  |  510,584,321 -> 787,840,001  |  0 -> 510,506,725  |  0 -> 787,421,291
+-------------------------------------------------------------------------------
+...
+Answering query from file:   /data/extract1.rq
+Number of returned tuples:   15157104
+Total number of answers:     15157104
+Total statement evaluation time: 35.3 s
+"""
+SECONDS_REGEX = "[0-9.eE+-]+"
+COUNT_REGEX = "[0-9,]+"
+IMPORT_START_REGEX = re.compile(
+    r"^Adding data in (?:file '(?P<file>[^']*)'|(?P<files>[0-9]+) files)"
+)
+IMPORT_TIME_REGEX = re.compile(
+    fr"^Import operation took (?P<seconds>{SECONDS_REGEX}) s"
+)
+PROCESSED_REGEX = re.compile(
+    r"^Processed (?P<processed>[0-9]+) (?P<kind>[a-z]+),"
+    r" of which (?P<updated>[0-9]+) were updated"
+)
+MATERIALIZATION_REGEX = re.compile(
+    fr"^Materialization time:\s*(?P<seconds>{SECONDS_REGEX}) s"
+)
+TRANSITION_REGEX = (
+    fr"\s*(?P<{{0}}_before>{COUNT_REGEX}) -> (?P<{{0}}_after>{COUNT_REGEX})\s*"
+)
+TABLE_ROW_REGEX = re.compile(
+    r"^(?P<table>\S+)\s*\|"
+    + TRANSITION_REGEX.format("entries")
+    + r"\|"
+    + TRANSITION_REGEX.format("edb")
+    + r"\|"
+    + TRANSITION_REGEX.format("idb")
+    + "$"
+)
+QUERY_FILE_REGEX = re.compile(r"^Answering query from file:\s*(?P<file>\S+)")
+ANSWER_FORMAT_REGEX = re.compile(r'^query\.answer-format = "(?P<format>[^"]+)"')
+ANSWERS_REGEX = re.compile(r"^Total number of answers:\s*(?P<answers>[0-9]+)")
+EVALUATION_TIME_REGEX = re.compile(
+    fr"^Total statement evaluation time:\s*(?P<seconds>{SECONDS_REGEX}) s"
+)
+
+# Rows are stored as lists, like the load throughput samples, so a job with
+# hundreds of imports and queries stays small on the job item
+# imports: [source, files, seconds, kind, processed, updated]
+SOURCE, FILES, IMPORT_SECONDS, KIND, PROCESSED, UPDATED = range(6)
+# tables: [table, entries before, after, EDB before, after, IDB before, after]
+TABLE, ENTRIES_BEFORE, ENTRIES_AFTER = range(3)
+EDB_BEFORE, EDB_AFTER, IDB_BEFORE, IDB_AFTER = range(3, 7)
+# queries: [query, answer format, answers, seconds]
+QUERY, ANSWER_FORMAT, ANSWERS, QUERY_SECONDS = range(4)
+
+IMPORT_BOUND = "import"
+REASONING_BOUND = "reasoning"
+QUERY_BOUND = "query"
+
+
+def count(value: str) -> int:
+    return int(value.replace(",", ""))
+
+
+def ratio(amount: float, per: float) -> float:
+    return round(amount / per, 3) if per else 0.0
+
+
+@dataclass
+class RDFoxTelemetry:
+    """Where an RDFox job spent its time, phase by phase.
+
+    Every import operation, every materialisation with the table changes it
+    made and every query evaluation, so a slow job can be told apart as
+    import-, reasoning- or query-bound.
+    """
+
+    imports: List[list] = field(default_factory=list)
+    # seconds of every materialisation, in the order they ran
+    materializations: List[float] = field(default_factory=list)
+    tables: List[list] = field(default_factory=list)
+    queries: List[list] = field(default_factory=list)
+
+    @property
+    def import_seconds(self) -> float:
+        return sum(row[IMPORT_SECONDS] for row in self.imports)
+
+    @property
+    def materialization_seconds(self) -> float:
+        return sum(self.materializations)
+
+    @property
+    def query_seconds(self) -> float:
+        return sum(row[QUERY_SECONDS] for row in self.queries)
+
+    @property
+    def facts_imported(self) -> int:
+        return sum(row[PROCESSED] for row in self.imports if row[KIND] == "facts")
+
+    @property
+    def facts_derived(self) -> int:
+        return sum(row[IDB_AFTER] - row[IDB_BEFORE] for row in self.tables)
+
+    def import_rates(self) -> List[dict]:
+        """Items per second and seconds per file of every import operation."""
+        return [
+            {
+                "source": row[SOURCE],
+                "kind": row[KIND],
+                "itemsPerSecond": ratio(row[PROCESSED], row[IMPORT_SECONDS]),
+                "secondsPerFile": ratio(row[IMPORT_SECONDS], row[FILES]),
+            }
+            for row in self.imports
+        ]
+
+    @property
+    def bound(self) -> str:
+        """The phase the job spent the most time in, N/A without any timings."""
+        phases = {
+            IMPORT_BOUND: self.import_seconds,
+            REASONING_BOUND: self.materialization_seconds,
+            QUERY_BOUND: self.query_seconds,
+        }
+        slowest = max(phases, key=phases.get)
+        return slowest if phases[slowest] > 0 else "N/A"
+
+    def summary(self) -> dict:
+        return {
+            "bound": self.bound,
+            "imports": len(self.imports),
+            "importSeconds": round(self.import_seconds, 3),
+            "factsImported": self.facts_imported,
+            "materializations": len(self.materializations),
+            "materializationSeconds": round(self.materialization_seconds, 3),
+            "factsDerived": self.facts_derived,
+            "queries": len(self.queries),
+            "querySeconds": round(self.query_seconds, 3),
+            "answers": sum(row[ANSWERS] for row in self.queries),
+        }
+
+    @property
+    def json(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(**the_dict) if the_dict else cls()
+
+
+class RDFoxTelemetryParser:
+    """Builds the telemetry of a job from its log, one line at a time.
+
+    An import or a query is only recorded once its timing line is seen. Lines
+    before it fill in what they can, so a log cut off at the start still
+    records the timings it has, with N/A for the source or query.
+    """
+
+    def __init__(self):
+        self.telemetry = RDFoxTelemetry()
+        self._import: Optional[list] = None
+        self._query: Optional[str] = None
+        self._answer_format = "N/A"
+        self._answers = 0
+
+    def feed(self, line: str):
+        match = IMPORT_START_REGEX.match(line)
+        if match:
+            files = int(match["files"]) if match["files"] else 1
+            source = match["file"] or f"{files} files"
+            self._import = [source, files, 0.0, "N/A", 0, 0]
+            return
+        match = IMPORT_TIME_REGEX.match(line)
+        if match:
+            row = self._import or ["N/A", 0, 0.0, "N/A", 0, 0]
+            row[IMPORT_SECONDS] = float(match["seconds"])
+            self.telemetry.imports.append(row)
+            self._import = None
+            return
+        match = PROCESSED_REGEX.match(line)
+        if match and self.telemetry.imports:
+            # RDFox reports the counts right after the time of the same import
+            row = self.telemetry.imports[-1]
+            row[KIND] = match["kind"]
+            row[PROCESSED] = int(match["processed"])
+            row[UPDATED] = int(match["updated"])
+            return
+        match = MATERIALIZATION_REGEX.match(line)
+        if match:
+            self.telemetry.materializations.append(float(match["seconds"]))
+            return
+        match = TABLE_ROW_REGEX.match(line)
+        if match:
+            self.telemetry.tables.append(
+                [
+                    match["table"],
+                    count(match["entries_before"]),
+                    count(match["entries_after"]),
+                    count(match["edb_before"]),
+                    count(match["edb_after"]),
+                    count(match["idb_before"]),
+                    count(match["idb_after"]),
+                ]
+            )
+            return
+        self._feed_query(line)
+
+    def name_query(self, name: str):
+        """Names the next query when the log has no file for it."""
+        if self._query is None:
+            self._query = name
+
+    def _feed_query(self, line: str):
+        match = QUERY_FILE_REGEX.match(line)
+        if match:
+            self._query = match["file"]
+            return
+        match = ANSWER_FORMAT_REGEX.match(line)
+        if match:
+            self._answer_format = match["format"]
+            return
+        match = ANSWERS_REGEX.match(line)
+        if match:
+            self._answers = int(match["answers"])
+            return
+        match = EVALUATION_TIME_REGEX.match(line)
+        if match:
+            self.telemetry.queries.append(
+                [
+                    self._query or "N/A",
+                    self._answer_format,
+                    self._answers,
+                    float(match["seconds"]),
+                ]
+            )
+            self._query = None
+            self._answers = 0
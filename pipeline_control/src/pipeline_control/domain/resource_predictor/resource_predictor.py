@@ -0,0 +1,193 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import math
+import re
+import statistics
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+ACCEPT = "ACCEPT"
+UNDERSIZED = "UNDERSIZED"
+OVERSIZED = "OVERSIZED"
+AUTOFILLED = "AUTOFILLED"
+NO_HISTORY = "NO_HISTORY"
+
+# VALIDATE only records the estimate, AUTOFILL also sets the resources
+AUTOFILL = "AUTOFILL"
+
+BASIS_RULES_HISTORY = "rules history"
+BASIS_HISTORY = "history"
+
+# A request this many times the prediction leaves most of the node idle
+OVERSIZED_FACTOR = 2
+GIBIBYTE = 1024 ** 3
+QUANTITY_REGEX = re.compile(r"^(?P<amount>[0-9.]+)\s*(?P<unit>[KMGTE]i?)?$")
+QUANTITY_UNITS = {
+    "K": 1000,
+    "M": 1000 ** 2,
+    "G": 1000 ** 3,
+    "T": 1000 ** 4,
+    "E": 1000 ** 6,
+    "Ki": 1024,
+    "Mi": 1024 ** 2,
+    "Gi": 1024 ** 3,
+    "Ti": 1024 ** 4,
+    "Ei": 1024 ** 6,
+}
+
+
+def quantity_to_bytes(quantity) -> int:
+    """Bytes of a Kubernetes memory quantity such as 2Gi, 512M or 2048."""
+    match = QUANTITY_REGEX.match(str(quantity).strip())
+    if not match:
+        raise ValueError(f"Not a memory quantity {quantity}")
+    unit = QUANTITY_UNITS[match["unit"]] if match["unit"] else 1
+    return round(float(match["amount"]) * unit)
+
+
+def bytes_to_quantity(amount: int) -> str:
+    # whole gibibytes, rounded up so the request never falls below the amount
+    return f"{max(1, math.ceil(amount / GIBIBYTE))}Gi"
+
+
+@dataclass
+class ResourceObservation:
+    """One finished RDFox job, its input and what the run took."""
+
+    rules_digest: str
+    input_bytes: int
+    cores: int
+    memory_usage: float
+    facts_total: int
+    seconds: int
+
+    @property
+    def memory_per_input_byte(self) -> float:
+        return self.memory_usage / self.input_bytes
+
+    @property
+    def input_bytes_per_second(self) -> float:
+        return self.input_bytes / self.seconds
+
+
+@dataclass
+class ResourceEstimate:
+    input_bytes: int = 0
+    input_objects: int = 0
+    rules_digest: str = "N/A"
+    predicted_facts: int = 0
+    predicted_memory_bytes: int = 0
+    predicted_cores: int = 0
+    requested_memory: str = "N/A"
+    requested_cores: int = 0
+    # jobs with these rules, any past jobs, or none
+    basis: str = "N/A"
+    observations: int = 0
+    action: str = NO_HISTORY
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def json(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        return cls(**the_dict) if the_dict else cls()
+
+
+@dataclass
+class ResourcePredictor:
+    """Predicts the peak memory and the core count of an RDFox job.
+
+    Memory scales with the input, so the prediction is the input size times
+    the highest memory per input byte seen in past jobs with the same rules,
+    or in any past job when these rules have not run before. The highest
+    ratio is used because an undersized pod is OOMKilled hours into a run.
+    The core count is the smallest one that came within throughput_tolerance
+    of the best median input throughput, more cores than that are waste.
+    """
+
+    observations: List[ResourceObservation] = field(default_factory=list)
+    headroom: float = 1.25
+    throughput_tolerance: float = 0.9
+
+    def relevant(self, rules_digest: str):
+        """(observations, basis) to predict from."""
+        same_rules = [o for o in self.observations if o.rules_digest == rules_digest]
+        if same_rules:
+            return same_rules, BASIS_RULES_HISTORY
+        return self.observations, BASIS_HISTORY
+
+    def best_cores(self, observations: List[ResourceObservation]) -> Optional[int]:
+        by_cores = {}
+        for observation in observations:
+            by_cores.setdefault(observation.cores, []).append(
+                observation.input_bytes_per_second
+            )
+        if not by_cores:
+            return None
+        throughputs = {
+            cores: statistics.median(rates) for cores, rates in by_cores.items()
+        }
+        best = max(throughputs.values())
+        return min(
+            cores
+            for cores, throughput in throughputs.items()
+            if throughput >= best * self.throughput_tolerance
+        )
+
+    def estimate(
+        self,
+        rules_digest: str,
+        input_bytes: int,
+        input_objects: int,
+        requested_memory,
+        requested_cores: int,
+    ) -> ResourceEstimate:
+        estimate = ResourceEstimate(
+            input_bytes=input_bytes,
+            input_objects=input_objects,
+            rules_digest=rules_digest,
+            requested_memory=str(requested_memory),
+            requested_cores=requested_cores,
+        )
+        observations, basis = self.relevant(rules_digest)
+        if not observations:
+            return estimate
+        memory_ratio = max(o.memory_per_input_byte for o in observations)
+        facts_ratio = statistics.median(
+            o.facts_total / o.input_bytes for o in observations
+        )
+        estimate.predicted_memory_bytes = math.ceil(
+            input_bytes * memory_ratio * self.headroom
+        )
+        estimate.predicted_facts = round(input_bytes * facts_ratio)
+        estimate.predicted_cores = self.best_cores(observations)
+        estimate.basis = basis
+        estimate.observations = len(observations)
+        return estimate
+
+    def validate(self, estimate: ResourceEstimate) -> ResourceEstimate:
+        """Compares the requested resources with the prediction."""
+        if not estimate.observations:
+            estimate.action = NO_HISTORY
+            return estimate
+        requested = estimate.requested_memory
+        requested_bytes = quantity_to_bytes(requested)
+        predicted_bytes = estimate.predicted_memory_bytes
+        predicted = bytes_to_quantity(predicted_bytes)
+        estimate.action = ACCEPT
+        if requested_bytes < predicted_bytes:
+            estimate.action = UNDERSIZED
+            estimate.reasons.append(f"requested {requested} below {predicted}")
+        elif requested_bytes > predicted_bytes * OVERSIZED_FACTOR:
+            estimate.action = OVERSIZED
+            estimate.reasons.append(
+                f"requested {requested} over {OVERSIZED_FACTOR} times {predicted}"
+            )
+        if estimate.requested_cores != estimate.predicted_cores:
+            estimate.reasons.append(
+                f"{estimate.predicted_cores} cores performed best, not {estimate.requested_cores}"
+            )
+        return estimate
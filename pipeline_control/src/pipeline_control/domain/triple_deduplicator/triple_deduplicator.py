@@ -0,0 +1,185 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import hashlib
+import heapq
+import math
+import os
+import sqlite3
+import tempfile
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import BinaryIO, Iterable, Iterator, List
+
+DIGEST_SIZE = 16
+DISK_SET_COMMIT_EVERY = 100000
+DEFAULT_FALSE_POSITIVE_RATE = 1e-9
+# RDFox writes roughly this many bytes per N-Triples line, used to size a filter
+ESTIMATED_BYTES_PER_TRIPLE = 160
+
+
+class TripleSetKind(Enum):
+    DISK = "DISK"
+    BLOOM = "BLOOM"
+
+
+def triple_digest(triple: bytes) -> bytes:
+    return hashlib.blake2b(triple, digest_size=DIGEST_SIZE).digest()
+
+
+class DiskTripleSet:
+    """Exact set of triple digests kept in a throwaway sqlite file."""
+
+    def __init__(self, directory: str = None):
+        handle, self._path = tempfile.mkstemp(suffix=".sqlite", dir=directory)
+        os.close(handle)
+        self._connection = sqlite3.connect(self._path)
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(
+            "CREATE TABLE seen (digest BLOB PRIMARY KEY) WITHOUT ROWID"
+        )
+        self._pending = 0
+
+    def add(self, triple: bytes) -> bool:
+        return self.add_digest(triple_digest(triple))
+
+    def add_digest(self, digest: bytes) -> bool:
+        cursor = self._connection.execute(
+            "INSERT OR IGNORE INTO seen VALUES (?)", (digest,)
+        )
+        self._pending = self._pending + 1
+        if self._pending >= DISK_SET_COMMIT_EVERY:
+            self._connection.commit()
+            self._pending = 0
+        return cursor.rowcount == 1
+
+    def contains_digest(self, digest: bytes) -> bool:
+        cursor = self._connection.execute(
+            "SELECT 1 FROM seen WHERE digest = ?", (digest,)
+        )
+        return cursor.fetchone() is not None
+
+    def iter_digests(self) -> Iterator[bytes]:
+        for (digest,) in self._connection.execute(
+            "SELECT digest FROM seen ORDER BY digest"
+        ):
+            yield digest
+
+    def close(self):
+        self._connection.close()
+        os.remove(self._path)
+
+
+class BloomTripleSet:
+    """Fixed-size Bloom filter over triple digests.
+
+    Memory does not grow with the data, but a new triple is taken for a
+    duplicate, and dropped, with probability false_positive_rate.
+    """
+
+    def __init__(
+        self,
+        expected_items: int,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ):
+        expected_items = max(expected_items, 1)
+        self._bit_count = max(
+            8,
+            math.ceil(
+                -expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)
+            ),
+        )
+        self._hash_count = max(1, round(self._bit_count / expected_items * math.log(2)))
+        self._bits = bytearray((self._bit_count + 7) // 8)
+
+    def add(self, triple: bytes) -> bool:
+        digest = triple_digest(triple)
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        bits, bit_count, is_new = self._bits, self._bit_count, False
+        for index in range(self._hash_count):
+            position = (first + index * second) % bit_count
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                is_new = True
+        return is_new
+
+    def close(self):
+        self._bits = bytearray()
+
+
+def make_triple_set(
+    kind: TripleSetKind, expected_bytes: int = 0, directory: str = None
+):
+    if kind == TripleSetKind.BLOOM:
+        return BloomTripleSet(
+            expected_items=expected_bytes // ESTIMATED_BYTES_PER_TRIPLE
+        )
+    return DiskTripleSet(directory=directory)
+
+
+@dataclass
+class DedupStats:
+    input_triples: int = 0
+    unique_triples: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    set_kind: str = "N/A"
+    shards: List[str] = field(default_factory=list)
+
+    @property
+    def duplicates(self) -> int:
+        return self.input_triples - self.unique_triples
+
+    @property
+    def dedup_ratio(self) -> float:
+        if not self.input_triples:
+            return 0.0
+        return self.duplicates / self.input_triples
+
+    @property
+    def json(self):
+        as_dict = dict(self.__dict__)
+        as_dict["duplicates"] = self.duplicates
+        as_dict["dedup_ratio"] = round(self.dedup_ratio, 6)
+        return as_dict
+
+    @classmethod
+    def from_dict(cls, the_dict):
+        if not the_dict:
+            return cls()
+        the_dict = dict(the_dict)
+        the_dict.pop("duplicates", None)
+        the_dict.pop("dedup_ratio", None)
+        return cls(**the_dict)
+
+
+class TripleDeduplicator:
+    """Streams N-Triples lines into shards, keeping the first copy of each.
+
+    Every new triple goes to the shard that has received the fewest bytes so
+    far, which keeps the shards within one line of each other in size.
+    """
+
+    def __init__(self, triple_set):
+        self._triple_set = triple_set
+
+    def deduplicate(self, lines: Iterable[bytes], shards: List[BinaryIO]) -> DedupStats:
+        stats = DedupStats()
+        lightest = [(0, index) for index in range(len(shards))]
+        for line in lines:
+            stats.input_bytes = stats.input_bytes + len(line)
+            triple = line.strip()
+            if not triple or triple.startswith(b"#"):
+                continue
+            stats.input_triples = stats.input_triples + 1
+            if not self._triple_set.add(triple):
+                continue
+            stats.unique_triples = stats.unique_triples + 1
+            shard_bytes, index = heapq.heappop(lightest)
+            shards[index].write(triple + b"\n")
+            heapq.heappush(lightest, (shard_bytes + len(triple) + 1, index))
+        stats.output_bytes = sum(shard_bytes for shard_bytes, _ in lightest)
+        return stats
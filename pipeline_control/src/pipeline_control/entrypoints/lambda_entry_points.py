@@ -4,6 +4,7 @@
 import logging
 
 import app_config
+import pipeline_control.entrypoints.lambda_handlers.follow_inference
 import pipeline_control.entrypoints.lambda_handlers.input_upload
 import pipeline_control.entrypoints.lambda_handlers.process_inference
 import pipeline_control.entrypoints.lambda_handlers.refresh_bulkload
@@ -26,6 +27,8 @@ def handle_refresh_bulkload(event, context={}):
         )
         # Skimping on Lambda Functions for now will factor this out in the future
         handle_notify_user(event, context)
+        if config.follow_inference:
+            handle_follow_inference(event, context)
         return status
     except WrongEventTypeException as wete:
         return f"Not a relevant type {wete.type}"
@@ -37,6 +40,12 @@ def handle_notify_user(event, context={}):
     )
 
 
+def handle_follow_inference(event, context={}):
+    pipeline_control.entrypoints.lambda_handlers.follow_inference.handle_follow_inference(
+        event, config
+    )
+
+
 def handle_input_upload(event, context={}):
     logger.info("handle_input_upload called")
     logger.debug(f"Event:{event}")
@@ -0,0 +1,30 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+
+import pipeline_control.service_layer.handlers.follow_inference_handler
+from app_config import AppConfig
+from pipeline_control.adapters.job_repository.job_repository import JobRepository
+from pipeline_control.domain import commands
+from pipeline_control.service_layer.eks_control.job_control import JobControl
+from pipeline_control.service_layer.eks_control.util.eks_client_factory import (
+    KubernetesClientFactory,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def handle_follow_inference(event, app_config: AppConfig):
+    follow_inference_command = commands.FollowInference(
+        job_repository=JobRepository(),
+        job_control=JobControl(
+            api_client_factory=KubernetesClientFactory(
+                cluster_name=app_config.cluster_name
+            )
+        ),
+    )
+    handler = pipeline_control.service_layer.handlers.follow_inference_handler.FollowInferenceHandler(
+        cmd=follow_inference_command
+    )
+    return handler.handle()
@@ -6,6 +6,9 @@ import logging
 from neptune_load.sigv4_signer.sigv4_signer import SigV4Signer
 
 import pipeline_control.domain.commands
+import pipeline_control.service_layer.handlers.compute_delta_handler
+import pipeline_control.service_layer.handlers.convert_answers_handler
+import pipeline_control.service_layer.handlers.deduplicate_triples_handler
 import pipeline_control.service_layer.handlers.initiate_bulk_load_handler
 import pipeline_control.service_layer.handlers.new_job_handler
 import pipeline_control.service_layer.handlers.process_inference_handler
@@ -19,7 +22,7 @@ from pipeline_control.domain.inference_stat_processor.inference_stat_processor i
 )
 from pipeline_control.entrypoints.util.file_upload_fiter import make_validate_file_name
 from pipeline_control.entrypoints.util.s3_upload_event import S3Uploadevent
-from pipeline_control.service_layer.s3_json_loader import S3JsonLoader
+from pipeline_control.service_layer.s3_log_tail import S3LogTail
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +37,15 @@ def handle_process_inference(event, app_config: AppConfig):
 
     (job_id, file_name, data_prefix) = parse_object_key(object_key=object_key)
     file_name_validator(file_name)
-    inference_stats = S3JsonLoader.download_from_s3(
+    # The statistics all sit at the end of the log, however long the import ran
+    log_tail = S3LogTail(
         bucket_name=bucket_name,
         key=object_key,
+        tail_bytes=app_config.rdfoxlog_tail_bytes,
+    )
+    inference_stat_processor = InferenceStatProcessor(
+        inference_stats="", lines=log_tail.lines()
     )
-    inference_stat_processor = InferenceStatProcessor(inference_stats=inference_stats)
     process_inference_command = pipeline_control.domain.commands.ProcessInference(
         s3_bucket_name=bucket_name,
         key=data_prefix,
@@ -65,6 +72,32 @@ def handle_initiate_bulkload(event, app_config: AppConfig):
         neptune_load_configuration=None,
     )
 
+    if app_config.delta_load:
+        neptune_source = compute_delta(
+            job_repository=job_repository,
+            neptune_loader_factory=neptune_loader_factory,
+            job_id=job_id,
+            source=neptune_source,
+            app_config=app_config,
+        )
+        if not neptune_source:
+            logger.info(f"Nothing to add for {job_id}, skipping the bulk load")
+            return job_repository.get_job_by_id(job_id)
+    elif app_config.triple_dedup:
+        neptune_source = deduplicate_triples(
+            job_repository=job_repository,
+            job_id=job_id,
+            source=neptune_source,
+            app_config=app_config,
+        )
+    elif app_config.convert_answers_format:
+        neptune_source = convert_answers(
+            job_repository=job_repository,
+            job_id=job_id,
+            source=neptune_source,
+            app_config=app_config,
+        )
+
     initiate_bulk_load_command = pipeline_control.domain.commands.InitiateBulkload(
         source=neptune_source,
         neptune_loader_factory=neptune_loader_factory,
@@ -78,6 +111,50 @@ def handle_initiate_bulkload(event, app_config: AppConfig):
     return initiate_bulk_load_handler.handle()
 
 
+def deduplicate_triples(job_repository, job_id, source, app_config: AppConfig):
+    deduplicate_command = pipeline_control.domain.commands.DeduplicateTriples(
+        job_repository=job_repository,
+        job_id=job_id,
+        source=source,
+        shard_count=app_config.triple_dedup_shards,
+        triple_set_kind=app_config.triple_dedup_set,
+    )
+    deduplicate_handler = pipeline_control.service_layer.handlers.deduplicate_triples_handler.DeduplicateTriplesHandler(
+        cmd=deduplicate_command
+    )
+    return deduplicate_handler.handle()
+
+
+def convert_answers(job_repository, job_id, source, app_config: AppConfig):
+    convert_answers_command = pipeline_control.domain.commands.ConvertAnswers(
+        job_repository=job_repository,
+        job_id=job_id,
+        source=source,
+        output_format=app_config.convert_answers_format,
+        shard_bytes=app_config.convert_answers_shard_bytes,
+    )
+    convert_answers_handler = pipeline_control.service_layer.handlers.convert_answers_handler.ConvertAnswersHandler(
+        cmd=convert_answers_command
+    )
+    return convert_answers_handler.handle()
+
+
+def compute_delta(
+    job_repository, neptune_loader_factory, job_id, source, app_config: AppConfig
+):
+    compute_delta_command = pipeline_control.domain.commands.ComputeDelta(
+        job_repository=job_repository,
+        neptune_loader_factory=neptune_loader_factory,
+        job_id=job_id,
+        source=source,
+        shard_count=app_config.triple_dedup_shards,
+    )
+    compute_delta_handler = pipeline_control.service_layer.handlers.compute_delta_handler.ComputeDeltaHandler(
+        cmd=compute_delta_command
+    )
+    return compute_delta_handler.handle()
+
+
 # Based on s3://terraform-somebucketname/2021-01-01/2021-01-01_2021-07-19_081/rdfox.log
 # [-1] = filename, [-2] = job_id
 def parse_object_key(object_key: str):
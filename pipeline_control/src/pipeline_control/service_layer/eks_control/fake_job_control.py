@@ -0,0 +1,25 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from typing import Dict, List
+
+from pipeline_control.service_layer.eks_control.job_control import JobControl
+
+
+class FakeJobControl(JobControl):
+    """Serves container logs from memory, keyed by the Kubernetes job name."""
+
+    def __init__(self, logs: Dict[str, List[str]]):
+        super().__init__(api_client_factory=None)
+        self.logs = logs
+        self.reads = []
+
+    def read_job_log(
+        self,
+        kubernetes_name: str,
+        namespace: str,
+        container: str,
+        since_seconds: int = None,
+    ) -> List[str]:
+        self.reads.append((kubernetes_name, container, since_seconds))
+        return self.logs.get(kubernetes_name, [])
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT-0
 
 import logging
+from typing import List
 
 import kubernetes
 from hikaru.model.rel_1_18.v1.v1 import Job, Pod
@@ -60,6 +61,29 @@ class JobControl:
             logs[container.name] = these_logs
         return logs
 
+    def read_job_log(
+        self,
+        kubernetes_name: str,
+        namespace: str,
+        container: str,
+        since_seconds: int = None,
+    ) -> List[str]:
+        """The lines one container of a job logged, each with its timestamp."""
+        api_client = self.api_client_factory.get_client()
+        kubernetes_job = Job().read(
+            client=api_client, name=kubernetes_name, namespace=namespace
+        )
+        pod = self.get_pod_by_job(kubernetes_job, api_client=api_client)
+        container_logs = pod.readNamespacedPodLog(
+            pod.metadata.name,
+            namespace=pod.metadata.namespace,
+            container=container,
+            client=api_client,
+            since_seconds=since_seconds,
+            timestamps=True,
+        )
+        return container_logs.obj.splitlines() if container_logs.obj else []
+
     def delete_job_and_its_pods(self, job: Job):
         api_client = self.api_client_factory.get_client()
         the_pod = self.get_pod_by_job(job)
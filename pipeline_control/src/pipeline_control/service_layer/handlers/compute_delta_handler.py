@@ -0,0 +1,257 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import gzip
+import itertools
+import logging
+import os
+import tempfile
+
+import boto3
+from neptune_load.sparql_update.sparql_update import DELETE_DATA, update_batches
+
+from app_config import app_configuration
+from pipeline_control.domain import commands
+from pipeline_control.domain.delta_index.delta_index import (
+    AdditionFilter,
+    DeltaStats,
+    iter_removals,
+    read_index,
+    write_index,
+)
+from pipeline_control.domain.model import JobStatus
+from pipeline_control.domain.triple_deduplicator.triple_deduplicator import (
+    DiskTripleSet,
+    TripleDeduplicator,
+)
+from pipeline_control.service_layer.handlers import util
+from pipeline_control.service_layer.handlers.handler import Handler
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1024 * 1024
+INDEX_NAME = "fingerprints.bin.gz"
+REMOVALS_NAME = "removals.ru"
+# Removal progress is written back to the job every this many updates
+SAVE_PROGRESS_EVERY = 10
+SUCCESSFUL_STATUSES = (
+    JobStatus.NEPTUNE_LOAD_COMPLETED,
+    JobStatus.SUCCESS_NOTIFICATION_SENT,
+)
+
+
+def s3_location(uri: str):
+    bucket, _, key = uri[len("s3://") :].partition("/")
+    return bucket, key
+
+
+def write_through(updates, update_file):
+    for update in updates:
+        update_file.write(update + " ;\n")
+        yield update
+
+
+class ComputeDeltaHandler(Handler):
+    """Compares this job's output with the previous successful run of its key.
+
+    Triples missing from the previous fingerprint index are written as gzip
+    shards for the bulk load, triples that disappeared are deleted with
+    batched SPARQL DELETE DATA updates, and this job's own index is stored for
+    the next run. The additions and the index are stored on the job before the
+    first deletion and the removals record their progress, so a run that is cut
+    off resumes with the remaining removals. Returns the source to bulk load,
+    or None if nothing was added.
+    """
+
+    def __init__(self, cmd: commands.ComputeDelta):
+        self.job_repository = cmd.job_repository
+        self.neptune_loader_factory = cmd.neptune_loader_factory
+        self.job_id = cmd.job_id
+        self.job = self.job_repository.get_job_by_id(self.job_id)
+        self.source = cmd.source
+        self.shard_count = cmd.shard_count
+        self.triples_per_update = cmd.triples_per_update
+        self.delta_prefix = util.sibling_prefix(cmd.source, "delta")
+
+    def handle(self):
+        stats = self.job.delta_statistics
+        if not stats.removals_done:
+            s3_client = boto3.client("s3")
+            with tempfile.TemporaryDirectory() as directory:
+                if stats.index:
+                    # The additions and the index were stored by a run that was cut off
+                    logger.info(
+                        f"Resuming the removals of {self.job_id} after {stats.removal_updates} updates"
+                    )
+                    current = self._download_index(
+                        s3_client, stats.index, directory, INDEX_NAME
+                    )
+                else:
+                    stats = DeltaStats(
+                        output_source=self.source,
+                        index=self.delta_prefix + INDEX_NAME,
+                        additions_source=self.delta_prefix + "additions/",
+                    )
+                    current = self._store_additions(s3_client, stats, directory)
+                try:
+                    if stats.previous_job_id:
+                        previous_job = self.job_repository.get_job_by_id(
+                            stats.previous_job_id
+                        )
+                        self._remove_missing_triples(
+                            s3_client, previous_job, current, stats, directory
+                        )
+                finally:
+                    current.close()
+            stats.removals_done = True
+
+        logger.info(
+            f"Delta of {self.job_id} against {stats.previous_job_id}: {stats.additions} additions, {stats.removals} removals, {stats.unchanged} unchanged"
+        )
+        self.job.delta_statistics = stats
+        if not stats.additions:
+            self.job.job_status = JobStatus.NEPTUNE_LOAD_COMPLETED
+        self.job_repository.save(self.job)
+        return stats.additions_source if stats.additions else None
+
+    def previous_job(self):
+        for job in self.job_repository.get_all_by_key(self.job.key):
+            if job.job_id >= self.job_id:
+                continue
+            if job.job_status in SUCCESSFUL_STATUSES and job.delta_statistics.index:
+                return job
+        return None
+
+    def _stream_lines(self, s3_client, source):
+        # rdfox.log sits next to the data and is not a loadable feed
+        for uri in sorted(util.s3_objects_under_prefix(source)):
+            if uri.split("/")[-1] == app_configuration.rdfoxlog_name:
+                continue
+            bucket, key = s3_location(uri)
+            body = s3_client.get_object(Bucket=bucket, Key=key)["Body"]
+            yield from body.iter_lines(chunk_size=READ_CHUNK_SIZE)
+
+    def _write_additions(self, s3_client, current, previous, stats, directory):
+        addition_filter = AdditionFilter(current=current, previous=previous)
+        shard_paths = [
+            os.path.join(directory, f"part-{index:05d}.nt.gz")
+            for index in range(self.shard_count)
+        ]
+        shards = [gzip.open(path, "wb") for path in shard_paths]
+        try:
+            dedup_stats = TripleDeduplicator(addition_filter).deduplicate(
+                self._stream_lines(s3_client, self.source), shards
+            )
+        finally:
+            for shard in shards:
+                shard.close()
+        stats.additions = dedup_stats.unique_triples
+        stats.unchanged = addition_filter.unchanged
+        bucket, prefix = s3_location(stats.additions_source)
+        # The lightest shard is filled first, so only trailing shards are empty
+        for path in shard_paths[: min(self.shard_count, stats.additions)]:
+            s3_client.upload_file(path, bucket, prefix + os.path.basename(path))
+
+    def _store_additions(self, s3_client, stats, directory):
+        previous_job = self.previous_job()
+        stats.previous_job_id = previous_job.job_id if previous_job else None
+        current = DiskTripleSet(directory=directory)
+        previous = (
+            self._download_index(
+                s3_client,
+                previous_job.delta_statistics.index,
+                directory,
+                "previous-" + INDEX_NAME,
+            )
+            if previous_job
+            else None
+        )
+        try:
+            self._write_additions(s3_client, current, previous, stats, directory)
+            self._upload_index(s3_client, current, stats, directory)
+        except Exception:
+            current.close()
+            raise
+        finally:
+            if previous:
+                previous.close()
+        # Nothing was deleted yet, a run cut off from here resumes with the removals
+        self.job.delta_statistics = stats
+        self.job_repository.save(self.job)
+        return current
+
+    def _download_index(self, s3_client, index, directory, name):
+        path = os.path.join(directory, name)
+        bucket, key = s3_location(index)
+        s3_client.download_file(bucket, key, path)
+        with gzip.open(path, "rb") as index_file:
+            return read_index(index_file, directory=directory)
+
+    def _upload_index(self, s3_client, current, stats, directory):
+        path = os.path.join(directory, INDEX_NAME)
+        with gzip.open(path, "wb") as index:
+            write_index(current, index)
+        bucket, key = s3_location(stats.index)
+        s3_client.upload_file(path, bucket, key)
+
+    def _remove_missing_triples(
+        self, s3_client, previous_job, current, stats, directory
+    ):
+        removals = iter_removals(
+            self._stream_lines(s3_client, previous_job.delta_statistics.output_source),
+            current=current,
+            directory=directory,
+        )
+
+        def counted(triples):
+            for triple in triples:
+                stats.removals = stats.removals + 1
+                yield triple
+
+        factory = self.neptune_loader_factory
+        neptune_configuration = factory.resolve_neptune_configuration(
+            self.job.job_configuration.neptune_configuration
+        )
+        # The removed triples live in the graph the previous job was loaded into
+        previous_configuration = previous_job.job_configuration.neptune_configuration
+        named_graph = (
+            previous_configuration.named_graph
+            if previous_configuration
+            else neptune_configuration.named_graph
+        )
+        updates = update_batches(
+            DELETE_DATA,
+            counted(removals),
+            triples_per_update=self.triples_per_update,
+            named_graph=named_graph,
+        )
+        neptune_loader = factory.make_loader(
+            override_neptune_load_configuration=neptune_configuration
+        )
+        # The removals are counted again from the start when resuming, the
+        # updates a cut off run already applied are skipped
+        applied = stats.removal_updates
+        stats.removals = 0
+        path = os.path.join(directory, REMOVALS_NAME)
+        with open(path, "w") as update_file:
+            remaining = itertools.islice(
+                write_through(updates, update_file), applied, None
+            )
+            stats.removal_updates = applied + neptune_loader.execute_sparql_updates(
+                self._checkpointed(remaining, stats, applied)
+            )
+        if stats.removal_updates:
+            stats.removals_update_file = self.delta_prefix + REMOVALS_NAME
+            bucket, key = s3_location(stats.removals_update_file)
+            s3_client.upload_file(path, bucket, key)
+
+    def _checkpointed(self, updates, stats, applied):
+        # The updates run one at a time, so pulling the next one means the
+        # previous one was applied
+        for update in updates:
+            stats.removal_updates = applied
+            if applied and applied % SAVE_PROGRESS_EVERY == 0:
+                self.job.delta_statistics = stats
+                self.job_repository.save(self.job)
+            yield update
+            applied = applied + 1
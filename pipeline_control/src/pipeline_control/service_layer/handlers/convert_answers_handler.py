@@ -0,0 +1,99 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+import os
+import tempfile
+
+import boto3
+
+from app_config import app_configuration
+from pipeline_control.domain import commands
+from pipeline_control.domain.answer_converter.answer_converter import (
+    AnswerConverter,
+    OutputFormat,
+    ShardWriter,
+)
+from pipeline_control.service_layer.handlers import util
+from pipeline_control.service_layer.handlers.handler import Handler
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class ConvertAnswersHandler(Handler):
+    """Rewrites the query answers of a job as gzip N-Triples or N-Quads shards.
+
+    The job's load configuration is switched to the format written, so the
+    bulk load that follows reads line-oriented, compressed files instead of
+    the format the answers came in. Returns the prefix of the shards.
+    """
+
+    def __init__(self, cmd: commands.ConvertAnswers):
+        self.job_repository = cmd.job_repository
+        self.job_id = cmd.job_id
+        self.job = self.job_repository.get_job_by_id(self.job_id)
+        self.source = cmd.source
+        self.target = (
+            cmd.target if cmd.target else util.sibling_prefix(cmd.source, "converted")
+        )
+        self.output_format = OutputFormat(cmd.output_format)
+        self.shard_bytes = cmd.shard_bytes
+
+    def handle(self):
+        neptune_configuration = self.job.job_configuration.neptune_configuration
+        if not neptune_configuration:
+            neptune_configuration = util.neptune_config_from_app_config()
+        graph = None
+        if self.output_format == OutputFormat.NQUADS:
+            graph = neptune_configuration.named_graph or util.job_named_graph(self.job)
+            if not graph:
+                logger.warning(
+                    f"No graph for the quads of {self.job_id}, writing N-Triples"
+                )
+                self.output_format = OutputFormat.NTRIPLES
+        converter = AnswerConverter(self.output_format, graph=graph)
+
+        # rdfox.log sits next to the data and is not a loadable feed
+        uris = sorted(
+            uri
+            for uri in util.s3_objects_under_prefix(self.source)
+            if uri.split("/")[-1] != app_configuration.rdfoxlog_name
+        )
+        s3_client = boto3.client("s3")
+        with tempfile.TemporaryDirectory() as directory:
+            shard_writer = ShardWriter(
+                directory=directory,
+                on_shard=lambda path: self._upload_shard(s3_client, path, converter),
+                shard_bytes=self.shard_bytes,
+                extension=self.output_format.extension,
+            )
+            for uri in uris:
+                for statement in converter.convert(self._stream_lines(s3_client, uri)):
+                    shard_writer.write(statement)
+            shard_writer.close()
+        stats = converter.stats
+        stats.output_bytes = shard_writer.output_bytes
+        logger.info(
+            f"Converted {self.job_id} answers {stats.answer_formats} to {stats.statements} statements in {len(stats.shards)} {stats.output_format} shards"
+        )
+
+        neptune_configuration.source_format = self.output_format.value
+        if graph:
+            neptune_configuration.named_graph = graph
+        self.job.job_configuration.neptune_configuration = neptune_configuration
+        self.job.answer_conversion = stats
+        self.job_repository.save(self.job)
+        return self.target
+
+    def _stream_lines(self, s3_client, uri):
+        bucket, _, key = uri[len("s3://") :].partition("/")
+        body = s3_client.get_object(Bucket=bucket, Key=key)["Body"]
+        yield from body.iter_lines(chunk_size=READ_CHUNK_SIZE)
+
+    def _upload_shard(self, s3_client, path, converter):
+        bucket, _, prefix = self.target[len("s3://") :].partition("/")
+        key = prefix + os.path.basename(path)
+        s3_client.upload_file(path, bucket, key)
+        converter.stats.shards.append(f"s3://{bucket}/{key}")
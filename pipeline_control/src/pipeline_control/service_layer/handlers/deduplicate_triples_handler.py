@@ -0,0 +1,89 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import gzip
+import logging
+import os
+import tempfile
+
+import boto3
+
+from app_config import app_configuration
+from pipeline_control.domain import commands
+from pipeline_control.domain.triple_deduplicator.triple_deduplicator import (
+    TripleDeduplicator,
+    TripleSetKind,
+    make_triple_set,
+)
+from pipeline_control.service_layer.handlers import util
+from pipeline_control.service_layer.handlers.handler import Handler
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class DeduplicateTriplesHandler(Handler):
+    def __init__(self, cmd: commands.DeduplicateTriples):
+        self.job_repository = cmd.job_repository
+        self.job_id = cmd.job_id
+        self.job = self.job_repository.get_job_by_id(self.job_id)
+        self.source = cmd.source
+        self.target = (
+            cmd.target if cmd.target else util.sibling_prefix(cmd.source, "dedup")
+        )
+        self.shard_count = cmd.shard_count
+        self.triple_set_kind = TripleSetKind(cmd.triple_set_kind)
+
+    def handle(self):
+        # rdfox.log sits next to the data and is not a loadable feed
+        object_sizes = {
+            uri: size
+            for uri, size in util.s3_object_sizes_under_prefix(self.source).items()
+            if uri.split("/")[-1] != app_configuration.rdfoxlog_name
+        }
+        s3_client = boto3.client("s3")
+        with tempfile.TemporaryDirectory() as directory:
+            triple_set = make_triple_set(
+                self.triple_set_kind,
+                expected_bytes=sum(object_sizes.values()),
+                directory=directory,
+            )
+            shard_paths = [
+                os.path.join(directory, f"part-{index:05d}.nt.gz")
+                for index in range(self.shard_count)
+            ]
+            shards = [gzip.open(path, "wb") for path in shard_paths]
+            try:
+                stats = TripleDeduplicator(triple_set).deduplicate(
+                    self._stream_lines(s3_client, sorted(object_sizes)), shards
+                )
+            finally:
+                for shard in shards:
+                    shard.close()
+                triple_set.close()
+            # The lightest shard is filled first, so only trailing shards are empty
+            used_paths = shard_paths[: min(self.shard_count, stats.unique_triples)]
+            stats.shards = self._upload_shards(s3_client, used_paths)
+        stats.set_kind = self.triple_set_kind.value
+        logger.info(
+            f"Deduplicated {self.job_id} {stats.input_triples} to {stats.unique_triples} triples, ratio {stats.dedup_ratio:.3f}"
+        )
+        self.job.triple_dedup_statistics = stats
+        self.job_repository.save(self.job)
+        return self.target
+
+    def _stream_lines(self, s3_client, uris):
+        for uri in uris:
+            bucket, _, key = uri[len("s3://") :].partition("/")
+            body = s3_client.get_object(Bucket=bucket, Key=key)["Body"]
+            yield from body.iter_lines(chunk_size=READ_CHUNK_SIZE)
+
+    def _upload_shards(self, s3_client, shard_paths):
+        bucket, _, prefix = self.target[len("s3://") :].partition("/")
+        shard_uris = []
+        for path in shard_paths:
+            key = prefix + os.path.basename(path)
+            s3_client.upload_file(path, bucket, key)
+            shard_uris.append(f"s3://{bucket}/{key}")
+        return shard_uris
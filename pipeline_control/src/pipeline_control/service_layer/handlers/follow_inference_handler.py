@@ -0,0 +1,70 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import datetime
+import logging
+import math
+
+from pipeline_control.domain import commands
+from pipeline_control.domain.inference_progress.inference_progress import (
+    InferenceProgressTracker,
+    parse_log_timestamp,
+)
+from pipeline_control.domain.model import Job, JobStatus
+from pipeline_control.service_layer.handlers.handler import Handler
+
+logger = logging.getLogger(__name__)
+
+
+class FollowInferenceHandler(Handler):
+    """Writes the progress of every running RDFox job to the job.
+
+    Each poll reads the container log from where the last one stopped, so the
+    phase, facts processed and elapsed time are on the job hours before the
+    final rdfox.log is uploaded.
+    """
+
+    def __init__(self, cmd: commands.FollowInference):
+        self.job_repository = cmd.job_repository
+        self.job_control = cmd.job_control
+        self.container = cmd.container
+
+    def handle(self):
+        running_jobs = self.job_repository.get_all_by_status(JobStatus.SCHEDULED)
+        for job in running_jobs:
+            # A pod that is gone or not started yet is picked up on the next poll
+            try:
+                self.follow(job)
+            except Exception as e:
+                logger.warning(f"Could not follow the log of {job.job_id} {e}")
+        return running_jobs
+
+    def follow(self, job: Job):
+        progress = job.inference_progress
+        now = datetime.datetime.utcnow()
+        since_seconds = None
+        if progress.last_timestamp:
+            # One second more than needed, the lines already read are skipped
+            last_read = parse_log_timestamp(progress.last_timestamp)
+            since_seconds = math.ceil((now - last_read).total_seconds()) + 1
+        lines = self.job_control.read_job_log(
+            kubernetes_name=job.kubernetes_name,
+            namespace=job.job_configuration.namespace,
+            container=self.container,
+            since_seconds=since_seconds,
+        )
+        tracker = InferenceProgressTracker(progress)
+        for line in lines:
+            tracker.feed(line)
+        progress = tracker.finish(now)
+        # The log read is slow, ProcessInference may have moved the job on since
+        job = self.job_repository.get_job_by_id(job.job_id)
+        if job.job_status != JobStatus.SCHEDULED:
+            logger.info(f"{job.job_id} is {job.job_status}, progress not written")
+            return
+        job.inference_progress = progress
+        job.rdfox_statistics = job.inference_progress.stats
+        logger.info(
+            f"Inference of {job.job_id} in {progress.phase} for {progress.phase_seconds}s, {progress.facts_processed} facts processed after {progress.elapsed_seconds}s"
+        )
+        self.job_repository.save(job)
@@ -2,14 +2,57 @@
 # SPDX-License-Identifier: MIT-0
 
 import logging
+import time
 
+from neptune_load.bulk_loader.shard_planner import ShardStrategy, plan_load_sources
+from neptune_load.sparql_update.sparql_update import INSERT_DATA, update_batches
+
+from app_config import app_configuration
+from pipeline_control.adapters.neptune_loader.neptune_loader_configuration import (
+    NeptuneParallelism,
+)
 from pipeline_control.domain import commands
+from pipeline_control.domain.load_estimator.load_estimator import (
+    REJECT,
+    REROUTE,
+    LoadEstimate,
+    LoadEstimator,
+    LoadObservation,
+)
 from pipeline_control.domain.model import JobStatus
+from pipeline_control.domain.neptune_stat_processor.neptune_stat_processor import (
+    NeptuneStats,
+)
+from pipeline_control.domain.parallelism_policy.parallelism_policy import (
+    ParallelismPolicy,
+)
 from pipeline_control.service_layer.handlers import util
 from pipeline_control.service_layer.handlers.handler import Handler
 
 logger = logging.getLogger(__name__)
 
+# INSERT DATA takes N-Triples lines as they are, turtle prefixes would need a prologue
+SPARQL_UPDATE_FORMATS = ("ntriples",)
+# RDFox writes the answers of every query to <query>.rq.nt, whatever the load format
+NTRIPLES_SUFFIX = ".nt"
+# Gzip objects are bulk loaded, their lines are not N-Triples and their sizes
+# are compressed
+GZIP_SUFFIX = ".gz"
+# About 600k triples, a few minutes of INSERT DATA at worst, well inside the
+# 900 second process_inference Lambda that writes them
+SPARQL_UPDATE_BYTES_LIMIT = 64 * 1024 * 1024
+LOADED_STATUSES = (
+    JobStatus.NEPTUNE_LOAD_COMPLETED,
+    JobStatus.SUCCESS_NOTIFICATION_SENT,
+)
+
+
+def triples_from_lines(lines):
+    for line in lines:
+        triple = line.strip()
+        if triple and not triple.startswith(b"#"):
+            yield triple.decode("utf-8")
+
 
 class InitiateBulkloadHandler(Handler):
     def __init__(self, cmd: commands.ProcessInference):
@@ -18,6 +61,25 @@ class InitiateBulkloadHandler(Handler):
         self.job_id = cmd.job_id
         self.job = self.job_repository.get_job_by_id(self.job_id)
         self.source = cmd.source
+        self.parallelism_policy = (
+            cmd.parallelism_policy if cmd.parallelism_policy else ParallelismPolicy()
+        )
+        sparql_update_max_bytes = (
+            cmd.sparql_update_max_bytes
+            if cmd.sparql_update_max_bytes is not None
+            else app_configuration.sparql_update_max_bytes
+        )
+        if sparql_update_max_bytes > SPARQL_UPDATE_BYTES_LIMIT:
+            logger.warning(
+                f"SPARQL updates are capped at {SPARQL_UPDATE_BYTES_LIMIT} bytes, not {sparql_update_max_bytes}"
+            )
+            sparql_update_max_bytes = SPARQL_UPDATE_BYTES_LIMIT
+        self.sparql_update_max_bytes = sparql_update_max_bytes
+        self.load_budget_seconds = (
+            cmd.load_budget_seconds
+            if cmd.load_budget_seconds is not None
+            else app_configuration.load_budget_seconds
+        )
 
     def handle(self):
         self._update_job_config()
@@ -29,24 +91,272 @@ class InitiateBulkloadHandler(Handler):
         if not job_neptune_configuration:
             job_neptune_configuration = util.neptune_config_from_app_config()
         job_neptune_configuration.source = self.source
+        if not job_neptune_configuration.named_graph:
+            job_neptune_configuration.named_graph = util.job_named_graph(self.job)
         self.job.job_configuration.neptune_configuration = job_neptune_configuration
 
     def _initiate_bulk_load(self):
-        neptune_loader = self.neptune_loader_factory.make_loader(
-            override_neptune_load_configuration=self.job.job_configuration.neptune_configuration
+        factory = self.neptune_loader_factory
+        neptune_configuration = factory.resolve_neptune_configuration(
+            self.job.job_configuration.neptune_configuration
         )
-        logger.info(f"Beginnging bulk load for {self.job.job_id}")
         neptune_writer_instance = util.neptune_instance_type_from_endpoint(
-            neptune_loader.neptune_load_configuration.cluster_endpoint
+            neptune_configuration.cluster_endpoint
         )
         self.job.neptune_writer_instance = neptune_writer_instance
-        neptune_loader.initiate_bulk_load()
+        sparql_update_sources = self._sparql_update_sources(neptune_configuration)
+        if sparql_update_sources:
+            try:
+                self._write_with_sparql_update(
+                    neptune_configuration, sparql_update_sources
+                )
+                return
+            except Exception as e:
+                # Triples are a set, the bulk load takes in what was inserted
+                logger.error(
+                    f"SPARQL updates of {self.job_id} failed, bulk loading instead {e}"
+                )
+        if neptune_configuration.parallelism == NeptuneParallelism.AUTO:
+            self._apply_parallelism_policy(neptune_configuration)
+        if not self.load_budget_seconds:
+            self._record_source_size(neptune_configuration)
+        elif not self._fits_load_budget(neptune_configuration):
+            return
+        neptune_loader = self.neptune_loader_factory.make_loader(
+            override_neptune_load_configuration=neptune_configuration
+        )
+        logger.info(f"Beginnging bulk load for {self.job.job_id}")
+        shard_count = neptune_loader.neptune_load_configuration.shard_count
+        if shard_count and shard_count > 1:
+            load_id = self._initiate_sharded_load(neptune_loader, shard_count)
+        else:
+            neptune_loader.initiate_bulk_load()
+            load_id = neptune_loader.load_id
         self.job.job_configuration.neptune_configuration = (
             neptune_loader.neptune_load_configuration
         )
-        self.job.neptune_load_id = neptune_loader.load_id
-        load_id = neptune_loader.load_id
         logger.info(f"Bulk load for {self.job_id} initiated load_id {load_id}")
         self.job.job_status = JobStatus.NEPTUNE_LOAD_IN_PROGRESS
         self.job.neptune_load_id = load_id
         self.job_repository.save(self.job)
+
+    def _sparql_update_sources(self, neptune_configuration):
+        """The objects to write with INSERT DATA, or None to bulk load instead."""
+        if not self.sparql_update_max_bytes:
+            return None
+        try:
+            object_sizes = util.s3_object_sizes_under_prefix(
+                neptune_configuration.source
+            )
+        except Exception as e:
+            logger.warning(f"Could not size {neptune_configuration.source} {e}")
+            return None
+        object_sizes = {
+            uri: size
+            for uri, size in object_sizes.items()
+            if uri.split("/")[-1] != app_configuration.rdfoxlog_name
+        }
+        if not object_sizes or any(uri.endswith(GZIP_SUFFIX) for uri in object_sizes):
+            return None
+        # N-Triples is also valid turtle, so .nt files loaded as turtle qualify
+        ntriples = neptune_configuration.source_format in SPARQL_UPDATE_FORMATS or all(
+            uri.endswith(NTRIPLES_SUFFIX) for uri in object_sizes
+        )
+        if not ntriples:
+            return None
+        if sum(object_sizes.values()) > self.sparql_update_max_bytes:
+            return None
+        return sorted(object_sizes)
+
+    def _write_with_sparql_update(self, neptune_configuration, sources):
+        neptune_loader = self.neptune_loader_factory.make_loader(
+            override_neptune_load_configuration=neptune_configuration
+        )
+        logger.info(f"Writing {self.job.job_id} with SPARQL updates from {sources}")
+        triples_written = 0
+
+        def counted(triples):
+            nonlocal triples_written
+            for triple in triples:
+                triples_written = triples_written + 1
+                yield triple
+
+        started = time.time()
+        updates = update_batches(
+            INSERT_DATA,
+            counted(triples_from_lines(util.s3_lines(sources))),
+            named_graph=neptune_configuration.named_graph,
+        )
+        update_count = neptune_loader.execute_sparql_updates(
+            updates, max_in_flight=app_configuration.sparql_update_concurrency
+        )
+        time_total = round(time.time() - started)
+        logger.info(
+            f"Wrote {triples_written} triples for {self.job_id} in {update_count} SPARQL updates"
+        )
+        self.job.job_configuration.neptune_configuration = neptune_configuration
+        self.job.neptune_statistics = NeptuneStats(
+            total_records=triples_written,
+            records_total=triples_written,
+            time_to_load=time_total,
+            time_total=time_total,
+            status="LOAD_COMPLETED",
+        )
+        # Nothing to poll, the job goes straight to notification
+        self.job.job_status = JobStatus.NEPTUNE_LOAD_COMPLETED
+        self.job_repository.save(self.job)
+
+    def _apply_parallelism_policy(self, neptune_configuration):
+        source_objects, source_bytes = None, None
+        try:
+            # rdfox.log sits next to the data and is not a loadable feed
+            object_sizes = {
+                uri: size
+                for uri, size in util.s3_object_sizes_under_prefix(
+                    neptune_configuration.source
+                ).items()
+                if uri.split("/")[-1] != app_configuration.rdfoxlog_name
+            }
+            source_objects, source_bytes = len(object_sizes), sum(object_sizes.values())
+        except Exception as e:
+            logger.warning(f"Could not size {neptune_configuration.source} {e}")
+        active_loads = self.neptune_loader_factory.get_active_loads(
+            override_neptune_load_configuration=neptune_configuration
+        )
+        decision = self.parallelism_policy.decide(
+            instance_type=self.job.neptune_writer_instance,
+            active_loads=len(active_loads),
+            source_objects=source_objects,
+            source_bytes=source_bytes,
+            queue_request=neptune_configuration.queue_request,
+        )
+        logger.info(f"Parallelism for {self.job_id} {decision}")
+        neptune_configuration.parallelism = NeptuneParallelism(decision.parallelism)
+        neptune_configuration.queue_request = decision.queue_request
+        self.job.neptune_parallelism_decision = decision
+
+    def _fits_load_budget(self, neptune_configuration) -> bool:
+        try:
+            object_sizes = util.s3_object_sizes_under_prefix(
+                neptune_configuration.source
+            )
+        except Exception as e:
+            # Without a size there is nothing to estimate, the load goes ahead
+            logger.warning(f"Could not size {neptune_configuration.source} {e}")
+            return True
+        object_sizes = {
+            uri: size
+            for uri, size in object_sizes.items()
+            if uri.split("/")[-1] != app_configuration.rdfoxlog_name
+        }
+        estimator = LoadEstimator(observations=self._load_history())
+        estimate = estimator.within_budget(
+            estimator.estimate(
+                instance_type=self.job.neptune_writer_instance,
+                parallelism=neptune_configuration.parallelism.value,
+                source_objects=len(object_sizes),
+                source_bytes=sum(object_sizes.values()),
+            ),
+            budget_seconds=self.load_budget_seconds,
+        )
+        logger.info(f"Load estimate for {self.job_id} {estimate}")
+        self.job.neptune_load_estimate = estimate
+        if estimate.action == REROUTE:
+            neptune_configuration.parallelism = NeptuneParallelism(
+                estimate.rerouted_parallelism
+            )
+        if estimate.action == REJECT:
+            logger.warning(
+                f"Not loading {self.job_id}, predicted {estimate.predicted_seconds}s over the budget of {self.load_budget_seconds}s"
+            )
+            self.job.job_configuration.neptune_configuration = neptune_configuration
+            self.job.job_status = JobStatus.NEPTUNE_LOAD_REJECTED
+            self.job_repository.save(self.job)
+            return False
+        return True
+
+    def _record_source_size(self, neptune_configuration):
+        # Without a budget there is no estimate, later ones still need the size
+        try:
+            object_sizes = util.s3_object_sizes_under_prefix(
+                neptune_configuration.source
+            )
+        except Exception as e:
+            logger.warning(f"Could not size {neptune_configuration.source} {e}")
+            return
+        object_sizes = {
+            uri: size
+            for uri, size in object_sizes.items()
+            if uri.split("/")[-1] != app_configuration.rdfoxlog_name
+        }
+        self.job.neptune_load_estimate = LoadEstimate(
+            instance_type=self.job.neptune_writer_instance,
+            parallelism=neptune_configuration.parallelism.value,
+            source_objects=len(object_sizes),
+            source_bytes=sum(object_sizes.values()),
+        )
+
+    def _load_history(self):
+        jobs = []
+        for status in LOADED_STATUSES:
+            jobs = jobs + self.job_repository.get_all_by_status(status)
+        # Sharded loads only report the last shard and SPARQL writes have no load id
+        loads = [
+            job
+            for job in jobs
+            if job.neptune_load_id != "N/A"
+            and not job.neptune_shard_loads
+            and job.neptune_statistics.records_total
+            and job.neptune_statistics.time_total
+            and job.job_configuration.neptune_configuration
+        ]
+        # The job id starts with the key, so it does not order the loads in time
+        loads = sorted(loads, key=lambda job: job.job_created, reverse=True)
+        observations = []
+        for job in loads[: app_configuration.load_estimate_history]:
+            configuration = job.job_configuration.neptune_configuration
+            source_bytes = job.neptune_load_estimate.source_bytes
+            if source_bytes is None:
+                # Loads from before every load was sized, only AUTO ones have it
+                source_bytes = job.neptune_parallelism_decision.source_bytes
+            observations.append(
+                LoadObservation(
+                    instance_type=job.neptune_writer_instance,
+                    parallelism=configuration.parallelism.value,
+                    records=job.neptune_statistics.records_total,
+                    seconds=job.neptune_statistics.time_total,
+                    source_bytes=source_bytes,
+                )
+            )
+        return observations
+
+    def _initiate_sharded_load(self, neptune_loader, shard_count):
+        configuration = neptune_loader.neptune_load_configuration
+        # rdfox.log sits next to the data and is not a loadable feed
+        object_sizes = {
+            uri: size
+            for uri, size in util.s3_object_sizes_under_prefix(
+                configuration.source
+            ).items()
+            if uri.split("/")[-1] != app_configuration.rdfoxlog_name
+        }
+        planned_shards = plan_load_sources(
+            object_sizes=object_sizes,
+            shard_count=shard_count,
+            strategy=ShardStrategy(configuration.shard_strategy),
+        )
+        shard_of_source = {
+            source: shard
+            for shard, sources in enumerate(planned_shards)
+            for source in sources
+        }
+        load_ids = neptune_loader.chain_load(list(shard_of_source))
+        logger.info(
+            f"Sharded load for {self.job_id} into {len(planned_shards)} shards {load_ids}"
+        )
+        self.job.neptune_shard_loads = [
+            {"shard": shard_of_source[source], "source": source, "loadId": load_id}
+            for source, load_id in load_ids.items()
+        ]
+        # The chain's last load only completes once every shard has
+        return list(load_ids.values())[-1]
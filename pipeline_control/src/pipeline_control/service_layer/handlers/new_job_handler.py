@@ -3,19 +3,49 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
 from typing import Optional
 
 from kubernetes.client.api_client import ApiClient
 
+from app_config import app_configuration
 from pipeline_control.adapters.job_repository.job_repository import JobRepository
 from pipeline_control.adapters.kubernetes_objects.rdfox_job import RDFoxJobConfiguration
 from pipeline_control.domain.commands import Command
+from pipeline_control.domain.model import JobStatus
+from pipeline_control.domain.resource_predictor.resource_predictor import (
+    AUTOFILL,
+    AUTOFILLED,
+    OVERSIZED,
+    UNDERSIZED,
+    ResourceEstimate,
+    ResourceObservation,
+    ResourcePredictor,
+    bytes_to_quantity,
+)
+from pipeline_control.service_layer.handlers import util
 from pipeline_control.service_layer.handlers.handler import Handler
 from pipeline_control.service_layer.job_scheduler.rdfoxjob_scheduler import (
     RDFoxJobScheduler,
 )
 from pipeline_control.service_layer.s3_json_loader import S3JsonLoader
 
+logger = logging.getLogger(__name__)
+
+# the pre-rdfox container loads every *.dlog under the data path as rules
+RULES_SUFFIX = ".dlog"
+# Jobs settle in these once RDFox has reported its memory and run time
+INFERRED_STATUSES = (
+    JobStatus.INFERENCE_COMPLETE,
+    JobStatus.NEPTUNE_LOAD_COMPLETED,
+    JobStatus.NEPTUNE_LOAD_FAILED,
+    JobStatus.NEPTUNE_LOAD_REJECTED,
+    JobStatus.NEPTUNE_GRAPH_PURGED,
+    JobStatus.SUCCESS_NOTIFICATION_SENT,
+    JobStatus.ERROR_NOTIFICATION_SENT,
+)
+
 
 class NewJobHandler(Handler):
     def __init__(self, cmd: Command.CreateNewJob):
@@ -23,12 +53,25 @@ class NewJobHandler(Handler):
         self.key = cmd.key
         self.job_repository = cmd.job_repository
         self.api_client_factory = cmd.api_client_factory
+        self.resource_sizing = (
+            cmd.resource_sizing
+            if cmd.resource_sizing is not None
+            else app_configuration.resource_sizing
+        )
 
     def handle(
         self,
     ):
-        scheduler = self._make_scheduler(job_configuration=self.get_job_configuration())
-        return scheduler.create_and_schedule_new_job()
+        job_configuration = self.get_job_configuration()
+        resource_estimate = None
+        if self.resource_sizing:
+            resource_estimate = self.size_resources(job_configuration)
+        scheduler = self._make_scheduler(job_configuration=job_configuration)
+        job = scheduler.create_and_schedule_new_job()
+        if resource_estimate:
+            job.resource_estimate = resource_estimate
+            self.job_repository.save(job)
+        return job
 
     @property
     def api_client(self):
@@ -39,6 +82,88 @@ class NewJobHandler(Handler):
         job_spec = RDFoxJobConfiguration.from_dict(jobconfiguration_dict)
         return job_spec
 
+    def size_resources(
+        self, job_configuration: RDFoxJobConfiguration
+    ) -> Optional[ResourceEstimate]:
+        """Predicts the resources of the job, and sets them with AUTOFILL."""
+        source = f"s3://{job_configuration.job_bucket}/{job_configuration.job_key}/"
+        try:
+            object_sizes = util.s3_object_sizes_under_prefix(source)
+            rules = sorted(uri for uri in object_sizes if uri.endswith(RULES_SUFFIX))
+            rules_digest = self._rules_digest(rules)
+        except Exception as e:
+            # Without the input there is nothing to size, the job runs as specified
+            logger.warning(f"Could not size {source} {e}")
+            return None
+        # the job spec itself may sit next to the data
+        job_spec = f"s3://{self.s3_bucket_name}/{self.key}"
+        input_sizes = [
+            size
+            for uri, size in object_sizes.items()
+            if uri not in rules and uri != job_spec
+        ]
+        predictor = ResourcePredictor(
+            observations=self._resource_history(),
+            headroom=app_configuration.resource_sizing_headroom,
+        )
+        estimate = predictor.validate(
+            predictor.estimate(
+                rules_digest=rules_digest,
+                input_bytes=sum(input_sizes),
+                input_objects=len(input_sizes),
+                requested_memory=job_configuration.requested_memory,
+                requested_cores=job_configuration.requested_cores,
+            )
+        )
+        if self.resource_sizing == AUTOFILL and estimate.observations:
+            job_configuration.requested_memory = bytes_to_quantity(
+                estimate.predicted_memory_bytes
+            )
+            job_configuration.requested_cores = estimate.predicted_cores
+            estimate.action = AUTOFILLED
+        if estimate.action in (UNDERSIZED, OVERSIZED):
+            logger.warning(f"Job at {source} is {estimate.action} {estimate.reasons}")
+        logger.info(f"Resource estimate for {source} {estimate}")
+        return estimate
+
+    def _rules_digest(self, rules) -> str:
+        # the same rules give the same digest wherever their files are kept
+        digest = hashlib.sha256()
+        for line in util.s3_lines(rules):
+            digest.update(line.strip() + b"\n")
+        return digest.hexdigest()[:16]
+
+    def _resource_history(self):
+        inferred_jobs = []
+        for status in INFERRED_STATUSES:
+            inferred_jobs = inferred_jobs + self.job_repository.get_all_by_status(
+                status
+            )
+        # Only jobs sized when they were created know their input size
+        jobs = [
+            job
+            for job in inferred_jobs
+            if job.resource_estimate.input_bytes
+            and job.rdfox_statistics.memory_usage
+            and job.rdfox_statistics.time_to_load + job.rdfox_statistics.time_to_infer
+        ]
+        # The job id starts with the key, so it does not order the jobs in time
+        jobs = sorted(jobs, key=lambda job: job.job_created, reverse=True)
+        observations = []
+        for job in jobs[: app_configuration.resource_sizing_history]:
+            stats = job.rdfox_statistics
+            observations.append(
+                ResourceObservation(
+                    rules_digest=job.resource_estimate.rules_digest,
+                    input_bytes=job.resource_estimate.input_bytes,
+                    cores=job.job_configuration.requested_cores,
+                    memory_usage=stats.memory_usage,
+                    facts_total=stats.triples_total_amount,
+                    seconds=stats.time_to_load + stats.time_to_infer,
+                )
+            )
+        return observations
+
     def _make_scheduler(
         self,
         job_configuration: RDFoxJobConfiguration,
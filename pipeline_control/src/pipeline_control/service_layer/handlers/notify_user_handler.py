@@ -30,6 +30,10 @@ class NotifyUserHandler(Handler):
         all_failed_jobs = self.job_repository.get_all_by_status(
             JobStatus.NEPTUNE_LOAD_FAILED
         )
+        # Loads over the budget are never submitted, the user still has to know
+        all_failed_jobs = all_failed_jobs + self.job_repository.get_all_by_status(
+            JobStatus.NEPTUNE_LOAD_REJECTED
+        )
         all_notifiable_jobs = all_notifiable_jobs + [
             [job, JobStatus.ERROR_NOTIFICATION_SENT] for job in all_failed_jobs
         ]
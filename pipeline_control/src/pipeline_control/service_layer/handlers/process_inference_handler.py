@@ -32,8 +32,13 @@ class ProcessInferenceHandler(Handler):
         return self.job
 
     def process_inference_stats(self):
-        self.job.rdfox_statistics_raw = self.inference_stat_processor.inference_stats
+        # A streamed log only has its marker lines as raw text once it is parsed
         self.job.rdfox_statistics = self.inference_stat_processor.process_inference()
+        self.job.rdfox_statistics_raw = self.inference_stat_processor.inference_stats
+        self.job.rdfox_telemetry = self.inference_stat_processor.telemetry
+        logger.info(
+            f"RDFox telemetry for {self.job_id} {self.job.rdfox_telemetry.summary()}"
+        )
 
     def _process_inference_stats(self, stats_text: str):
         return self.inference_stat_processor.process_inference(stats_text=stats_text)
@@ -0,0 +1,94 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+
+from app_config import app_configuration
+from pipeline_control.domain import commands
+from pipeline_control.domain.model import JobStatus
+from pipeline_control.service_layer.handlers.handler import Handler
+
+logger = logging.getLogger(__name__)
+
+
+# Progress is written back to the job every this many batches
+SAVE_PROGRESS_EVERY = 10
+
+
+def named_graph_of(job):
+    neptune_configuration = job.job_configuration.neptune_configuration
+    return neptune_configuration.named_graph if neptune_configuration else None
+
+
+class PurgeJobGraphHandler(Handler):
+    """Deletes the named graph a job was loaded into, batch by batch.
+
+    An unfinished purge stored on the job is resumed from where it stopped.
+    A graph that other jobs load into too is only purged with force, delta
+    loads put every run of a key into the same graph.
+    """
+
+    def __init__(self, cmd: commands.PurgeJobGraph):
+        self.job_repository = cmd.job_repository
+        self.neptune_loader_factory = cmd.neptune_loader_factory
+        self.job_id = cmd.job_id
+        self.job = self.job_repository.get_job_by_id(self.job_id)
+        self.force = cmd.force
+        self.triples_per_batch = (
+            cmd.triples_per_batch
+            if cmd.triples_per_batch
+            else app_configuration.purge_triples_per_batch
+        )
+        self.pause_in_seconds = (
+            cmd.pause_in_seconds
+            if cmd.pause_in_seconds is not None
+            else app_configuration.purge_pause_in_seconds
+        )
+
+    def handle(self):
+        neptune_configuration = self.job.job_configuration.neptune_configuration
+        graph = named_graph_of(self.job)
+        if not graph:
+            raise Exception(f"{self.job_id} was not loaded into a named graph")
+        if not self.force:
+            self._refuse_shared_graph(graph)
+
+        previous_progress = self.job.graph_purge
+        resume = previous_progress.graph == graph and not previous_progress.done
+        neptune_loader = self.neptune_loader_factory.make_loader(
+            override_neptune_load_configuration=neptune_configuration
+        )
+        progress = neptune_loader.purge_graph(
+            graph,
+            triples_per_batch=self.triples_per_batch,
+            pause_in_seconds=self.pause_in_seconds,
+            on_progress=self._save_progress,
+            progress=previous_progress if resume else None,
+        )
+        self.job.job_status = JobStatus.NEPTUNE_GRAPH_PURGED
+        self.job.graph_purge = progress
+        self.job_repository.save(self.job)
+        return progress
+
+    def _refuse_shared_graph(self, graph):
+        if app_configuration.delta_load:
+            raise Exception(
+                f"{graph} holds every delta load of {self.job.key}, purge it with force"
+            )
+        sharing_jobs = [
+            job.job_id
+            for job in self.job_repository.get_all()
+            if job.job_id != self.job_id and named_graph_of(job) == graph
+        ]
+        if sharing_jobs:
+            raise Exception(
+                f"{graph} is also loaded by {', '.join(sharing_jobs)}, purge it with force"
+            )
+
+    def _save_progress(self, progress):
+        self.job.graph_purge = progress
+        if progress.batches % SAVE_PROGRESS_EVERY == 0:
+            logger.info(
+                f"Purge of {self.job_id} {round(progress.fraction_done * 100)}% done"
+            )
+            self.job_repository.save(self.job)
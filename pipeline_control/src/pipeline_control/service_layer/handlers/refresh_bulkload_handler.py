@@ -2,20 +2,43 @@
 # SPDX-License-Identifier: MIT-0
 
 import logging
+import time
 
+from app_config import app_configuration
 from pipeline_control.domain import commands
+from pipeline_control.domain.chain_verifier.chain_verifier import (
+    ChainVerification,
+    ChainVerifier,
+    exported_classes,
+)
 from pipeline_control.domain.model import Job, JobStatus
+from pipeline_control.service_layer.handlers import util
 
 from .handler import Handler
 
 logger = logging.getLogger(__name__)
 
+UNFINISHED_LOAD_STATUSES = ("LOAD_NOT_STARTED", "LOAD_IN_QUEUE", "LOAD_IN_PROGRESS")
+
+
+def combined_load_status(statuses) -> str:
+    """In progress while any load is, else the first failure, else completed."""
+    if any(status in UNFINISHED_LOAD_STATUSES for status in statuses):
+        return "LOAD_IN_PROGRESS"
+    failed = [status for status in statuses if status != "LOAD_COMPLETED"]
+    return failed[0] if failed else "LOAD_COMPLETED"
+
 
 class RefreshBulkloadHandler(Handler):
     def __init__(self, cmd: commands.RefreshBulkload):
         self.job_repository = cmd.job_repository
         self.neptune_loader_factory = cmd.neptune_loader_factory
         self.neptune_stat_processor = cmd.neptune_stat_processor
+        self.verify_chain_counts = (
+            cmd.verify_chain_counts
+            if cmd.verify_chain_counts is not None
+            else app_configuration.verify_chain_counts
+        )
 
     def handle(self):
         all_loading_jobs = self.job_repository.get_all_by_status(
@@ -40,8 +63,111 @@ class RefreshBulkloadHandler(Handler):
             override_neptune_load_configuration=neptune_configuration,
         )
         status = neptune_loader.get_status()
-        status_raw = status.raw
+        # Error logs and failed feeds are kept as counts, not as the raw payload
+        status_raw = status.compact
         job.neptune_statistics_raw = status_raw
         job.neptune_statistics = self.neptune_stat_processor.process(status_raw)
+        if status.has_errors:
+            job.neptune_load_errors = neptune_loader.get_error_summary(
+                max_errors=app_configuration.neptune_load_max_errors
+            )
+            logger.warning(
+                f"Load {job.neptune_load_id} errors by code {job.neptune_load_errors.errors_by_code}"
+            )
         job.job_status = JobStatus(f"NEPTUNE_{job.neptune_statistics.status}")
+        if job.neptune_retry_load_ids:
+            self.refresh_retry_status(job, neptune_configuration)
+        if job.neptune_shard_loads:
+            self.refresh_shard_progress(job, neptune_configuration)
+        self.record_throughput(job)
+        load_completed = job.job_status == JobStatus.NEPTUNE_LOAD_COMPLETED
+        if load_completed:
+            logger.info(
+                f"Load throughput of {job.job_id} {job.neptune_throughput.summary()}"
+            )
+        if self.verify_chain_counts and load_completed:
+            self.verify_chains(job, neptune_loader)
         self.job_repository.save(job)
+
+    def record_throughput(self, job: Job):
+        stats = job.neptune_statistics
+        # a sharded load only reports the last shard through neptune_load_id
+        total_records = job.neptune_shard_progress.get(
+            "totalRecords", stats.total_records
+        )
+        errors = stats.errors_parsing + stats.errors_mismatch + stats.errors_insert
+        job.neptune_throughput.add(
+            time.time(), total_records, stats.total_duplicates, errors
+        )
+
+    def verify_chains(self, job: Job, neptune_loader):
+        named_graph = neptune_loader.neptune_load_configuration.named_graph
+        # Without a graph of its own the counts would take in other jobs' chains,
+        # a configured NEPTUNE_NAMED_GRAPH is shared by every job
+        own_graph = util.job_named_graph(job)
+        if not own_graph or named_graph != own_graph or app_configuration.delta_load:
+            logger.info(
+                f"Not verifying the chains of {job.job_id}, no graph of its own"
+            )
+            return
+        try:
+            verifier = ChainVerifier(
+                count=neptune_loader.count_query,
+                named_graph=named_graph,
+                exported_classes=self.exported_classes(job),
+            )
+            job.chain_verification = verifier.verify(job.rdfox_statistics)
+        except Exception as e:
+            # A failed check must not hold back the load status
+            logger.error(f"Could not verify the chains of {job.job_id} {e}")
+            job.chain_verification = ChainVerification(error=str(e))
+            return
+        if job.chain_verification.mismatches:
+            logger.warning(
+                f"Chain counts of {job.job_id} differ from RDFox {job.chain_verification.json}"
+            )
+
+    def exported_classes(self, job: Job):
+        # RDFox answers the .rq files of the job folder into the load source
+        job_configuration = job.job_configuration
+        objects = util.s3_objects_under_prefix(
+            f"s3://{job_configuration.job_bucket}/{job_configuration.job_key}/"
+        )
+        queries = [uri for uri in objects if uri.endswith(".rq")]
+        return exported_classes(util.s3_lines(queries))
+
+    def refresh_retry_status(self, job: Job, neptune_configuration):
+        # neptune_load_id is only the last retry queued, the others may fail alone
+        statuses = []
+        for load_id in job.neptune_retry_load_ids.values():
+            retry_loader = self.neptune_loader_factory.make_read_only_loader(
+                neptune_load_id=load_id,
+                override_neptune_load_configuration=neptune_configuration,
+            )
+            retry_stats = self.neptune_stat_processor.process(
+                retry_loader.get_status().compact
+            )
+            statuses.append(retry_stats.status)
+        job.job_status = JobStatus(f"NEPTUNE_{combined_load_status(statuses)}")
+        logger.info(f"Retries of {job.job_id} {statuses}")
+
+    def refresh_shard_progress(self, job: Job, neptune_configuration):
+        known_loads = job.neptune_shard_progress.get("loads", {})
+        stat_dicts = {}
+        for shard_load in job.neptune_shard_loads:
+            load_id = shard_load["loadId"]
+            known_load = known_loads.get(load_id)
+            if known_load and known_load["status"] == "LOAD_COMPLETED":
+                stat_dicts[load_id] = {"payload": {"overallStatus": known_load}}
+                continue
+            shard_loader = self.neptune_loader_factory.make_read_only_loader(
+                neptune_load_id=load_id,
+                override_neptune_load_configuration=neptune_configuration,
+            )
+            stat_dicts[load_id] = shard_loader.get_status().compact
+        job.neptune_shard_progress = self.neptune_stat_processor.aggregate_shards(
+            stat_dicts
+        )
+        logger.info(
+            f"Shards of {job.job_id} {job.neptune_shard_progress['statusCounts']}"
+        )
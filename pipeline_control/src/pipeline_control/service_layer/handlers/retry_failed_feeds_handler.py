@@ -0,0 +1,98 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+
+from app_config import app_configuration
+from pipeline_control.domain import commands
+from pipeline_control.domain.model import JobStatus
+from pipeline_control.service_layer.handlers import util
+from pipeline_control.service_layer.handlers.handler import Handler
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = (
+    JobStatus.NEPTUNE_LOAD_FAILED,
+    JobStatus.NEPTUNE_LOAD_CANCELLED_DUE_TO_ERRORS,
+    JobStatus.NEPTUNE_LOAD_FAILED_BECAUSE_DEPENDENCY_NOT_SATISFIED,
+)
+NEVER_RAN_STATUS = "LOAD_FAILED_BECAUSE_DEPENDENCY_NOT_SATISFIED"
+
+
+def job_loads(job):
+    """The source of every load of the last round, with its load id."""
+    # neptune_load_id is only the last retry or shard queued
+    if job.neptune_retry_load_ids:
+        return dict(job.neptune_retry_load_ids)
+    if job.neptune_shard_loads:
+        return {
+            shard_load["source"]: shard_load["loadId"]
+            for shard_load in job.neptune_shard_loads
+        }
+    return {job.job_configuration.neptune_configuration.source: job.neptune_load_id}
+
+
+class RetryFailedFeedsHandler(Handler):
+    def __init__(self, cmd: commands.RetryFailedFeeds):
+        self.job_repository = cmd.job_repository
+        self.neptune_loader_factory = cmd.neptune_loader_factory
+        self.job_id = cmd.job_id
+        self.job = self.job_repository.get_job_by_id(self.job_id)
+
+    def handle(self):
+        if self.job.job_status not in RETRYABLE_STATUSES:
+            raise Exception(
+                f"Job {self.job_id} is {self.job.job_status}, only failed loads are retried"
+            )
+        neptune_configuration = self.job.job_configuration.neptune_configuration
+        loads = job_loads(self.job)
+        failed_sources = []
+        for load_source, load_id in loads.items():
+            neptune_loader = self.neptune_loader_factory.make_read_only_loader(
+                neptune_load_id=load_id,
+                override_neptune_load_configuration=neptune_configuration,
+            )
+            for failed_source in self._failed_sources(neptune_loader, load_source):
+                if failed_source not in failed_sources:
+                    failed_sources.append(failed_source)
+        if not failed_sources:
+            raise Exception(f"Loads {list(loads.values())} have no failed feeds")
+
+        self._record_succeeded_feeds(loads=loads, failed_sources=failed_sources)
+        retry_load_ids = neptune_loader.retry_failed_feeds(failed_sources)
+        logger.info(
+            f"Retrying {len(retry_load_ids)} failed feeds of {self.job_id} {retry_load_ids}"
+        )
+        # Retries are queued independently, the refresh follows every one of them
+        self.job.neptune_retry_load_ids = retry_load_ids
+        self.job.neptune_load_id = list(retry_load_ids.values())[-1]
+        self.job.job_status = JobStatus.NEPTUNE_LOAD_IN_QUEUE
+        self.job_repository.save(self.job)
+        return self.job
+
+    def _failed_sources(self, neptune_loader, load_source):
+        # A load chained behind a failed one never ran, none of its feeds loaded
+        if neptune_loader.get_status().status.value == NEVER_RAN_STATUS:
+            return [load_source]
+        return neptune_loader.failed_sources()
+
+    def _record_succeeded_feeds(self, loads, failed_sources):
+        # Only the feeds of this round's loads are known to have succeeded, a
+        # feed that failed before stays out until a retry of it succeeds
+        succeeded_feeds = set(self.job.neptune_succeeded_feeds)
+        for load_source in loads:
+            try:
+                feeds = util.s3_objects_under_prefix(load_source)
+            except Exception as e:
+                logger.warning(f"Could not list feeds under {load_source} {e}")
+                continue
+            succeeded_feeds.update(
+                feed
+                for feed in feeds
+                if feed not in failed_sources
+                # rdfox.log sits next to the data and is not a loadable feed
+                and feed.split("/")[-1] != app_configuration.rdfoxlog_name
+            )
+        self.job.neptune_succeeded_feeds = sorted(
+            succeeded_feeds.difference(failed_sources)
+        )
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: MIT-0
 
 import logging
+import urllib.parse
 
 import boto3
 
@@ -29,6 +30,43 @@ def neptune_config_from_app_config():
     return NeptuneBulkloaderConfiguration(**neptune_config_dict)
 
 
+def job_named_graph(job):
+    """The graph a job is loaded into, None keeps the configured graph."""
+    if not app_configuration.job_graph_prefix:
+        return None
+    # Delta loads build on the previous run of the key, so they share its graph
+    owner = job.key if app_configuration.delta_load else job.job_id
+    return app_configuration.job_graph_prefix + urllib.parse.quote(owner, safe="")
+
+
+def sibling_prefix(source: str, name: str) -> str:
+    # s3://bucket/key/job_id/data/ has siblings like s3://bucket/key/job_id/dedup/
+    return source.rstrip("/").rsplit("/", 1)[0] + f"/{name}/"
+
+
+def s3_object_sizes_under_prefix(s3_url: str):
+    bucket, _, prefix = s3_url[len("s3://") :].partition("/")
+    paginator = boto3.client("s3").get_paginator("list_objects_v2")
+    object_sizes = {}
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for s3_object in page.get("Contents", []):
+            if not s3_object["Key"].endswith("/"):
+                object_sizes[f"s3://{bucket}/{s3_object['Key']}"] = s3_object["Size"]
+    return object_sizes
+
+
+def s3_objects_under_prefix(s3_url: str):
+    return list(s3_object_sizes_under_prefix(s3_url))
+
+
+def s3_lines(uris, chunk_size: int = 1024 * 1024):
+    s3_client = boto3.client("s3")
+    for uri in uris:
+        bucket, _, key = uri[len("s3://") :].partition("/")
+        body = s3_client.get_object(Bucket=bucket, Key=key)["Body"]
+        yield from body.iter_lines(chunk_size=chunk_size)
+
+
 def neptune_instance_type_from_endpoint(cluster_endpoint: str):
     primary_instance = neptune_primary_instance_from_endpoint(cluster_endpoint)
     instance_type = neptune_instance_type_from_identifier(primary_instance)
@@ -26,6 +26,17 @@ class S3JsonLoader:
         finally:
             os.remove(path)
 
+    @classmethod
+    def iter_lines_from_s3(
+        cls,
+        bucket_name: str,
+        key: str,
+        chunk_size: int = 1024 * 1024,
+    ):
+        # Streams the body, for files too large to hold in memory at once
+        body = boto3.client("s3").get_object(Bucket=bucket_name, Key=key)["Body"]
+        yield from body.iter_lines(chunk_size=chunk_size)
+
     @classmethod
     def download_and_load_json_from_s3(
         cls,
@@ -0,0 +1,88 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import logging
+from typing import List
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAIL_BYTES = 64 * 1024
+DEFAULT_GROWTH = 4
+# Every statistic the log parser reads comes at or after the earliest of these
+STAT_MARKERS = (
+    "LOADTIME-",
+    "INFERENCETIME-",
+    "QUERYTIME-",
+    "TOTALTIME-",
+    "---info---",
+    "---endinfo---",
+)
+
+
+class S3LogTail:
+    """Reads only the end of a log object, widening until the markers are in.
+
+    The window starts at tail_bytes and grows by growth each round. Only the
+    new, earlier range is fetched each time, so the bytes read are the final
+    window at most. A log missing a marker ends up read whole.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        key: str,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        growth: int = DEFAULT_GROWTH,
+        markers=STAT_MARKERS,
+    ):
+        self.bucket_name = bucket_name
+        self.key = key
+        self.tail_bytes = tail_bytes
+        self.growth = growth
+        self.markers = markers
+        self.bytes_read = 0
+
+    def lines(self) -> List[bytes]:
+        s3_client = boto3.client("s3")
+        size = s3_client.head_object(Bucket=self.bucket_name, Key=self.key)[
+            "ContentLength"
+        ]
+        data = b""
+        start = size
+        window = self.tail_bytes
+        while start > 0:
+            new_start = max(0, size - window)
+            data = self._read_range(s3_client, new_start, start - 1) + data
+            start = new_start
+            # The first line of a window is cut off unless the window is the whole log
+            lines = data.split(b"\n")[0 if start == 0 else 1 :]
+            if start == 0 or self._has_markers(lines):
+                break
+            window = window * self.growth
+        else:
+            lines = []
+        logger.info(
+            f"Read {self.bytes_read} of {size} bytes from the tail of s3://{self.bucket_name}/{self.key}"
+        )
+        return lines
+
+    def _read_range(self, s3_client, first_byte: int, last_byte: int) -> bytes:
+        response = s3_client.get_object(
+            Bucket=self.bucket_name,
+            Key=self.key,
+            Range=f"bytes={first_byte}-{last_byte}",
+        )
+        chunk = response["Body"].read()
+        self.bytes_read = self.bytes_read + len(chunk)
+        return chunk
+
+    def _has_markers(self, lines: List[bytes]) -> bool:
+        missing = {marker.encode("utf-8") for marker in self.markers}
+        for line in lines:
+            line = line.strip()
+            missing = {marker for marker in missing if not line.startswith(marker)}
+            if not missing:
+                return True
+        return False
@@ -5,6 +5,9 @@ import pytest
 from pyexpect import expect
 
 from pipeline_control.adapters.neptune_loader.neptune_loader import NeptuneLoader
+from pipeline_control.adapters.neptune_loader.neptune_loader_configuration import (
+    NeptuneMode,
+)
 
 
 class TestNeptuneLoader:
@@ -17,3 +20,22 @@ class TestNeptuneLoader:
     def test_2_can_get_load_status(self, neptune_loader_under_test, load_success_text):
         load_status = neptune_loader_under_test.get_status()
         expect(load_status.raw).to.equal(load_success_text)
+
+    def test_3_load_query_carries_job_settings(
+        self, neptune_loader_under_test, g_job_configurations_neptune_configuration
+    ):
+        g_job_configurations_neptune_configuration.mode = NeptuneMode.RESUME
+        g_job_configurations_neptune_configuration.fail_on_error = True
+        g_job_configurations_neptune_configuration.named_graph = (
+            "http://example.org/graph/job"
+        )
+        load_query = neptune_loader_under_test.bulk_loader._construct_load_query()
+        expect(load_query["mode"]).to.equal("RESUME")
+        expect(load_query["failOnError"]).to.equal("TRUE")
+        expect(load_query["parserConfiguration"]["namedGraphUri"]).to.equal(
+            "http://example.org/graph/job"
+        )
+
+    def test_4_stored_resume_mode_still_parses(self):
+        expect(NeptuneMode("RESUE")).to.equal(NeptuneMode.RESUME)
+        expect(NeptuneMode.RESUME.value).to.equal("RESUME")
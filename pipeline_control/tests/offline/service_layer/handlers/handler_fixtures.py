@@ -16,7 +16,17 @@ from pipeline_control.adapters.neptune_loader.neptune_loader_factory import (
     NeptuneLoaderFactory,
 )
 from pipeline_control.adapters.notifier.sns_notifier import SNSNotifier
-from pipeline_control.domain.commands import CreateNewJob, NotifyUser, RefreshBulkload
+from pipeline_control.domain.commands import (
+    ComputeDelta,
+    ConvertAnswers,
+    CreateNewJob,
+    DeduplicateTriples,
+    FollowInference,
+    NotifyUser,
+    PurgeJobGraph,
+    RefreshBulkload,
+    RetryFailedFeeds,
+)
 from pipeline_control.domain.inference_stat_processor.inference_stat_processor import (
     InferenceStatProcessor,
 )
@@ -25,13 +35,34 @@ from pipeline_control.domain.neptune_stat_processor.neptune_stat_processor impor
     NeptuneStatProcessor,
     NeptuneStats,
 )
+from pipeline_control.service_layer.eks_control.fake_job_control import (
+    FakeJobControl,
+)
+from pipeline_control.service_layer.handlers.compute_delta_handler import (
+    ComputeDeltaHandler,
+)
+from pipeline_control.service_layer.handlers.convert_answers_handler import (
+    ConvertAnswersHandler,
+)
+from pipeline_control.service_layer.handlers.deduplicate_triples_handler import (
+    DeduplicateTriplesHandler,
+)
+from pipeline_control.service_layer.handlers.follow_inference_handler import (
+    FollowInferenceHandler,
+)
 from pipeline_control.service_layer.handlers.new_job_handler import NewJobHandler
 from pipeline_control.service_layer.handlers.notify_user_handler import (
     NotifyUserHandler,
 )
+from pipeline_control.service_layer.handlers.purge_job_graph_handler import (
+    PurgeJobGraphHandler,
+)
 from pipeline_control.service_layer.handlers.refresh_bulkload_handler import (
     RefreshBulkloadHandler,
 )
+from pipeline_control.service_layer.handlers.retry_failed_feeds_handler import (
+    RetryFailedFeedsHandler,
+)
 
 
 @pytest.fixture
@@ -131,6 +162,57 @@ def refresh_bulkload_handler(refresh_bulkload_command):
     yield RefreshBulkloadHandler(cmd=refresh_bulkload_command)
 
 
+@pytest.fixture
+def seeded_load_source_bucket():
+    with moto.mock_s3():
+        s3 = boto3.resource("s3")
+        bucket = s3.create_bucket(
+            Bucket=pytest.TEST_BUCKET_NAME,
+            CreateBucketConfiguration={
+                "LocationConstraint": "ap-southeast-1",
+            },
+        )
+        for shard in range(3):
+            bucket.put_object(Key=f"load/data/shard{shard}.nt", Body=b"")
+        bucket.put_object(Key="load/data/rdfox.log", Body=b"")
+        yield bucket
+
+
+@pytest.fixture
+def failed_load_job(
+    mocked_repository,
+    bulkloading_job,
+    seeded_load_source_bucket,
+    g_job_configurations_neptune_configuration,
+):
+    g_job_configurations_neptune_configuration.source = (
+        f"s3://{seeded_load_source_bucket.name}/load/data"
+    )
+    failed_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+    failed_job.job_configuration.neptune_configuration = (
+        g_job_configurations_neptune_configuration
+    )
+    failed_job.job_status = JobStatus.NEPTUNE_LOAD_FAILED
+    mocked_repository.save(failed_job)
+    yield failed_job
+
+
+@pytest.fixture
+def retry_failed_feeds_handler(
+    mocked_repository, failed_load_job, g_post_inference_fake_neptune_loader_factory
+):
+    g_post_inference_fake_neptune_loader_factory.failed_feeds = [
+        f"s3://{pytest.TEST_BUCKET_NAME}/load/data/shard1.nt"
+    ]
+    yield RetryFailedFeedsHandler(
+        cmd=RetryFailedFeeds(
+            job_repository=mocked_repository,
+            neptune_loader_factory=g_post_inference_fake_neptune_loader_factory,
+            job_id=failed_load_job.job_id,
+        )
+    )
+
+
 @pytest.fixture
 def mocked_sns_topic():
     with moto.mock_sns() as mocked_sns:
@@ -181,3 +263,126 @@ def completed_job(
 @pytest.fixture
 def notify_user_handler_under_test(notify_user_command):
     yield NotifyUserHandler(cmd=notify_user_command)
+
+
+@pytest.fixture
+def seeded_inference_output_bucket(small_test_triples, monkeypatch):
+    # moto stores aws-chunked uploads verbatim, so send plain bodies
+    monkeypatch.setenv("AWS_REQUEST_CHECKSUM_CALCULATION", "when_required")
+    with moto.mock_s3():
+        s3 = boto3.resource("s3")
+        bucket = s3.create_bucket(
+            Bucket=pytest.TEST_BUCKET_NAME,
+            CreateBucketConfiguration={
+                "LocationConstraint": "ap-southeast-1",
+            },
+        )
+        # Two query files repeat every triple, a third repeats half of them
+        lines = small_test_triples.splitlines(keepends=True)
+        bucket.put_object(Key="output/data/q1.rq.nt", Body=small_test_triples)
+        bucket.put_object(Key="output/data/q2.rq.nt", Body=small_test_triples)
+        bucket.put_object(
+            Key="output/data/q3.rq.nt", Body=b"".join(lines[: len(lines) // 2])
+        )
+        bucket.put_object(Key="output/data/rdfox.log", Body=b"not triples")
+        yield bucket
+
+
+@pytest.fixture(params=["DISK", "BLOOM"])
+def deduplicate_triples_handler(
+    request, mocked_repository, bulkloading_job, seeded_inference_output_bucket
+):
+    yield DeduplicateTriplesHandler(
+        cmd=DeduplicateTriples(
+            job_repository=mocked_repository,
+            job_id=bulkloading_job.job_id,
+            source=f"s3://{seeded_inference_output_bucket.name}/output/data/",
+            shard_count=3,
+            triple_set_kind=request.param,
+        )
+    )
+
+
+@pytest.fixture
+def convert_answers_handler_for(
+    mocked_repository, bulkloading_job, seeded_inference_output_bucket
+):
+    def make_handler(output_format, shard_bytes):
+        return ConvertAnswersHandler(
+            cmd=ConvertAnswers(
+                job_repository=mocked_repository,
+                job_id=bulkloading_job.job_id,
+                source=f"s3://{seeded_inference_output_bucket.name}/output/data/",
+                output_format=output_format,
+                shard_bytes=shard_bytes,
+            )
+        )
+
+    yield make_handler
+
+
+@pytest.fixture
+def compute_delta_handler_for(
+    mocked_repository, g_post_inference_fake_neptune_loader_factory
+):
+    def make_handler(job_id, source):
+        return ComputeDeltaHandler(
+            cmd=ComputeDelta(
+                job_repository=mocked_repository,
+                neptune_loader_factory=g_post_inference_fake_neptune_loader_factory,
+                job_id=job_id,
+                source=source,
+                shard_count=2,
+                triples_per_update=100,
+            )
+        )
+
+    yield make_handler
+
+
+@pytest.fixture
+def purge_job_graph_handler(
+    mocked_repository,
+    g_post_inference_fake_neptune_loader_factory,
+    g_post_inference_scheduled_test_job,
+    g_job_configurations_neptune_configuration,
+):
+    loaded_job = mocked_repository.get_job_by_id(
+        g_post_inference_scheduled_test_job.job_id
+    )
+    neptune_configuration = g_job_configurations_neptune_configuration
+    neptune_configuration.named_graph = f"urn:jobs:{loaded_job.job_id}"
+    loaded_job.job_configuration.neptune_configuration = neptune_configuration
+    loaded_job.job_status = JobStatus.SUCCESS_NOTIFICATION_SENT
+    mocked_repository.save(loaded_job)
+    g_post_inference_fake_neptune_loader_factory.query_counts = {
+        f"urn:jobs:{loaded_job.job_id}": 125000
+    }
+    yield PurgeJobGraphHandler(
+        cmd=PurgeJobGraph(
+            job_repository=mocked_repository,
+            neptune_loader_factory=g_post_inference_fake_neptune_loader_factory,
+            job_id=loaded_job.job_id,
+            triples_per_batch=10000,
+            pause_in_seconds=0,
+        )
+    )
+
+
+@pytest.fixture
+def follow_inference_handler_for(
+    mocked_repository, g_post_inference_scheduled_test_job
+):
+    job = mocked_repository.get_job_by_id(g_post_inference_scheduled_test_job.job_id)
+    job.kubernetes_name = pytest.TEST_KUBERNETES_NAME
+    mocked_repository.save(job)
+
+    def make_handler(log_lines):
+        return FollowInferenceHandler(
+            cmd=FollowInference(
+                job_repository=mocked_repository,
+                job_control=FakeJobControl({pytest.TEST_KUBERNETES_NAME: log_lines}),
+            )
+        )
+
+    yield make_handler
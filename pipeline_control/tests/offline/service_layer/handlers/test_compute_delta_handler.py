@@ -0,0 +1,167 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import gzip
+
+import pytest
+from freezegun.api import freeze_time
+from pyexpect import expect
+
+from pipeline_control.adapters.job_repository.job_repository import Job
+from pipeline_control.adapters.neptune_loader.fake_neptune_loader import (
+    FakeNeptuneLoader,
+)
+from pipeline_control.domain.model import JobStatus
+
+
+def read_additions(bucket, additions_source):
+    prefix = additions_source[len(f"s3://{bucket.name}/") :]
+    triples = []
+    for summary in bucket.objects.filter(Prefix=prefix):
+        triples.extend(gzip.decompress(summary.get()["Body"].read()).splitlines())
+    return triples
+
+
+class TestComputeDelta:
+    def test_1_second_run_loads_additions_and_deletes_removals(
+        self,
+        mocked_repository,
+        seeded_inference_output_bucket,
+        compute_delta_handler_for,
+        g_post_inference_fake_neptune_loader_factory,
+        small_test_triples,
+    ):
+        lines = small_test_triples.splitlines()
+        with freeze_time(pytest.TEST_FROZE_DATE):
+            first_job = Job(key=pytest.TEST_KEY)
+            mocked_repository.save(first_job)
+            second_job = Job(key=pytest.TEST_KEY)
+            mocked_repository.save(second_job)
+
+        first_source = f"s3://{seeded_inference_output_bucket.name}/output/data/"
+        additions_source = compute_delta_handler_for(
+            first_job.job_id, first_source
+        ).handle()
+        first_job = mocked_repository.get_job_by_id(first_job.job_id)
+        expect(first_job.delta_statistics.previous_job_id).equals(None)
+        expect(first_job.delta_statistics.additions).equals(len(set(lines)))
+        added = read_additions(seeded_inference_output_bucket, additions_source)
+        expect(len(added)).equals(len(set(lines)))
+        first_job.job_status = JobStatus.NEPTUNE_LOAD_COMPLETED
+        mocked_repository.save(first_job)
+
+        # The next run drops the first 150 triples and derives 10 new ones
+        new_triples = [b"<urn:new:%d> <urn:p> <urn:o> ." % n for n in range(10)]
+        seeded_inference_output_bucket.put_object(
+            Key="output/run2/data/q1.rq.nt",
+            Body=b"\n".join(lines[150:] + new_triples),
+        )
+        second_source = f"s3://{seeded_inference_output_bucket.name}/output/run2/data/"
+        additions_source = compute_delta_handler_for(
+            second_job.job_id, second_source
+        ).handle()
+
+        stats = mocked_repository.get_job_by_id(second_job.job_id).delta_statistics
+        expect(stats.previous_job_id).equals(first_job.job_id)
+        expect(stats.additions).equals(10)
+        expect(stats.unchanged).equals(len(set(lines[150:])))
+        expect(stats.removals).equals(len(set(lines[:150]) - set(lines[150:])))
+        expect(additions_source).equals(
+            f"s3://{seeded_inference_output_bucket.name}/output/run2/delta/additions/"
+        )
+        added = read_additions(seeded_inference_output_bucket, additions_source)
+        expect(sorted(added)).equals(sorted(new_triples))
+
+        updates = (
+            g_post_inference_fake_neptune_loader_factory.fake_loader.sparql_updates
+        )
+        expect(len(updates)).equals(stats.removal_updates)
+        expect(stats.removal_updates).equals(-(-stats.removals // 100))
+        expect(updates[0].startswith("DELETE DATA {")).to.be.true()
+        expect(lines[0].decode() in updates[0]).to.be.true()
+        expect(stats.removals_update_file).equals(
+            f"s3://{seeded_inference_output_bucket.name}/output/run2/delta/removals.ru"
+        )
+
+    def test_2_unchanged_output_skips_the_load(
+        self,
+        mocked_repository,
+        seeded_inference_output_bucket,
+        compute_delta_handler_for,
+    ):
+        with freeze_time(pytest.TEST_FROZE_DATE):
+            first_job = Job(key=pytest.TEST_KEY)
+            mocked_repository.save(first_job)
+            second_job = Job(key=pytest.TEST_KEY)
+            mocked_repository.save(second_job)
+        source = f"s3://{seeded_inference_output_bucket.name}/output/data/"
+        compute_delta_handler_for(first_job.job_id, source).handle()
+        first_job = mocked_repository.get_job_by_id(first_job.job_id)
+        first_job.job_status = JobStatus.SUCCESS_NOTIFICATION_SENT
+        mocked_repository.save(first_job)
+
+        expect(compute_delta_handler_for(second_job.job_id, source).handle()).equals(
+            None
+        )
+        second_job = mocked_repository.get_job_by_id(second_job.job_id)
+        expect(second_job.job_status).equals(JobStatus.NEPTUNE_LOAD_COMPLETED)
+        expect(second_job.delta_statistics.removals).equals(0)
+
+    def test_3_cut_off_run_resumes_the_removals(
+        self,
+        monkeypatch,
+        mocked_repository,
+        seeded_inference_output_bucket,
+        compute_delta_handler_for,
+        g_post_inference_fake_neptune_loader_factory,
+        small_test_triples,
+    ):
+        lines = small_test_triples.splitlines()
+        with freeze_time(pytest.TEST_FROZE_DATE):
+            first_job = Job(key=pytest.TEST_KEY)
+            mocked_repository.save(first_job)
+            second_job = Job(key=pytest.TEST_KEY)
+            mocked_repository.save(second_job)
+        first_source = f"s3://{seeded_inference_output_bucket.name}/output/data/"
+        compute_delta_handler_for(first_job.job_id, first_source).handle()
+        first_job = mocked_repository.get_job_by_id(first_job.job_id)
+        first_job.job_status = JobStatus.NEPTUNE_LOAD_COMPLETED
+        mocked_repository.save(first_job)
+        seeded_inference_output_bucket.put_object(
+            Key="output/run2/data/q1.rq.nt", Body=b"\n".join(lines[150:])
+        )
+        second_source = f"s3://{seeded_inference_output_bucket.name}/output/run2/data/"
+
+        def cut_off_after_first_update(loader, updates, max_in_flight=1):
+            for update in updates:
+                if loader.sparql_updates:
+                    raise TimeoutError("Task timed out")
+                loader.sparql_updates.append(update)
+
+        monkeypatch.setattr(
+            "pipeline_control.service_layer.handlers.compute_delta_handler.SAVE_PROGRESS_EVERY",
+            1,
+        )
+        monkeypatch.setattr(
+            FakeNeptuneLoader, "execute_sparql_updates", cut_off_after_first_update
+        )
+        with pytest.raises(TimeoutError):
+            compute_delta_handler_for(second_job.job_id, second_source).handle()
+        stats = mocked_repository.get_job_by_id(second_job.job_id).delta_statistics
+        expect(stats.index).equals(
+            f"s3://{seeded_inference_output_bucket.name}/output/run2/delta/fingerprints.bin.gz"
+        )
+        expect(stats.removal_updates).equals(1)
+        expect(stats.removals_done).equals(False)
+
+        monkeypatch.undo()
+        fake_loader = g_post_inference_fake_neptune_loader_factory.fake_loader
+        expect(
+            compute_delta_handler_for(second_job.job_id, second_source).handle()
+        ).equals(None)
+        stats = mocked_repository.get_job_by_id(second_job.job_id).delta_statistics
+        expect(stats.removals_done).equals(True)
+        expect(stats.removals).equals(len(set(lines[:150]) - set(lines[150:])))
+        expect(stats.removal_updates).equals(2)
+        expect(len(fake_loader.sparql_updates)).equals(2)
+        expect(fake_loader.sparql_updates[0]).not_equals(fake_loader.sparql_updates[1])
@@ -0,0 +1,120 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import gzip
+from unittest import mock
+
+import pytest
+from pyexpect import expect
+
+from app_config import app_configuration
+from pipeline_control.domain.answer_converter.answer_converter import (
+    AnswerConverter,
+    OutputFormat,
+)
+from pipeline_control.domain.commands import InitiateBulkload
+from pipeline_control.domain.model import JobStatus
+from pipeline_control.service_layer.handlers.initiate_bulk_load_handler import (
+    InitiateBulkloadHandler,
+)
+
+CSV_ANSWERS = (
+    b"S,P,O\r\n"
+    b"urn:chain:1,urn:p:amount,120\r\n"
+    b'urn:chain:1,urn:p:note,"two\r\nlines, quoted"\r\n'
+    b"urn:chain:1,urn:p:next,urn:chain:2\r\n"
+    b"urn:chain:2,urn:p:next,\r\n"
+)
+TSV_ANSWERS = (
+    b"?S\t?P\t?O\n"
+    b"<urn:chain:2>\t<urn:p:amount>\t120\n"
+    b'<urn:chain:2>\t<urn:p:label>\t"Chain"@en\n'
+)
+
+
+class TestConvertAnswers:
+    def test_1_answers_become_gzip_nquads_shards_in_the_job_graph(
+        self,
+        mocked_repository,
+        bulkloading_job,
+        seeded_inference_output_bucket,
+        convert_answers_handler_for,
+        small_test_triples,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(app_configuration, "job_graph_prefix", "urn:jobs:")
+        bucket = seeded_inference_output_bucket
+        bucket.put_object(Key="output/data/q4.rq.csv", Body=CSV_ANSWERS)
+        bucket.put_object(Key="output/data/q5.rq.tsv", Body=TSV_ANSWERS)
+        target = convert_answers_handler_for("nquads", 64 * 1024).handle()
+
+        expect(target).equals(f"s3://{pytest.TEST_BUCKET_NAME}/output/converted/")
+        converted_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+        stats = converted_job.answer_conversion
+        graph = f"urn:jobs:{bulkloading_job.job_id}"
+        ntriples = len(small_test_triples.splitlines())
+        expect(stats.graph).equals(graph)
+        expect(stats.answer_formats).equals({"NTRIPLES": 3, "CSV": 1, "TSV": 1})
+        expect(stats.statements).equals(ntriples * 2 + ntriples // 2 + 5)
+        expect(stats.skipped_rows).equals(1)
+        expect(len(stats.shards) > 1).to.be.true()
+        configuration = converted_job.job_configuration.neptune_configuration
+        expect(configuration.source_format).equals("nquads")
+        expect(configuration.named_graph).equals(graph)
+
+        quads = []
+        for shard in stats.shards:
+            expect(shard.endswith(".nq.gz")).to.be.true()
+            key = shard[len(f"s3://{pytest.TEST_BUCKET_NAME}/") :]
+            body = bucket.Object(key).get()["Body"].read()
+            quads.extend(gzip.decompress(body).decode("utf-8").splitlines())
+        expect(len(quads)).equals(stats.statements)
+        expect(all(quad.endswith(f" <{graph}> .") for quad in quads)).to.be.true()
+        expect(quads).contains(
+            f'<urn:chain:1> <urn:p:note> "two\\nlines, quoted" <{graph}> .'
+        )
+        expect(quads).contains(f"<urn:chain:1> <urn:p:next> <urn:chain:2> <{graph}> .")
+        integer = '"120"^^<http://www.w3.org/2001/XMLSchema#integer>'
+        expect(quads).contains(f"<urn:chain:2> <urn:p:amount> {integer} <{graph}> .")
+        expect(quads).contains(f'<urn:chain:2> <urn:p:label> "Chain"@en <{graph}> .')
+
+    def test_2_quads_need_a_graph(self):
+        with pytest.raises(ValueError):
+            AnswerConverter(OutputFormat.NQUADS)
+        converter = AnswerConverter(OutputFormat.NTRIPLES)
+        lines = b"<urn:a> <urn:b> <urn:c> .\n# comment\n".splitlines()
+        expect(list(converter.convert(lines))).equals([b"<urn:a> <urn:b> <urn:c> .\n"])
+
+    def test_3_converted_ntriples_shards_are_bulk_loaded(
+        self,
+        mocked_repository,
+        bulkloading_job,
+        convert_answers_handler_for,
+        g_post_inference_fake_neptune_loader_factory,
+    ):
+        # The shards are gzip, their lines cannot be read as N-Triples for
+        # SPARQL updates and their sizes say nothing about the triples
+        target = convert_answers_handler_for("ntriples", 64 * 1024).handle()
+        handler = InitiateBulkloadHandler(
+            cmd=InitiateBulkload(
+                job_repository=mocked_repository,
+                neptune_loader_factory=g_post_inference_fake_neptune_loader_factory,
+                source=target,
+                job_id=bulkloading_job.job_id,
+                sparql_update_max_bytes=1024 * 1024 * 1024,
+            )
+        )
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.neptune_instance_type_from_endpoint",
+            return_value=pytest.TEST_NEPTUNE_WRITER_INSTANCE,
+        ):
+            handler.handle()
+
+        loaded_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+        configuration = loaded_job.job_configuration.neptune_configuration
+        expect(configuration.source_format).equals("ntriples")
+        expect(configuration.source).equals(target)
+        expect(loaded_job.job_status).equals(JobStatus.NEPTUNE_LOAD_IN_PROGRESS)
+        expect(
+            g_post_inference_fake_neptune_loader_factory.fake_loader.sparql_updates
+        ).equals([])
@@ -0,0 +1,56 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import gzip
+
+import pytest
+from pyexpect import expect
+
+from pipeline_control.domain.triple_deduplicator.triple_deduplicator import (
+    BloomTripleSet,
+    DiskTripleSet,
+)
+
+
+def unique_lines(triples):
+    return {line.strip() for line in triples.splitlines() if line.strip()}
+
+
+class TestDeduplicateTriples:
+    def test_1_writes_unique_triples_to_balanced_gzip_shards(
+        self,
+        mocked_repository,
+        bulkloading_job,
+        seeded_inference_output_bucket,
+        deduplicate_triples_handler,
+        small_test_triples,
+    ):
+        target = deduplicate_triples_handler.handle()
+        expected = unique_lines(small_test_triples)
+        input_triples = len(small_test_triples.splitlines())
+
+        expect(target).equals(f"s3://{pytest.TEST_BUCKET_NAME}/output/dedup/")
+        stats = mocked_repository.get_job_by_id(
+            bulkloading_job.job_id
+        ).triple_dedup_statistics
+        expect(stats.input_triples).equals(input_triples * 2 + input_triples // 2)
+        expect(stats.unique_triples).equals(len(expected))
+        expect(stats.dedup_ratio > 0.5).to.be.true()
+        expect(len(stats.shards)).equals(3)
+
+        written, shard_sizes = [], []
+        for shard in stats.shards:
+            key = shard[len(f"s3://{pytest.TEST_BUCKET_NAME}/") :]
+            body = seeded_inference_output_bucket.Object(key).get()["Body"].read()
+            shard_lines = gzip.decompress(body).splitlines()
+            written.extend(shard_lines)
+            shard_sizes.append(sum(len(line) + 1 for line in shard_lines))
+        expect(sorted(written)).equals(sorted(expected))
+        expect(max(shard_sizes) - min(shard_sizes) < 400).to.be.true()
+
+    def test_2_triple_sets_report_new_members_once(self):
+        for triple_set in (DiskTripleSet(), BloomTripleSet(expected_items=1000)):
+            expect(triple_set.add(b"<a> <b> <c> .")).to.be.true()
+            expect(triple_set.add(b"<a> <b> <d> .")).to.be.true()
+            expect(triple_set.add(b"<a> <b> <c> .")).to.be.false()
+            triple_set.close()
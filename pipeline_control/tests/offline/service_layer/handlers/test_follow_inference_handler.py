@@ -0,0 +1,81 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+from freezegun import freeze_time
+from pyexpect import expect
+
+from pipeline_control.domain.model import JobStatus
+
+
+def timestamped(log):
+    # one line a second from midnight, as the Kubernetes API returns them
+    return [
+        f"2021-07-01T00:{i // 60:02d}:{i % 60:02d}.123456789Z {line}"
+        for i, line in enumerate(log.decode("utf-8").splitlines())
+    ]
+
+
+class TestFollowInference:
+    def test_1_progress_is_written_as_the_log_grows(
+        self,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+        follow_inference_handler_for,
+        g_inference_stats,
+    ):
+        job_id = g_post_inference_scheduled_test_job.job_id
+        log_lines = timestamped(g_inference_stats)
+        materializing = log_lines.index(
+            next(line for line in log_lines if line.endswith("Materializing rules."))
+        )
+
+        with freeze_time("2021-07-01 00:10:00"):
+            follow_inference_handler_for(log_lines[: materializing + 1]).handle()
+        progress = mocked_repository.get_job_by_id(job_id).inference_progress
+        expect(progress.phase).equals("materialization")
+        expect(progress.facts_processed).equals(655822120)
+        expect(progress.elapsed_seconds).equals(599)
+        expect(progress.phase_seconds).equals(599 - materializing)
+        expect(progress.time_stats).equals({"time_to_load": 254})
+        expect(progress.lines_read).equals(materializing + 1)
+
+        # The next poll gets the whole log again, only the new lines count
+        handler = follow_inference_handler_for(log_lines)
+        with freeze_time("2021-07-01 01:00:00"):
+            handler.handle()
+        _, _, since_seconds = handler.job_control.reads[0]
+        expect(since_seconds).equals(3600 - materializing + 1)
+        job = mocked_repository.get_job_by_id(job_id)
+        progress = job.inference_progress
+        expect(progress.phase).equals("done")
+        expect(progress.facts_processed).equals(655822120)
+        expect(progress.lines_read).equals(len(log_lines))
+        expect(progress.elapsed_seconds).equals(3599)
+        expect(job.rdfox_statistics.time_to_infer).equals(1621)
+        expect(job.rdfox_statistics.time_query).equals(4355)
+
+    def test_2_a_job_that_moved_on_during_the_read_is_left_alone(
+        self,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+        follow_inference_handler_for,
+        g_inference_stats,
+    ):
+        job_id = g_post_inference_scheduled_test_job.job_id
+        handler = follow_inference_handler_for(timestamped(g_inference_stats))
+        read_job_log = handler.job_control.read_job_log
+
+        def read_while_inference_completes(**kwargs):
+            job = mocked_repository.get_job_by_id(job_id)
+            job.job_status = JobStatus.INFERENCE_COMPLETE
+            job.rdfox_statistics.time_to_infer = 1617
+            mocked_repository.save(job)
+            return read_job_log(**kwargs)
+
+        handler.job_control.read_job_log = read_while_inference_completes
+        with freeze_time("2021-07-01 01:00:00"):
+            handler.handle()
+        job = mocked_repository.get_job_by_id(job_id)
+        expect(job.job_status).equals(JobStatus.INFERENCE_COMPLETE)
+        expect(job.rdfox_statistics.time_to_infer).equals(1617)
+        expect(job.inference_progress.lines_read).equals(0)
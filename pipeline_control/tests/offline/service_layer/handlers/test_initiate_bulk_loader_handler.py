@@ -1,15 +1,39 @@
 # Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
+from unittest import mock
+
 import pytest
 from freezegun import freeze_time
 from pyexpect import expect
 
+from app_config import app_configuration
+from pipeline_control.adapters.neptune_loader.fake_neptune_loader import (
+    FakeNeptuneLoader,
+)
+from pipeline_control.adapters.neptune_loader.neptune_loader_configuration import (
+    NeptuneParallelism,
+)
 from pipeline_control.domain.inference_stat_processor.inference_stat_processor import (
     InferenceStatProcessor,
     InferenceStats,
 )
+from pipeline_control.domain.load_estimator.load_estimator import (
+    LoadEstimate,
+    LoadEstimator,
+    LoadObservation,
+)
 from pipeline_control.domain.model import Job, JobStatus
+from pipeline_control.domain.neptune_stat_processor.neptune_stat_processor import (
+    NeptuneStats,
+)
+from pipeline_control.domain.parallelism_policy.parallelism_policy import (
+    ParallelismPolicy,
+)
+from pipeline_control.service_layer.handlers.initiate_bulk_load_handler import (
+    SPARQL_UPDATE_BYTES_LIMIT,
+    InitiateBulkloadHandler,
+)
 
 
 @freeze_time(pytest.TEST_FROZE_DATE)
@@ -33,3 +57,288 @@ class TestInitiateBulkloadHandler:
         expect(queried_job.neptune_writer_instance).to.equal(
             pytest.TEST_NEPTUNE_WRITER_INSTANCE
         )
+
+    def test_2_sharded_load_chains_shards(
+        self,
+        g_post_inference_initiate_bulkload_handler_under_test,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+    ):
+        handler = g_post_inference_initiate_bulkload_handler_under_test
+        handler._update_job_config()
+        neptune_configuration = handler.job.job_configuration.neptune_configuration
+        neptune_configuration.shard_count = 2
+        neptune_configuration.shard_strategy = "LISTING"
+        object_sizes = {
+            "s3://TEST_BUCKET/data/part-0.nt": 10,
+            "s3://TEST_BUCKET/data/part-1.nt": 10,
+            "s3://TEST_BUCKET/data/part-2.nt": 10,
+            "s3://TEST_BUCKET/data/rdfox.log": 1,
+        }
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_object_sizes_under_prefix",
+            return_value=object_sizes,
+        ):
+            handler.handle()
+        queried_job: Job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        shard_loads = queried_job.neptune_shard_loads
+        expect([shard_load["shard"] for shard_load in shard_loads]).to.equal([0, 0, 1])
+        expect(queried_job.neptune_load_id).to.equal(shard_loads[-1]["loadId"])
+        expect(queried_job.job_status).to.equal(JobStatus.NEPTUNE_LOAD_IN_PROGRESS)
+
+    def test_3_auto_parallelism_is_decided_and_recorded(
+        self,
+        g_post_inference_initiate_bulkload_handler_under_test,
+        g_post_inference_fake_neptune_loader_factory,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+    ):
+        handler = g_post_inference_initiate_bulkload_handler_under_test
+        handler._update_job_config()
+        neptune_configuration = handler.job.job_configuration.neptune_configuration
+        neptune_configuration.parallelism = NeptuneParallelism.AUTO
+        neptune_configuration.queue_request = False
+        g_post_inference_fake_neptune_loader_factory.active_loads = ["other-load"]
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_object_sizes_under_prefix",
+            return_value={
+                "s3://TEST_BUCKET/data/part-0.nt": 10 * 1024 ** 3,
+                "s3://TEST_BUCKET/data/rdfox.log": 1024,
+            },
+        ):
+            handler.handle()
+        queried_job: Job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        decision = queried_job.neptune_parallelism_decision
+        expect(decision.source_objects).to.equal(1)
+        expect(decision.source_bytes).to.equal(10 * 1024 ** 3)
+        # Every load records its size for the estimates of later loads
+        expect(queried_job.neptune_load_estimate.source_bytes).to.equal(10 * 1024 ** 3)
+        expect(decision.parallelism).to.equal("OVERSUBSCRIBE")
+        expect(decision.queue_request).to.be.true()
+        expect(decision.active_loads).to.equal(1)
+        expect(
+            queried_job.job_configuration.neptune_configuration.parallelism
+        ).to.equal(NeptuneParallelism.OVERSUBSCRIBE)
+
+    def test_4_small_writers_and_sources_get_less_parallelism(self):
+        policy = ParallelismPolicy()
+        small_writer = policy.decide("db.t3.medium", 0, 4, 10 * 1024 ** 3)
+        expect(small_writer.parallelism).to.equal("LOW")
+        small_source = policy.decide("db.r5.12xlarge", 0, 1, 1024)
+        expect(small_source.parallelism).to.equal("MEDIUM")
+        expect(small_source.queue_request).to.be.false()
+
+    def test_5_small_outputs_are_written_with_sparql_update(
+        self,
+        g_post_inference_initiate_bulkload_handler_under_test,
+        g_post_inference_fake_neptune_loader_factory,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+    ):
+        handler = g_post_inference_initiate_bulkload_handler_under_test
+        handler.sparql_update_max_bytes = 1024
+        handler._update_job_config()
+        neptune_configuration = handler.job.job_configuration.neptune_configuration
+        neptune_configuration.source_format = "ntriples"
+        triples = [b"<urn:s:%d> <urn:p> <urn:o> ." % n for n in range(2500)]
+        object_sizes = {
+            "s3://TEST_BUCKET/data/q1.rq.nt": 600,
+            "s3://TEST_BUCKET/data/rdfox.log": 10 * 1024,
+        }
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_object_sizes_under_prefix",
+            return_value=object_sizes,
+        ), mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_lines",
+            return_value=iter(triples + [b"", b"# comment"]),
+        ) as s3_lines:
+            handler.handle()
+        s3_lines.assert_called_once_with(["s3://TEST_BUCKET/data/q1.rq.nt"])
+        queried_job: Job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        updates = (
+            g_post_inference_fake_neptune_loader_factory.fake_loader.sparql_updates
+        )
+        expect(len(updates)).to.equal(3)
+        expect(updates[0].startswith("INSERT DATA {")).to.be.true()
+        expect(queried_job.job_status).to.equal(JobStatus.NEPTUNE_LOAD_COMPLETED)
+        expect(queried_job.neptune_statistics.records_total).to.equal(2500)
+
+        # Over the threshold the bulk loader takes over again
+        handler.sparql_update_max_bytes = 100
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_object_sizes_under_prefix",
+            return_value=object_sizes,
+        ):
+            handler.handle()
+        queried_job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        expect(queried_job.job_status).to.equal(JobStatus.NEPTUNE_LOAD_IN_PROGRESS)
+
+    def test_6_jobs_get_their_own_named_graph(
+        self,
+        g_post_inference_initiate_bulkload_handler_under_test,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(app_configuration, "job_graph_prefix", "urn:jobs:")
+        g_post_inference_initiate_bulkload_handler_under_test.handle()
+        queried_job: Job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        expect(
+            queried_job.job_configuration.neptune_configuration.named_graph
+        ).to.equal(f"urn:jobs:{g_post_inference_scheduled_test_job.job_id}")
+
+    def test_7_load_estimates_reroute_only_on_evidence(self):
+        observations = [
+            LoadObservation("db.r5.4xlarge", "MEDIUM", 1000000, 100, 120000000),
+            LoadObservation("db.r5.4xlarge", "MEDIUM", 3000000, 100, 360000000),
+            LoadObservation("db.r5.4xlarge", "OVERSUBSCRIBE", 4000000, 100),
+        ]
+        estimator = LoadEstimator(observations=observations)
+        estimate = estimator.estimate("db.r5.4xlarge", "MEDIUM", 2, 1200000000)
+        expect(estimate.basis).to.equal("history")
+        expect(estimate.records_per_second).to.equal(20000)
+        expect(estimate.predicted_seconds).to.equal(500)
+        expect(estimator.within_budget(estimate, 600).action).to.equal("ACCEPT")
+        rerouted = estimator.within_budget(estimate, 300)
+        expect(rerouted.action).to.equal("REROUTE")
+        expect(rerouted.rerouted_parallelism).to.equal("OVERSUBSCRIBE")
+        unknown = estimator.estimate("db.r5.large", "MEDIUM", 2, 1200000000)
+        expect(unknown.basis).to.equal("default")
+        expect(estimator.within_budget(unknown, 300).action).to.equal("REJECT")
+
+    def test_8_loads_over_budget_are_not_submitted(
+        self,
+        g_post_inference_initiate_bulkload_handler_under_test,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+    ):
+        handler = g_post_inference_initiate_bulkload_handler_under_test
+        handler.load_budget_seconds = 60
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_object_sizes_under_prefix",
+            return_value={"s3://TEST_BUCKET/data/part-0.nt": 10 * 1024 ** 3},
+        ):
+            handler.handle()
+        queried_job: Job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        expect(queried_job.job_status).to.equal(JobStatus.NEPTUNE_LOAD_REJECTED)
+        expect(queried_job.neptune_load_estimate.action).to.equal("REJECT")
+        expect(queried_job.neptune_load_id).to.equal("N/A")
+
+    def test_9_ntriples_files_use_sparql_update_with_the_default_format(
+        self,
+        g_post_inference_initiate_bulkload_handler_under_test,
+        g_post_inference_fake_neptune_loader_factory,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+    ):
+        # The app configuration loads as turtle, RDFox answers are still .nt files
+        handler = g_post_inference_initiate_bulkload_handler_under_test
+        handler.sparql_update_max_bytes = 1024
+        object_sizes = {"s3://TEST_BUCKET/data/q1.rq.nt": 600}
+        triples = [b"<urn:s> <urn:p> <urn:o> ."]
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_object_sizes_under_prefix",
+            return_value=object_sizes,
+        ), mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_lines",
+            return_value=iter(triples),
+        ):
+            handler.handle()
+        queried_job: Job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        neptune_configuration = queried_job.job_configuration.neptune_configuration
+        expect(neptune_configuration.source_format).to.equal(
+            app_configuration.neptune_source_format
+        )
+        updates = (
+            g_post_inference_fake_neptune_loader_factory.fake_loader.sparql_updates
+        )
+        expect(len(updates)).to.equal(1)
+        expect(queried_job.job_status).to.equal(JobStatus.NEPTUNE_LOAD_COMPLETED)
+
+        # Turtle files may use prefixes, so they are bulk loaded
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_object_sizes_under_prefix",
+            return_value={"s3://TEST_BUCKET/data/q1.ttl": 600},
+        ):
+            handler.handle()
+        queried_job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        expect(queried_job.job_status).to.equal(JobStatus.NEPTUNE_LOAD_IN_PROGRESS)
+
+    def test_10_load_history_keeps_the_most_recent_loads(
+        self,
+        g_post_inference_initiate_bulkload_handler_under_test,
+        g_job_configurations_neptune_configuration,
+        mocked_repository,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(app_configuration, "load_estimate_history", 2)
+        with freeze_time("2021-06-01 12:00:00") as frozen_time:
+            # The newest loads are of the alphabetically first key
+            for key, seconds in [("z-key", 100), ("a-key", 200), ("a-key", 300)]:
+                loaded_job = Job(key=key)
+                mocked_repository.save(loaded_job)
+                loaded_job.job_status = JobStatus.NEPTUNE_LOAD_COMPLETED
+                loaded_job.job_configuration.neptune_configuration = (
+                    g_job_configurations_neptune_configuration
+                )
+                loaded_job.neptune_load_id = f"load-{seconds}"
+                loaded_job.neptune_statistics = NeptuneStats(
+                    records_total=1000, time_total=seconds
+                )
+                loaded_job.neptune_load_estimate = LoadEstimate(
+                    source_bytes=seconds * 1024
+                )
+                mocked_repository.save(loaded_job)
+                frozen_time.tick(60)
+        handler = g_post_inference_initiate_bulkload_handler_under_test
+        observations = handler._load_history()
+        expect([o.seconds for o in observations]).to.equal([300, 200])
+        expect([o.source_bytes for o in observations]).to.equal(
+            [300 * 1024, 200 * 1024]
+        )
+
+    def test_11_failed_sparql_updates_fall_back_to_the_bulk_loader(
+        self,
+        process_inference_bulkload_command,
+        g_post_inference_fake_neptune_cluster_response,
+        g_post_inference_fake_neptune_loader_factory,
+        mocked_repository,
+        g_post_inference_scheduled_test_job,
+    ):
+        process_inference_bulkload_command.sparql_update_max_bytes = 1024 ** 3
+        handler = InitiateBulkloadHandler(cmd=process_inference_bulkload_command)
+        expect(handler.sparql_update_max_bytes).to.equal(SPARQL_UPDATE_BYTES_LIMIT)
+
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_object_sizes_under_prefix",
+            return_value={"s3://TEST_BUCKET/data/q1.rq.nt": 600},
+        ), mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_lines",
+            return_value=iter([b"<urn:s> <urn:p> <urn:o> ."]),
+        ), mock.patch.object(
+            FakeNeptuneLoader,
+            "execute_sparql_updates",
+            side_effect=Exception("Neptune is unavailable"),
+        ):
+            handler.handle()
+        queried_job: Job = mocked_repository.get_job_by_id(
+            g_post_inference_scheduled_test_job.job_id
+        )
+        expect(queried_job.job_status).to.equal(JobStatus.NEPTUNE_LOAD_IN_PROGRESS)
+        expect(queried_job.neptune_load_id).to.equal(pytest.TEST_NEPTUNE_LOAD_ID)
@@ -3,11 +3,24 @@
 
 import logging
 
+import boto3
+import moto
 import pytest
 from freezegun import freeze_time
 from pyexpect import expect
 
-from pipeline_control.domain.model import JobStatus
+from app_config import app_configuration
+from pipeline_control.adapters.kubernetes_objects.rdfox_job import RDFoxJobConfiguration
+from pipeline_control.domain.commands import CreateNewJob
+from pipeline_control.domain.inference_stat_processor.inference_stat_processor import (
+    InferenceStats,
+)
+from pipeline_control.domain.model import Job, JobStatus
+from pipeline_control.domain.resource_predictor.resource_predictor import (
+    ResourceEstimate,
+    quantity_to_bytes,
+)
+from pipeline_control.service_layer.handlers.new_job_handler import NewJobHandler
 
 logger = logging.getLogger("test_scheduler")
 logger.setLevel(logging.WARN)
@@ -36,3 +49,107 @@ class TestNewJobHandler:
         expect(queried_job.kubernetes_worker_type).to.contain(
             pytest.TEST_WORKER_NODE_TYPE
         )
+
+    def test_2_resources_are_sized_from_past_jobs(self, mocked_repository, monkeypatch):
+        monkeypatch.setenv("AWS_REQUEST_CHECKSUM_CALCULATION", "when_required")
+        with moto.mock_s3():
+            bucket = boto3.resource("s3").create_bucket(
+                Bucket=pytest.TEST_BUCKET_NAME,
+                CreateBucketConfiguration={"LocationConstraint": "ap-southeast-1"},
+            )
+            bucket.put_object(
+                Key=f"{pytest.TEST_KEY}/rules.dlog",
+                Body=b"[?x, a, :B] :- [?x, a, :A] .",
+            )
+            bucket.put_object(Key=f"{pytest.TEST_KEY}/data1.ttl", Body=b"x" * 3000)
+            bucket.put_object(Key=f"{pytest.TEST_KEY}/data2.ttl", Body=b"x" * 1000)
+            bucket.put_object(Key=pytest.TEST_JOBSPEC_KEY, Body=b"{}")
+            handler = NewJobHandler(
+                cmd=CreateNewJob(
+                    s3_bucket_name=pytest.TEST_BUCKET_NAME,
+                    key=pytest.TEST_JOBSPEC_KEY,
+                    job_repository=mocked_repository,
+                    job_configuration_name=pytest.JOBSPEC_NAME,
+                    api_client_factory=None,
+                    resource_sizing="AUTOFILL",
+                )
+            )
+            rules_digest = handler._rules_digest(
+                [f"s3://{pytest.TEST_BUCKET_NAME}/{pytest.TEST_KEY}/rules.dlog"]
+            )
+            # (rules, input bytes, cores, memory, seconds), other rules are ignored
+            for digest, input_bytes, cores, memory, seconds in [
+                (rules_digest, 1000, 4, 8000, 200),
+                (rules_digest, 2000, 8, 12000, 100),
+                (rules_digest, 2000, 16, 10000, 95),
+                ("other rules", 1000, 4, 100000, 10),
+            ]:
+                past_job = Job(
+                    key=pytest.TEST_KEY,
+                    job_configuration=RDFoxJobConfiguration(requested_cores=cores),
+                )
+                mocked_repository.save(past_job)
+                past_job.job_status = JobStatus.INFERENCE_COMPLETE
+                past_job.rdfox_statistics = InferenceStats(
+                    time_to_load=seconds // 2,
+                    time_to_infer=seconds - seconds // 2,
+                    triples_total_amount=input_bytes // 10,
+                    memory_usage=memory,
+                )
+                past_job.resource_estimate = ResourceEstimate(
+                    input_bytes=input_bytes, rules_digest=digest
+                )
+                mocked_repository.save(past_job)
+
+            job_configuration = RDFoxJobConfiguration(
+                job_bucket=pytest.TEST_BUCKET_NAME,
+                job_key=pytest.TEST_KEY,
+                requested_cores=4,
+                requested_memory="2Gi",
+            )
+            estimate = handler.size_resources(job_configuration)
+
+        expect(estimate.input_bytes).equals(4000)
+        expect(estimate.input_objects).equals(2)
+        expect(estimate.basis).equals("rules history")
+        expect(estimate.observations).equals(3)
+        expect(estimate.predicted_memory_bytes).equals(4000 * 8 * 1.25)
+        expect(estimate.predicted_facts).equals(400)
+        # 16 cores is the fastest, 8 cores comes within 10% of it
+        expect(estimate.predicted_cores).equals(8)
+        expect(estimate.action).equals("AUTOFILLED")
+        expect(job_configuration.requested_memory).equals("1Gi")
+        expect(job_configuration.requested_cores).equals(8)
+        expect(quantity_to_bytes(2048)).equals(2048)
+        expect(quantity_to_bytes("512M")).equals(512 * 1000 ** 2)
+
+    def test_3_resource_history_keeps_the_most_recent_jobs(
+        self, mocked_repository, monkeypatch
+    ):
+        monkeypatch.setattr(app_configuration, "resource_sizing_history", 2)
+        with freeze_time("2021-06-01 12:00:00") as frozen_time:
+            # The newest jobs are of the alphabetically first key
+            for key, cores in [("z-key", 2), ("a-key", 4), ("a-key", 8)]:
+                past_job = Job(
+                    key=key,
+                    job_configuration=RDFoxJobConfiguration(requested_cores=cores),
+                )
+                mocked_repository.save(past_job)
+                past_job.job_status = JobStatus.SUCCESS_NOTIFICATION_SENT
+                past_job.rdfox_statistics = InferenceStats(
+                    time_to_load=10, time_to_infer=10, memory_usage=1000
+                )
+                past_job.resource_estimate = ResourceEstimate(input_bytes=100)
+                mocked_repository.save(past_job)
+                frozen_time.tick(60)
+        handler = NewJobHandler(
+            cmd=CreateNewJob(
+                s3_bucket_name=pytest.TEST_BUCKET_NAME,
+                key=pytest.TEST_JOBSPEC_KEY,
+                job_repository=mocked_repository,
+                job_configuration_name=pytest.JOBSPEC_NAME,
+                api_client_factory=None,
+            )
+        )
+        observations = handler._resource_history()
+        expect([o.cores for o in observations]).to.equal([8, 4])
@@ -38,3 +38,18 @@ class TestNotificationHandler:
         retrieved_job = mocked_repository.get_job_by_id(completed_job.job_id)
         expect(retrieved_job.job_status).equals(JobStatus.SUCCESS_NOTIFICATION_SENT)
         mocked_sns_notifier.send_message.assert_called_once()
+
+    def test_3_rejected_load_is_notified_as_an_error(
+        self,
+        mocked_repository,
+        completed_job,
+        notify_user_handler_under_test,
+        mocked_sns_notifier,
+    ):
+        rejected_job = mocked_repository.get_job_by_id(completed_job.job_id)
+        rejected_job.job_status = JobStatus.NEPTUNE_LOAD_REJECTED
+        mocked_repository.save(rejected_job)
+        notify_user_handler_under_test.handle()
+        retrieved_job = mocked_repository.get_job_by_id(completed_job.job_id)
+        expect(retrieved_job.job_status).equals(JobStatus.ERROR_NOTIFICATION_SENT)
+        mocked_sns_notifier.send_message.assert_called_once()
@@ -1,6 +1,8 @@
 # Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
+import boto3
+import moto
 import pytest
 from freezegun import freeze_time
 from pyexpect import expect
@@ -10,6 +12,8 @@ from pipeline_control.domain.inference_stat_processor.inference_stat_processor i
     InferenceStats,
 )
 from pipeline_control.domain.model import Job, JobStatus
+from pipeline_control.domain.rdfox_telemetry.rdfox_telemetry import RDFoxTelemetry
+from pipeline_control.service_layer.s3_log_tail import S3LogTail
 
 
 @freeze_time(pytest.TEST_FROZE_DATE)
@@ -68,3 +72,76 @@ class TestProcessInferenceHandler:
             g_inference_stats.decode("utf-8")
         )
         self.verify_fake_stats(queried_job.rdfox_statistics)
+
+    def test_3_streamed_log_lines_give_the_same_stats(
+        self,
+        g_inference_stats,
+    ):
+        lines = iter(g_inference_stats.replace(b"\n", b"\r\n").split(b"\n"))
+        inference_stat_processor = InferenceStatProcessor("", lines=lines)
+        stats = inference_stat_processor.process_inference()
+        self.verify_parsed_stats(stats)
+        # Only the marker lines are kept, and they parse to the same stats
+        raw = inference_stat_processor.inference_stats
+        expect("Materialization time" in raw).to.be.false()
+        expect(len(raw) < len(g_inference_stats)).to.be.true()
+        self.verify_parsed_stats(InferenceStatProcessor(raw).process_inference())
+
+    def test_4_only_the_tail_of_a_long_log_is_read(
+        self,
+        g_inference_stats,
+        monkeypatch,
+    ):
+        monkeypatch.setenv("AWS_REQUEST_CHECKSUM_CALCULATION", "when_required")
+        chatter = b"Importing data into the store, 1000 facts processed.\n" * 5000
+        log = chatter + g_inference_stats
+        with moto.mock_s3():
+            bucket = boto3.resource("s3").create_bucket(
+                Bucket=pytest.TEST_BUCKET_NAME,
+                CreateBucketConfiguration={"LocationConstraint": "ap-southeast-1"},
+            )
+            bucket.put_object(Key="job/rdfox.log", Body=log)
+            log_tail = S3LogTail(
+                bucket_name=pytest.TEST_BUCKET_NAME,
+                key="job/rdfox.log",
+                tail_bytes=1024,
+            )
+            lines = log_tail.lines()
+        inference_stat_processor = InferenceStatProcessor("", lines=lines)
+        stats = inference_stat_processor.process_inference()
+        self.verify_parsed_stats(stats)
+        # The data import is timed just before LOADTIME, so the tail still has it
+        data_import = inference_stat_processor.telemetry.imports[-1]
+        expect(data_import[2:]).equals([250.0, "facts", 655822120, 510506725])
+        # The first window misses the earliest markers and is widened once
+        expect(log_tail.bytes_read).equals(4096)
+        expect(log_tail.bytes_read < len(log)).to.be.true()
+
+    def test_5_telemetry_breaks_the_job_down_by_phase(
+        self,
+        g_inference_stats,
+    ):
+        lines = iter(g_inference_stats.split(b"\n"))
+        inference_stat_processor = InferenceStatProcessor("", lines=lines)
+        inference_stat_processor.process_inference()
+        telemetry = inference_stat_processor.telemetry
+
+        expect(telemetry.imports).equals(
+            [
+                ["/data/exited-chains.dlog", 1, 0.008, "rules", 4, 4],
+                ["305 files", 305, 250.0, "facts", 655822120, 510506725],
+            ]
+        )
+        expect(telemetry.import_rates()[1]["secondsPerFile"]).equals(0.82)
+        expect(telemetry.materializations).equals([1617.16])
+        table = "http://oxfordsemantic.tech/RDFox#DefaultTriples"
+        expect(telemetry.tables).equals(
+            [[table, 510584321, 787840001, 0, 510506725, 0, 787421291]]
+        )
+        expect(telemetry.queries[1]).equals(
+            ["/data/extract3.rq", "application/n-triples", 1659850615, 3640.0]
+        )
+        expect(telemetry.queries[2][0]).equals("partialChainCount")
+        expect(telemetry.queries[3][0]).equals("fullChainCount")
+        expect(telemetry.bound).equals("query")
+        expect(RDFoxTelemetry.from_dict(telemetry.json)).equals(telemetry)
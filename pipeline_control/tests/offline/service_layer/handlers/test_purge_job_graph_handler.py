@@ -0,0 +1,71 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import pytest
+from neptune_load.graph_purger.graph_purger import PurgeProgress
+from pyexpect import expect
+
+from app_config import app_configuration
+from pipeline_control.domain.model import Job, JobStatus
+
+
+class TestPurgeJobGraph:
+    def test_1_purges_the_job_graph_and_records_progress(
+        self,
+        mocked_repository,
+        purge_job_graph_handler,
+        g_post_inference_fake_neptune_loader_factory,
+    ):
+        progress = purge_job_graph_handler.handle()
+        job_id = purge_job_graph_handler.job_id
+        retrieved_job = mocked_repository.get_job_by_id(job_id)
+
+        fake_loader = g_post_inference_fake_neptune_loader_factory.fake_loader
+        expect(fake_loader.purged_graphs).equals([f"urn:jobs:{job_id}"])
+        expect(progress.batches).equals(13)
+        expect(retrieved_job.job_status).equals(JobStatus.NEPTUNE_GRAPH_PURGED)
+        expect(retrieved_job.graph_purge.done).to.be.true()
+        expect(retrieved_job.graph_purge.triples_deleted).equals(125000)
+
+    def test_2_unfinished_purge_is_resumed(
+        self,
+        mocked_repository,
+        purge_job_graph_handler,
+    ):
+        job = purge_job_graph_handler.job
+        job.graph_purge = PurgeProgress(
+            graph=f"urn:jobs:{job.job_id}",
+            triples_at_start=125000,
+            triples_deleted=100000,
+            batches=10,
+            triples_per_batch=10000,
+        )
+        progress = purge_job_graph_handler.handle()
+        expect(progress.batches).equals(13)
+        expect(progress.fraction_done).equals(1.0)
+
+    def test_3_shared_graphs_are_only_purged_with_force(
+        self,
+        mocked_repository,
+        purge_job_graph_handler,
+        g_post_inference_fake_neptune_loader_factory,
+        monkeypatch,
+    ):
+        # Every delta load of the key goes into the graph
+        monkeypatch.setattr(app_configuration, "delta_load", True)
+        with pytest.raises(Exception):
+            purge_job_graph_handler.handle()
+        monkeypatch.setattr(app_configuration, "delta_load", False)
+
+        job = purge_job_graph_handler.job
+        other_job = Job(key=job.key, job_configuration=job.job_configuration)
+        mocked_repository.save(other_job)
+        with pytest.raises(Exception) as excinfo:
+            purge_job_graph_handler.handle()
+        expect(str(excinfo.value)).contains(other_job.job_id)
+        expect(g_post_inference_fake_neptune_loader_factory.fake_loader).equals(None)
+
+        purge_job_graph_handler.force = True
+        purge_job_graph_handler.handle()
+        fake_loader = g_post_inference_fake_neptune_loader_factory.fake_loader
+        expect(fake_loader.purged_graphs).equals([f"urn:jobs:{job.job_id}"])
@@ -1,8 +1,12 @@
 # Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
 
+from unittest import mock
+
+from freezegun import freeze_time
 from pyexpect import expect
 
+from app_config import app_configuration
 from pipeline_control.domain.model import JobStatus
 
 
@@ -18,6 +22,7 @@ class TestRefreshBulkLoad:
         g_post_inference_fake_neptune_loader_factory.set_loading()
         refresh_bulkload_handler.handle()
         retrieved_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+        del g_neptune_load_in_progress["payload"]["errors"]
         expect(retrieved_job.neptune_statistics_raw).equals(g_neptune_load_in_progress)
         g_post_inference_fake_neptune_loader_factory.set_complete()
         refresh_bulkload_handler.handle()
@@ -25,3 +30,151 @@ class TestRefreshBulkLoad:
 
         expect(retrieved_job.job_status).equals(JobStatus.NEPTUNE_LOAD_COMPLETED)
         expect(retrieved_job.neptune_statistics.records_total).equals(41220091)
+
+    def test_2_failed_load_stores_error_summary(
+        self,
+        mocked_repository,
+        bulkloading_job,
+        refresh_bulkload_handler,
+        g_neptune_load_complete,
+        g_post_inference_fake_neptune_loader_factory,
+    ):
+        g_neptune_load_complete["payload"]["overallStatus"]["status"] = "LOAD_FAILED"
+        g_neptune_load_complete["payload"]["overallStatus"]["parsingErrors"] = 2
+        g_post_inference_fake_neptune_loader_factory.error_summary = {
+            "totalErrors": 2,
+            "errorsByCode": {"PARSING_ERROR": 2},
+            "errorsByFile": {"s3://TEST_BUCKET/data/shard1.nt": 2},
+        }
+        g_post_inference_fake_neptune_loader_factory.complete_after_iterations = 0
+        refresh_bulkload_handler.handle()
+        retrieved_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+
+        expect(retrieved_job.job_status).equals(JobStatus.NEPTUNE_LOAD_FAILED)
+        expect(retrieved_job.neptune_load_errors.errors_by_code).equals(
+            {"PARSING_ERROR": 2}
+        )
+        expect(
+            "errors" in retrieved_job.neptune_statistics_raw["payload"]
+        ).to.be.false()
+        fake_loader = g_post_inference_fake_neptune_loader_factory.fake_loader
+        expect(fake_loader.max_errors).equals(app_configuration.neptune_load_max_errors)
+
+    def test_3_sharded_load_reports_aggregate_progress(
+        self,
+        mocked_repository,
+        bulkloading_job,
+        refresh_bulkload_handler,
+    ):
+        sharded_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+        sharded_job.neptune_shard_loads = [
+            {"shard": 0, "source": "s3://TEST_BUCKET/data/a-", "loadId": "shard-0"},
+            {"shard": 1, "source": "s3://TEST_BUCKET/data/b-", "loadId": "shard-1"},
+        ]
+        mocked_repository.save(sharded_job)
+        refresh_bulkload_handler.handle()
+        retrieved_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+
+        shard_progress = retrieved_job.neptune_shard_progress
+        expect(shard_progress["loadCount"]).equals(2)
+        expect(sorted(shard_progress["loads"])).equals(["shard-0", "shard-1"])
+        expect(shard_progress["totalRecords"]).equals(2 * 41220091)
+
+    def test_4_completed_load_verifies_exported_chain_counts(
+        self,
+        mocked_repository,
+        bulkloading_job,
+        refresh_bulkload_handler,
+        g_post_inference_fake_neptune_loader_factory,
+        g_job_configurations_neptune_configuration,
+        monkeypatch,
+    ):
+        monkeypatch.setattr(app_configuration, "job_graph_prefix", "urn:jobs:")
+        loaded_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+        loaded_job.rdfox_statistics.partial_chains_amount = 1337
+        loaded_job.rdfox_statistics.full_chains_amount = 2667
+        neptune_configuration = g_job_configurations_neptune_configuration
+        neptune_configuration.named_graph = f"urn:jobs:{loaded_job.job_id}"
+        loaded_job.job_configuration.neptune_configuration = neptune_configuration
+        mocked_repository.save(loaded_job)
+        factory = g_post_inference_fake_neptune_loader_factory
+        factory.complete_after_iterations = 0
+        factory.query_counts = {
+            "type:ForwardChain": 1000,
+            "type:BackwardChain": 330,
+            "type:FullChain": 2667,
+        }
+        # Only partial chains are exported, RDFox's full chain count is not checked
+        exported_query = [
+            b"SELECT ?S ?P ?O WHERE {",
+            b"  VALUES ?type { type:ForwardChain type:BackwardChain }",
+            b"  ?S a ?type . ?S a type:ForwardChain . ?S a type:BackwardChain .",
+            b"}",
+        ]
+        refresh_bulkload_handler.verify_chain_counts = True
+        with mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_objects_under_prefix",
+            return_value=[
+                "s3://TEST_BUCKET/key/chains.rq",
+                "s3://TEST_BUCKET/key/data.nt",
+            ],
+        ), mock.patch(
+            "pipeline_control.service_layer.handlers.util.s3_lines",
+            return_value=exported_query,
+        ):
+            refresh_bulkload_handler.handle()
+        retrieved_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+
+        verification = retrieved_job.chain_verification
+        expect(len(factory.fake_loader.queries)).equals(2)
+        expect(verification.expected).equals({"partial_chains_amount": 1337})
+        expect(verification.actual).equals({"partial_chains_amount": 1330})
+        expect(verification.mismatches).equals({"partial_chains_amount": -7})
+        expect(verification.verified).to.be.false()
+        expect(retrieved_job.job_status).equals(JobStatus.NEPTUNE_LOAD_COMPLETED)
+
+        # A graph that is not the job's own, like a configured shared one, is not counted
+        monkeypatch.setattr(app_configuration, "job_graph_prefix", "")
+        refresh_bulkload_handler.verify_chains(retrieved_job, factory.fake_loader)
+        expect(len(factory.fake_loader.queries)).equals(2)
+
+    def test_5_every_poll_is_recorded_as_a_throughput_sample(
+        self,
+        mocked_repository,
+        bulkloading_job,
+        refresh_bulkload_handler,
+        g_post_inference_fake_neptune_loader_factory,
+    ):
+        factory = g_post_inference_fake_neptune_loader_factory
+        with freeze_time("2021-06-01 12:00:00") as frozen_time:
+            for _ in range(3):
+                factory.set_loading()
+                refresh_bulkload_handler.handle()
+                frozen_time.tick(60)
+            factory.set_complete()
+            refresh_bulkload_handler.handle()
+        retrieved_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+
+        throughput = retrieved_job.neptune_throughput
+        timestamps = [sample[0] for sample in throughput.samples]
+        expect(len(throughput.samples)).equals(4)
+        expect(timestamps[-1] - timestamps[0]).equals(180)
+        expect(throughput.samples[-1][1]).equals(41220091)
+        expect(throughput.summary()["samples"]).equals(4)
+
+    def test_6_jobs_without_a_graph_of_their_own_are_not_verified(
+        self,
+        mocked_repository,
+        bulkloading_job,
+        refresh_bulkload_handler,
+        g_post_inference_fake_neptune_loader_factory,
+    ):
+        factory = g_post_inference_fake_neptune_loader_factory
+        factory.complete_after_iterations = 0
+        refresh_bulkload_handler.verify_chain_counts = True
+        refresh_bulkload_handler.handle()
+        retrieved_job = mocked_repository.get_job_by_id(bulkloading_job.job_id)
+
+        expect(factory.fake_loader.queries).equals([])
+        expect(retrieved_job.chain_verification.expected).equals({})
+        expect(retrieved_job.job_status).equals(JobStatus.NEPTUNE_LOAD_COMPLETED)
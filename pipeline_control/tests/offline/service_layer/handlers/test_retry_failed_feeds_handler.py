@@ -0,0 +1,103 @@
+# Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+import copy
+
+import pytest
+from pyexpect import expect
+
+from pipeline_control.adapters.neptune_loader.fake_neptune_loader import (
+    FakeNeptuneLoader,
+)
+from pipeline_control.domain.model import JobStatus
+from pipeline_control.service_layer.handlers.refresh_bulkload_handler import (
+    combined_load_status,
+)
+
+
+class TestRetryFailedFeeds:
+    def test_1_retry_only_failed_feeds(
+        self,
+        mocked_repository,
+        failed_load_job,
+        retry_failed_feeds_handler,
+    ):
+        retry_failed_feeds_handler.handle()
+        retrieved_job = mocked_repository.get_job_by_id(failed_load_job.job_id)
+        failed_feed = f"s3://{pytest.TEST_BUCKET_NAME}/load/data/shard1.nt"
+
+        expect(retrieved_job.job_status).equals(JobStatus.NEPTUNE_LOAD_IN_QUEUE)
+        expect(list(retrieved_job.neptune_retry_load_ids)).equals([failed_feed])
+        expect(retrieved_job.neptune_load_id).equals(
+            retrieved_job.neptune_retry_load_ids[failed_feed]
+        )
+        expect(retrieved_job.neptune_succeeded_feeds).equals(
+            [
+                f"s3://{pytest.TEST_BUCKET_NAME}/load/data/shard0.nt",
+                f"s3://{pytest.TEST_BUCKET_NAME}/load/data/shard2.nt",
+            ]
+        )
+
+    def test_2_refuse_to_retry_completed_load(
+        self,
+        mocked_repository,
+        failed_load_job,
+        retry_failed_feeds_handler,
+    ):
+        retry_failed_feeds_handler.job.job_status = JobStatus.NEPTUNE_LOAD_COMPLETED
+        with pytest.raises(Exception):
+            retry_failed_feeds_handler.handle()
+
+    def test_3_every_independent_retry_decides_the_job_status(self):
+        completed, failed = "LOAD_COMPLETED", "LOAD_FAILED"
+        expect(combined_load_status([failed, "LOAD_IN_QUEUE"])).equals(
+            "LOAD_IN_PROGRESS"
+        )
+        # The last retry completing does not hide an earlier one failing
+        expect(combined_load_status([failed, completed])).equals(failed)
+        expect(combined_load_status([completed, completed])).equals(completed)
+
+    def test_4_retry_the_failed_feeds_of_every_retry(
+        self,
+        mocked_repository,
+        failed_load_job,
+        retry_failed_feeds_handler,
+        g_post_inference_fake_neptune_loader_factory,
+        g_neptune_load_complete,
+        g_job_configurations_neptune_configuration,
+    ):
+        shard0, shard1, shard2 = [
+            f"s3://{pytest.TEST_BUCKET_NAME}/load/data/shard{shard}.nt"
+            for shard in range(3)
+        ]
+
+        def finished_load(load_id, status, failed_feeds=()):
+            stats = copy.deepcopy(g_neptune_load_complete)
+            stats["payload"]["overallStatus"]["status"] = status
+            loader = FakeNeptuneLoader(
+                fake_load_id=load_id,
+                complete_after_iterations=0,
+                success_stats=stats,
+                failed_feeds=list(failed_feeds),
+                neptune_load_configuration=g_job_configurations_neptune_configuration,
+            )
+            loader.initiate_bulk_load()
+            return loader
+
+        # shard2 loaded at first, the retry of shard1 never ran behind shard0
+        job = retry_failed_feeds_handler.job
+        job.neptune_succeeded_feeds = [shard2]
+        job.job_status = JobStatus.NEPTUNE_LOAD_FAILED_BECAUSE_DEPENDENCY_NOT_SATISFIED
+        job.neptune_retry_load_ids = {shard0: "retry-0", shard1: "retry-1"}
+        job.neptune_load_id = "retry-1"
+        g_post_inference_fake_neptune_loader_factory.read_only_loaders = {
+            "retry-0": finished_load("retry-0", "LOAD_FAILED", [shard0]),
+            "retry-1": finished_load(
+                "retry-1", "LOAD_FAILED_BECAUSE_DEPENDENCY_NOT_SATISFIED"
+            ),
+        }
+        retry_failed_feeds_handler.handle()
+
+        retrieved_job = mocked_repository.get_job_by_id(failed_load_job.job_id)
+        expect(list(retrieved_job.neptune_retry_load_ids)).equals([shard0, shard1])
+        expect(retrieved_job.neptune_succeeded_feeds).equals([shard2])